@@ -1,10 +1,28 @@
-from gui.main_window import MainWindow
-import customtkinter as ctk
+import time
+
+INICIO = time.perf_counter()
+
+import sys
+import multiprocessing
+
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    # Modo em lote: python app.py --batch planilha.xlsx --teste ... (ver gui/batch.py)
+    if "--batch" in sys.argv:
+        from gui.batch import main
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != "--batch"]))
+
+    # Só customtkinter/tkinter são carregados antes de a janela aparecer; o resto vem sob demanda
+    from gui.main_window import MainWindow
+    import customtkinter as ctk
+
     ctk.set_appearance_mode("System")
     ctk.set_default_color_theme("green")
 
     app = MainWindow()
+    # Medição do tempo de abertura: python app.py --medir-inicio (imprime JSON e fecha)
+    if "--medir-inicio" in sys.argv:
+        app.medir_inicio(INICIO)
     app.mainloop()
-
@@ -0,0 +1,44 @@
+""" Dados sintéticos, com semente fixa, para os benchmarks das estatísticas e dos gráficos. """
+import numpy as np
+import pandas as pd
+
+COL_GRUPO = "grupo"
+COL_FATOR = "fator"
+COL_RESPOSTA = "resposta"
+CONTROLE = "G000"
+
+
+def nomes(prefixo: str, quantidade: int) -> list:
+    """ Rótulos "G000", "G001"... com largura fixa (a ordem alfabética é a mesma da numérica). """
+    largura = max(3, len(str(quantidade - 1)))
+    return [f"{prefixo}{i:0{largura}d}" for i in range(quantidade)]
+
+
+def gerar_dados(n_grupos: int, n_por_grupo: int, n_fatores: int = 1, semente: int = 0) -> pd.DataFrame:
+    """
+    Gera uma tabela no formato das planilhas do app: uma linha por observação, com grupo, fator e resposta.
+    Cada grupo tem uma média própria (deslocamentos crescentes, então há grupos diferentes e iguais ao
+    controle) e as linhas ficam embaralhadas, como em uma planilha real.
+    Parâmetros:
+    - n_grupos: Número de grupos (o primeiro, CONTROLE, é o controle do Dunnett).
+    - n_por_grupo: Linhas por combinação de grupo e nível do fator.
+    - n_fatores: Número de níveis do fator (1 = sem fator).
+    - semente: Semente do gerador (mesmos parâmetros e semente geram os mesmos dados).
+    Retorna:
+    - DataFrame com as colunas COL_GRUPO, COL_FATOR e COL_RESPOSTA (float64).
+    """
+    rng = np.random.default_rng(semente)
+    n_celulas = n_grupos * n_fatores
+    celula = np.repeat(np.arange(n_celulas), n_por_grupo)
+    rng.shuffle(celula)
+    grupo, fator = celula % n_grupos, celula // n_grupos
+
+    medias_grupo = 10 + 0.5 * np.arange(n_grupos) * (rng.random(n_grupos) < 0.5)
+    medias_fator = rng.normal(0, 1, n_fatores)
+    resposta = medias_grupo[grupo] + medias_fator[fator] + rng.normal(0, 1, len(celula))
+
+    return pd.DataFrame({
+        COL_GRUPO: np.asarray(nomes("G", n_grupos), dtype=object)[grupo],
+        COL_FATOR: np.asarray(nomes("F", n_fatores), dtype=object)[fator],
+        COL_RESPOSTA: resposta,
+    })
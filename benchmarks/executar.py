@@ -0,0 +1,272 @@
+""" Benchmarks das funções de estatistica.py e da montagem/exportação dos gráficos (sem interface).
+
+Uso:
+    python -m benchmarks.executar --perfil rapido --saida benchmarks/base.json
+    python -m benchmarks.executar --perfil rapido --comparar benchmarks/base.json --saida atual.json
+
+Cada cenário gera dados sintéticos com semente fixa (dados_sinteticos.gerar_dados), mede cada função
+várias vezes e guarda o menor tempo e a mediana. O resultado é um JSON; com --comparar os tempos são
+confrontados com os de uma execução anterior e o código de saída é 1 se alguma medida ficou mais lenta
+que a tolerância.
+"""
+import matplotlib
+matplotlib.use("Agg")
+
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import scipy
+
+from gui.estatistica import (run_t_test, run_test_dunnett, run_test_tukey_anova, add_significance_dunnet,
+                             add_significance_tukey, add_significance_ttest, gerar_estatisticas)
+from gui.graficos import criar_grafico
+from gui.exportacao import dpi_para_formato
+from benchmarks.dados_sinteticos import gerar_dados, COL_GRUPO, COL_FATOR, COL_RESPOSTA, CONTROLE
+
+# Cenários: (teste, grupos, níveis do fator, linhas por grupo e nível)
+PERFIS = {
+    "rapido": [
+        ("dunnett", 5, 1, 10), ("dunnett", 5, 1, 1_000), ("dunnett", 50, 1, 100),
+        ("dunnett", 500, 1, 10), ("dunnett", 5, 1, 100_000),
+        ("tukey", 5, 1, 10), ("tukey", 5, 1, 1_000), ("tukey", 50, 1, 100),
+        ("tukey", 200, 1, 10), ("tukey", 5, 1, 100_000),
+        ("t-test", 2, 1, 100), ("t-test", 2, 20, 100), ("t-test", 2, 200, 10), ("t-test", 2, 5, 100_000),
+    ],
+    "completo": (
+        [(teste, g, 1, n) for teste in ("dunnett", "tukey") for g in (2, 5, 20, 100, 500)
+         for n in (10, 100, 1_000, 10_000, 100_000)]
+        + [("t-test", 2, f, n) for f in (1, 5, 50, 200) for n in (10, 100, 1_000, 10_000, 100_000)]
+    ),
+}
+# Cenários com mais linhas que isto são pulados (memória e tempo)
+MAX_LINHAS = 5_000_000
+# Gráficos só até este número de barras (grupos x níveis do fator): centenas de barras levam dezenas de
+# segundos e não são uso real
+MAX_BARRAS_GRAFICO = 100
+# Bootstrap e permutação (10 mil reamostras cada) só até este número de linhas: acima disso cada medida
+# passa de dezenas de segundos
+MAX_LINHAS_REAMOSTRAGEM = 20_000
+# Formatos exportados em cada cenário
+FORMATOS_GRAFICO = ("svg", "png")
+# Diferenças menores que isto (segundos) não contam como regressão: é ruído de medida
+PISO_S = 0.002
+
+
+def medir(funcao, repeticoes: int = 5, tempo_max: float = 2.0) -> dict:
+    """
+    Mede `funcao()` algumas vezes (depois de uma execução de aquecimento).
+    Parâmetros:
+    - funcao: Função sem argumentos.
+    - repeticoes: Número máximo de medições.
+    - tempo_max: Para de repetir quando o total medido passa disto (segundos); funções lentas
+      são medidas uma única vez, sem aquecimento.
+    Retorna:
+    - Dicionário com min_s, mediana_s, repeticoes e o valor retornado pela última execução ("valor").
+    """
+    inicio = time.perf_counter()
+    valor = funcao()
+    primeira = time.perf_counter() - inicio
+    tempos = [primeira] if primeira >= tempo_max else []
+    while len(tempos) < repeticoes and sum(tempos) < tempo_max:
+        inicio = time.perf_counter()
+        valor = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {"min_s": round(min(tempos), 6), "mediana_s": round(float(np.median(tempos)), 6),
+            "repeticoes": len(tempos), "valor": valor}
+
+
+def coluna_fator(teste: str):
+    """ O t-test compara os dois grupos dentro de cada nível do fator (com um só nível, um único teste). """
+    return COL_FATOR if teste == "t-test" else None
+
+
+def funcoes_estatisticas(teste: str, data: pd.DataFrame) -> dict:
+    """ Funções de estatistica.py medidas para o teste, na forma {nome: função sem argumentos}.
+    As funções add_significance_* recebem o resultado do teste já calculado, como no app.
+    Em cenários pequenos (MAX_LINHAS_REAMOSTRAGEM) mede também o bootstrap e a permutação de gerar_estatisticas.
+    """
+    fator = coluna_fator(teste)
+    control = CONTROLE if teste == "dunnett" else None
+    if teste == "dunnett":
+        resultado = run_test_dunnett(data, COL_RESPOSTA, COL_GRUPO, CONTROLE)[0]
+        funcoes = {
+            "run_test_dunnett": lambda: run_test_dunnett(data, COL_RESPOSTA, COL_GRUPO, CONTROLE),
+            "add_significance_dunnet": lambda: add_significance_dunnet(data, resultado, COL_RESPOSTA, COL_GRUPO, CONTROLE),
+        }
+    elif teste == "tukey":
+        resultado = run_test_tukey_anova(data, COL_GRUPO, COL_RESPOSTA)[0]
+        funcoes = {
+            "run_test_tukey_anova": lambda: run_test_tukey_anova(data, COL_GRUPO, COL_RESPOSTA),
+            "add_significance_tukey": lambda: add_significance_tukey(resultado),
+        }
+    else:
+        resultado = run_t_test(data, COL_GRUPO, fator, COL_RESPOSTA)
+        funcoes = {
+            "run_t_test": lambda: run_t_test(data, COL_GRUPO, fator, COL_RESPOSTA),
+            "add_significance_ttest": lambda: add_significance_ttest(data, resultado, COL_RESPOSTA, COL_GRUPO, fator),
+        }
+    funcoes["gerar_estatisticas"] = lambda: gerar_estatisticas(data, teste, COL_GRUPO, COL_RESPOSTA, fator, control)
+    if len(data) <= MAX_LINHAS_REAMOSTRAGEM:
+        funcoes["bootstrap"] = lambda: gerar_estatisticas(data, teste, COL_GRUPO, COL_RESPOSTA, fator, control,
+                                                          intervalo="bootstrap")
+        funcoes["permutacao"] = lambda: gerar_estatisticas(data, teste, COL_GRUPO, COL_RESPOSTA, fator, control,
+                                                           p_valor="permutacao")
+    return funcoes
+
+
+def funcoes_grafico(teste: str, data: pd.DataFrame, semente: int) -> dict:
+    """ Montagem da figura (criar_grafico) e exportação dela em cada formato de FORMATOS_GRAFICO. """
+    fator = coluna_fator(teste)
+    estatisticas = gerar_estatisticas(data, teste, COL_GRUPO, COL_RESPOSTA, fator_col=fator, control=CONTROLE)
+
+    def montar():
+        np.random.seed(semente)  # jitter dos pontos
+        return criar_grafico(data, estatisticas, group_col=COL_GRUPO, response_col=COL_RESPOSTA, fator_col=fator)
+
+    fig = montar()
+
+    def exportar(ext):
+        def gravar():
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=ext, dpi=dpi_para_formato(ext), bbox_inches="tight")
+            return buffer.tell()
+        return gravar
+
+    return {"criar_grafico": montar, **{f"exportar_{ext}": exportar(ext) for ext in FORMATOS_GRAFICO}}
+
+
+def identificador(teste: str, funcao: str, grupos: int, fatores: int, linhas: int) -> str:
+    """ Chave estável de uma medida, usada na comparação entre execuções. """
+    return f"{teste}/{funcao}/g={grupos},f={fatores},n={linhas}"
+
+
+def executar(cenarios: list, repeticoes: int = 5, graficos: bool = True, semente: int = 0, filtro: str = None) -> list:
+    """
+    Executa os cenários e retorna a lista de medidas (uma por função e cenário).
+    Parâmetros:
+    - cenarios: Lista de (teste, grupos, níveis do fator, linhas por grupo e nível).
+    - repeticoes: Medições por função (ver medir).
+    - graficos: Se False, mede só as estatísticas.
+    - semente: Semente dos dados sintéticos.
+    - filtro: Se informado, mede só as funções cujo identificador contém este texto.
+    """
+    resultados = []
+    for teste, grupos, fatores, linhas in cenarios:
+        total = grupos * fatores * linhas
+        if total > MAX_LINHAS:
+            print(f"pulando {teste} g={grupos} f={fatores} n={linhas}: {total} linhas", flush=True)
+            continue
+        data = gerar_dados(grupos, linhas, fatores, semente)
+        funcoes = funcoes_estatisticas(teste, data)
+        nomes_grafico = ["criar_grafico"] + [f"exportar_{ext}" for ext in FORMATOS_GRAFICO]
+        pedido = not filtro or any(filtro in identificador(teste, nome, grupos, fatores, linhas) for nome in nomes_grafico)
+        if graficos and pedido and grupos * fatores <= MAX_BARRAS_GRAFICO:
+            funcoes.update(funcoes_grafico(teste, data, semente))
+        for nome, funcao in funcoes.items():
+            chave = identificador(teste, nome, grupos, fatores, linhas)
+            if filtro and filtro not in chave:
+                continue
+            medida = medir(funcao, repeticoes)
+            valor = medida.pop("valor")
+            registro = {"id": chave, "teste": teste, "funcao": nome, "grupos": grupos, "fatores": fatores,
+                        "linhas_por_grupo": linhas, "linhas": total, **medida}
+            if nome.startswith("exportar_"):
+                registro["bytes"] = int(valor)
+            resultados.append(registro)
+            print(f"{chave}: {1000 * medida['min_s']:.2f} ms (mediana {1000 * medida['mediana_s']:.2f} ms)", flush=True)
+    return resultados
+
+
+def ambiente() -> dict:
+    """ Versões e máquina da execução, gravadas junto com os tempos. """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+    }
+
+
+def comparar(atual: list, base: list, tolerancia: float = 0.25, piso_s: float = PISO_S) -> pd.DataFrame:
+    """
+    Compara duas execuções pelo menor tempo de cada medida.
+    Parâmetros:
+    - atual, base: Listas de medidas (campo "resultados" do JSON).
+    - tolerancia: Aumento relativo aceito (0.25 = até 25% mais lento).
+    - piso_s: Diferença absoluta mínima para contar como regressão ou melhora.
+    Retorna:
+    - DataFrame com id, base_s, atual_s, razao e status ("regressão", "melhora", "igual", "novo").
+    """
+    tempos_base = {r["id"]: r["min_s"] for r in base}
+    linhas = []
+    for r in atual:
+        anterior = tempos_base.get(r["id"])
+        if anterior is None:
+            status, razao = "novo", np.nan
+        else:
+            razao = r["min_s"] / anterior if anterior > 0 else np.inf
+            diferenca = r["min_s"] - anterior
+            if razao > 1 + tolerancia and diferenca > piso_s:
+                status = "regressão"
+            elif razao < 1 / (1 + tolerancia) and -diferenca > piso_s:
+                status = "melhora"
+            else:
+                status = "igual"
+        linhas.append({"id": r["id"], "base_s": anterior, "atual_s": r["min_s"], "razao": razao, "status": status})
+    return pd.DataFrame(linhas, columns=["id", "base_s", "atual_s", "razao", "status"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.executar",
+                                     description="Mede as estatísticas e os gráficos em dados sintéticos.")
+    parser.add_argument("--perfil", choices=list(PERFIS), default="rapido", help="Conjunto de cenários (padrão: rapido)")
+    parser.add_argument("--filtro", help="Mede só as funções cujo identificador contém este texto (ex.: tukey/ ou exportar_svg)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Medições por função (padrão: 5)")
+    parser.add_argument("--sem-graficos", action="store_true", help="Mede só as estatísticas")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos dados sintéticos (padrão: 0)")
+    parser.add_argument("--saida", help="Grava os resultados neste arquivo JSON")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior (linha de base)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Aumento relativo aceito na comparação (padrão: 0.25)")
+    args = parser.parse_args(argv)
+
+    resultados = executar(PERFIS[args.perfil], args.repeticoes, not args.sem_graficos, args.semente, args.filtro)
+    relatorio = {"ambiente": ambiente(), "perfil": args.perfil, "semente": args.semente, "resultados": resultados}
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=1)
+        print(f"{len(resultados)} medidas gravadas em {args.saida}")
+
+    if not args.comparar:
+        return 0
+    with open(args.comparar, encoding="utf-8") as f:
+        base = json.load(f)
+    comparacao = comparar(resultados, base["resultados"], args.tolerancia)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(comparacao[comparacao["status"] != "igual"].to_string(index=False) if (comparacao["status"] != "igual").any()
+              else "Nenhuma diferença acima da tolerância.")
+    regressoes = int((comparacao["status"] == "regressão").sum())
+    print(f"{regressoes} regressões, {int((comparacao['status'] == 'melhora').sum())} melhoras "
+          f"(base: commit {base['ambiente'].get('commit')}, {base['ambiente'].get('data')})")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
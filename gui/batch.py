@@ -0,0 +1,273 @@
+""" Execução em lote (sem interface gráfica) dos testes e gráficos.
+
+Uso:
+    python -m gui.batch planilha.xlsx --teste dunnett --group genotype --response expression --control control
+    python -m gui.batch pasta_com_planilhas/ --config config.json --saida resultados/
+    python -m gui.batch genes.xlsx --teste tukey --group genotype --todas-numericas --multiplos
+
+Cada aba de cada planilha é processada em um processo separado (ProcessPoolExecutor),
+usando o backend Agg do matplotlib.
+"""
+import matplotlib
+matplotlib.use("Agg")
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from gui.estatistica import gerar_estatisticas, analisar_respostas, colunas_numericas
+from gui.cache import cache_resultados
+from gui.leitura import listar_abas, ler_colunas, compactar_tipos
+from gui.graficos import criar_grafico, graficos_respostas, MODOS_PONTOS, PAINEIS_POR_FIGURA
+from gui.exportacao import FORMATOS, exportar, normalizar_saidas
+from gui.opcoes import INTERVALOS, P_VALORES
+
+
+CONFIG_PADRAO = {
+    "teste": "dunnett",
+    "group_col": None,
+    "fator_col": None,
+    "response_col": None,
+    "control": None,
+    "alpha": 0.05,
+    "formato": "svg",
+    "titulo": "",
+    "eixo_x": "",
+    "eixo_y": "",
+    "font_size": 10.0,
+    "fig_w": 8.0,
+    "fig_h": 8.0,
+    "modo_pontos": "auto",
+    "intervalo": "ep",
+    "p_valor": "teste",
+    "reamostras": 10_000,
+    "semente": 0,
+    # Várias respostas: lista de colunas ou "numericas" (todas as colunas numéricas); None para o modo de
+    # uma resposta. "multiplos" grava também os pequenos múltiplos (uma figura a cada 16 respostas)
+    "respostas": None,
+    "multiplos": False,
+}
+
+
+def listar_planilhas(caminho: str) -> list:
+    """ Retorna os arquivos Excel a processar (o próprio arquivo ou todos os .xlsx/.xls de uma pasta). """
+    if os.path.isdir(caminho):
+        return sorted(
+            os.path.join(caminho, nome) for nome in os.listdir(caminho)
+            if nome.lower().endswith((".xlsx", ".xls")) and not nome.startswith("~$")
+        )
+    return [caminho]
+
+
+def listar_tarefas(arquivos: list, abas: list = None) -> list:
+    """ Monta a lista de pares (arquivo, aba) a processar.
+    Parâmetros:
+    - arquivos: Lista de caminhos de planilhas.
+    - abas: Se informado, processa apenas as abas com esses nomes.
+    """
+    tarefas = []
+    for arquivo in arquivos:
+        for aba in listar_abas(arquivo):
+            if abas and aba not in abas:
+                continue
+            tarefas.append((arquivo, aba))
+    return tarefas
+
+
+def nome_saida(arquivo: str, aba: str) -> str:
+    """ Nome base (sem extensão) dos arquivos gerados para uma aba. """
+    base = os.path.splitext(os.path.basename(arquivo))[0]
+    aba_segura = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(aba))
+    return f"{base}_{aba_segura}"
+
+
+def processar_aba(arquivo: str, aba: str, config: dict, saida: str) -> dict:
+    """ Executa o teste e gera o gráfico de uma aba. Roda dentro de um processo do pool.
+    Parâmetros:
+    - arquivo: Caminho da planilha.
+    - aba: Nome da aba.
+    - config: Dicionário de configuração (ver CONFIG_PADRAO).
+    - saida: Pasta onde a figura e a tabela de resultados serão gravadas.
+    Retorna:
+    - Dicionário com arquivo, aba, status, tempo e arquivos gerados (ou mensagem de erro).
+    """
+    inicio = time.perf_counter()
+    registro = {"arquivo": arquivo, "aba": aba}
+    if config.get("respostas"):
+        return processar_respostas(arquivo, aba, config, saida, registro, inicio)
+    try:
+        # só as colunas usadas pela análise, lidas em streaming
+        colunas = list(dict.fromkeys(c for c in (config["group_col"], config["fator_col"], config["response_col"]) if c))
+        data, _ = compactar_tipos(ler_colunas(arquivo, aba, colunas or None))
+        estatisticas = gerar_estatisticas(
+            data,
+            config["teste"],
+            group_col=config["group_col"],
+            response_col=config["response_col"],
+            fator_col=config["fator_col"],
+            control=config["control"],
+            alpha=config["alpha"],
+            cache=cache_resultados,
+            intervalo=config["intervalo"],
+            p_valor=config["p_valor"],
+            reamostras=config["reamostras"],
+            semente=config["semente"],
+            processos=1,  # as abas já rodam em paralelo, uma por processo
+        )
+
+        # um ou vários formatos, todos gravados a partir da mesma figura
+        saidas = normalizar_saidas(config["formato"])
+        dpi = max(dpi for _, dpi in saidas)
+        fig = criar_grafico(
+            data,
+            estatisticas,
+            group_col=config["group_col"],
+            response_col=config["response_col"],
+            fator_col=config["fator_col"],
+            titulo=config["titulo"] or str(aba),
+            eixo_x=config["eixo_x"],
+            eixo_y=config["eixo_y"],
+            font_size=config["font_size"],
+            fig_w=config["fig_w"],
+            fig_h=config["fig_h"],
+            dpi=dpi,
+            modo_pontos=config["modo_pontos"],
+        )
+
+        base = os.path.join(saida, nome_saida(arquivo, aba))
+        # já estamos em um processo de trabalho: os formatos são gravados em sequência
+        relatorio = exportar(fig, base, saidas, paralelo=False)
+        estatisticas["tabela"].to_csv(f"{base}.csv", index=False)
+        registro.update(status="ok", figura=";".join(relatorio["arquivo"]), tabela=f"{base}.csv")
+    except Exception as e:
+        registro.update(status="erro", erro=f"{type(e).__name__}: {e}")
+    registro["tempo"] = round(time.perf_counter() - inicio, 3)
+    return registro
+
+
+def processar_respostas(arquivo: str, aba: str, config: dict, saida: str, registro: dict, inicio: float) -> dict:
+    """ Modo de várias respostas de processar_aba: o teste em cada coluna de config["respostas"], uma tabela
+    longa com p-valores de Benjamini-Hochberg (base_respostas.csv) e, com config["multiplos"], as páginas
+    de pequenos múltiplos (base_01, base_02...).
+    """
+    try:
+        fixas = [c for c in (config["group_col"], config["fator_col"]) if c]
+        respostas = config["respostas"]
+        colunas = None if respostas == "numericas" else list(dict.fromkeys(fixas + list(respostas)))
+        data, _ = compactar_tipos(ler_colunas(arquivo, aba, colunas))
+        if respostas == "numericas":
+            respostas = colunas_numericas(data, excluir=fixas)
+        resultado = analisar_respostas(data, config["teste"], config["group_col"], respostas,
+                                       fator_col=config["fator_col"], control=config["control"],
+                                       alpha=config["alpha"])
+
+        base = os.path.join(saida, nome_saida(arquivo, aba))
+        resultado["tabela"].to_csv(f"{base}_respostas.csv", index=False)
+        registro.update(status="ok", tabela=f"{base}_respostas.csv",
+                        significativas=int(resultado["tabela"]["reject"].sum()))
+        if config["multiplos"]:
+            saidas = normalizar_saidas(config["formato"])
+            dpi = max(dpi for _, dpi in saidas)
+            arquivos = []
+            for k, inicio_pagina in enumerate(range(0, len(respostas), PAINEIS_POR_FIGURA), start=1):
+                fig, = graficos_respostas(resultado, config["group_col"], fator_col=config["fator_col"],
+                                          eixo_y=config["eixo_y"], font_size=config["font_size"], dpi=dpi,
+                                          respostas=respostas[inicio_pagina:inicio_pagina + PAINEIS_POR_FIGURA])
+                arquivos.extend(exportar(fig, f"{base}_{k:02d}", saidas, paralelo=False)["arquivo"])
+            registro["figura"] = ";".join(arquivos)
+    except Exception as e:
+        registro.update(status="erro", erro=f"{type(e).__name__}: {e}")
+    registro["tempo"] = round(time.perf_counter() - inicio, 3)
+    return registro
+
+
+def executar_lote(caminho: str, config: dict, saida: str, workers: int = None, abas: list = None) -> pd.DataFrame:
+    """ Processa todas as abas de uma planilha (ou de todas as planilhas de uma pasta) em paralelo.
+    Parâmetros:
+    - caminho: Planilha ou pasta com planilhas.
+    - config: Configuração do teste e do gráfico (ver CONFIG_PADRAO).
+    - saida: Pasta de saída.
+    - workers: Número de processos (padrão: todos os núcleos).
+    - abas: Se informado, processa apenas essas abas.
+    Retorna:
+    - DataFrame com uma linha por aba (status, tempo, arquivos gerados ou erro).
+    """
+    os.makedirs(saida, exist_ok=True)
+    tarefas = listar_tarefas(listar_planilhas(caminho), abas)
+    registros = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = [pool.submit(processar_aba, arquivo, aba, config, saida) for arquivo, aba in tarefas]
+        for futuro in as_completed(futuros):
+            registro = futuro.result()
+            registros.append(registro)
+            print(f"[{registro['status']}] {os.path.basename(registro['arquivo'])} / {registro['aba']} ({registro['tempo']} s)"
+                  + (f" - {registro['erro']}" if registro["status"] == "erro" else ""), flush=True)
+    return pd.DataFrame(registros)
+
+
+def montar_config(args) -> dict:
+    """ Combina CONFIG_PADRAO, o arquivo JSON (--config) e as opções da linha de comando. """
+    config = dict(CONFIG_PADRAO)
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config.update(json.load(f))
+    for chave in CONFIG_PADRAO:
+        valor = getattr(args, chave, None)
+        if valor is not None:
+            config[chave] = valor
+    if not config["group_col"] or not (config["response_col"] or config["respostas"]):
+        raise SystemExit("Informe as colunas de grupo (--group) e de resposta (--response, --respostas "
+                         "ou --todas-numericas).")
+    if config["teste"] == "dunnett" and config["control"] is None:
+        raise SystemExit("O teste de Dunnett exige o grupo controle (--control).")
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gui.batch", description="Gera estatísticas e gráficos para todas as abas de uma planilha ou pasta.")
+    parser.add_argument("caminho", help="Planilha .xlsx ou pasta com planilhas")
+    parser.add_argument("--config", help="Arquivo JSON com a configuração (as opções abaixo têm prioridade)")
+    parser.add_argument("--teste", choices=["dunnett", "t-test", "tukey"])
+    parser.add_argument("--group", dest="group_col")
+    parser.add_argument("--fator", dest="fator_col")
+    parser.add_argument("--response", dest="response_col")
+    parser.add_argument("--control")
+    parser.add_argument("--alpha", type=float)
+    parser.add_argument("--formato", nargs="+", choices=list(FORMATOS), help="Um ou mais formatos (ex.: --formato svg tiff pdf)")
+    parser.add_argument("--pontos", dest="modo_pontos", choices=list(MODOS_PONTOS),
+                        help="Camada de pontos individuais (padrão: auto, que rasteriza ou amostra abas grandes)")
+    parser.add_argument("--intervalo", choices=list(INTERVALOS),
+                        help="Barras de erro: ep (média ± erro padrão, padrão) ou bootstrap (intervalo percentil 1 - alpha)")
+    parser.add_argument("--p-valor", dest="p_valor", choices=list(P_VALORES),
+                        help="p-valor do teste (padrão) ou por permutação")
+    parser.add_argument("--reamostras", type=int, help="Reamostras do bootstrap e da permutação (padrão: 10000)")
+    parser.add_argument("--semente", type=int, help="Semente das reamostragens (padrão: 0)")
+    parser.add_argument("--respostas", nargs="+",
+                        help="Várias colunas de resposta: o teste roda em cada uma e sai uma tabela longa com p-valores "
+                             "ajustados por Benjamini-Hochberg")
+    parser.add_argument("--todas-numericas", dest="respostas", action="store_const", const="numericas",
+                        help="Usa como respostas todas as colunas numéricas (fora grupo e fator)")
+    parser.add_argument("--multiplos", action="store_const", const=True,
+                        help="No modo de várias respostas, grava também os pequenos múltiplos")
+    parser.add_argument("--abas", nargs="+", help="Processa apenas estas abas")
+    parser.add_argument("--saida", default="resultados", help="Pasta de saída (padrão: resultados)")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos (padrão: todos os núcleos)")
+    args = parser.parse_args(argv)
+
+    config = montar_config(args)
+    inicio = time.perf_counter()
+    resumo = executar_lote(args.caminho, config, args.saida, args.workers, args.abas)
+    resumo.to_csv(os.path.join(args.saida, "resumo_lote.csv"), index=False)
+
+    erros = int((resumo["status"] == "erro").sum()) if not resumo.empty else 0
+    print(f"{len(resumo)} abas processadas em {time.perf_counter() - inicio:.1f} s ({erros} com erro).")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from gui.leitura import listar_abas, ler_colunas, compactar_tipos
+from gui.desempenho import medir
+
+
+class CacheAbas:
+    """ Cache LRU em memória das abas já lidas do Excel.
+    A chave é (caminho absoluto, mtime, tamanho do arquivo, aba): se o arquivo for alterado no disco
+    a entrada antiga simplesmente deixa de ser encontrada. As entradas menos usadas são descartadas
+    quando o total ultrapassa `limite_mb`.
+    """
+    def __init__(self, limite_mb: float = 512):
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        self.total_bytes = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(caminho: str, aba: str) -> tuple:
+        info = os.stat(caminho)
+        return (os.path.abspath(caminho), info.st_mtime_ns, info.st_size, aba)
+
+    def obter(self, chave):
+        """ Retorna o DataFrame guardado para `chave` (ou None) e o marca como usado recentemente. """
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            self._itens.move_to_end(chave)
+            return item[0]
+
+    def guardar(self, chave, df: pd.DataFrame):
+        """ Guarda o DataFrame se ele couber no limite, descartando as entradas mais antigas. """
+        tamanho = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if chave in self._itens:
+                self.total_bytes -= self._itens.pop(chave)[1]
+            if tamanho > self.limite_bytes:
+                return
+            self._itens[chave] = (df, tamanho)
+            self.total_bytes += tamanho
+            self._descartar()
+
+    def definir_limite(self, limite_mb: float):
+        """ Altera o limite de memória, descartando entradas se necessário. """
+        with self._lock:
+            self.limite_bytes = int(limite_mb * 1024 ** 2)
+            self._descartar()
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.total_bytes = 0
+
+    def _descartar(self):
+        while self._itens and self.total_bytes > self.limite_bytes:
+            _, (_, tamanho) = self._itens.popitem(last=False)
+            self.total_bytes -= tamanho
+
+
+# Subpasta do cache de resultados dentro de diretorio_cache_padrao() (ignorada pelo CacheColunar)
+PASTA_RESULTADOS = "resultados"
+
+
+def diretorio_cache_padrao() -> str:
+    """ Pasta do cache em disco: %LOCALAPPDATA%\\grafitics no Windows, ~/.cache/grafitics nos demais sistemas. """
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "grafitics")
+
+
+def _valor_json(valor):
+    """ Converte escalares numpy para tipos nativos; retorna None se o valor não puder ir para JSON. """
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, (str, bool, int, float)):
+        return valor
+    return None
+
+
+class CacheColunar:
+    """ Cache em disco das abas de uma planilha em formato colunar (.npy por coluna).
+    Cada planilha é identificada pelo hash do conteúdo do arquivo; enquanto o arquivo não mudar as
+    abas são lidas do cache com np.load(mmap_mode="r"), sem passar pelo openpyxl.
+    Colunas numéricas e de data são mapeadas em memória; colunas de texto são guardadas como
+    códigos inteiros + lista de categorias. Quando o total em disco passa de `limite_mb` as
+    planilhas usadas há mais tempo são removidas.
+    """
+    # Incrementar quando o conteúdo gravado mudar (ex.: regras de compactar_tipos); invalida as abas antigas
+    VERSAO = 2
+
+    def __init__(self, diretorio: str = None, limite_mb: float = 2048):
+        self.diretorio = diretorio or diretorio_cache_padrao()
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        # Total em disco conhecido por este processo (None até a primeira poda percorrer a pasta)
+        self.total_bytes = None
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def hash_arquivo(self, caminho: str) -> str:
+        """ Hash (blake2b) do conteúdo do arquivo; memorizado por (caminho, mtime, tamanho). """
+        info = os.stat(caminho)
+        chave = (os.path.abspath(caminho), info.st_mtime_ns, info.st_size)
+        if chave not in self._hashes:
+            h = hashlib.blake2b(digest_size=20)
+            with open(caminho, "rb") as f:
+                for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(bloco)
+            self._hashes[chave] = h.hexdigest()
+        return self._hashes[chave]
+
+    def _pasta_aba(self, hash_planilha: str, aba: str) -> str:
+        nome = hashlib.blake2b(f"{self.VERSAO}:{aba}".encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(self.diretorio, hash_planilha, nome)
+
+    def contem(self, hash_planilha: str, aba: str) -> bool:
+        return os.path.exists(os.path.join(self._pasta_aba(hash_planilha, aba), "meta.json"))
+
+    def ler(self, hash_planilha: str, aba: str):
+        """ Retorna a aba guardada no cache (ou None se não existir ou estiver corrompida). """
+        pasta = self._pasta_aba(hash_planilha, aba)
+        try:
+            with open(os.path.join(pasta, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            colunas = {}
+            for i, col in enumerate(meta["colunas"]):
+                valores = np.load(os.path.join(pasta, f"{i}.npy"), mmap_mode="r")
+                if col["tipo"] == "texto":
+                    categorias = np.array(col["categorias"] + [np.nan], dtype=object)
+                    if col["dtype"] == "category":
+                        # mantém as categorias na ordem gravada (a de aparecimento)
+                        valores = pd.Series(pd.Categorical.from_codes(
+                            np.where(valores == len(col["categorias"]), -1, valores), categories=col["categorias"]))
+                    else:
+                        valores = pd.Series(categorias[valores], copy=False)
+                    if col["dtype"] not in ("object", "category"):
+                        valores = valores.astype(col["dtype"])
+                elif col["tipo"] == "data":
+                    valores = valores.view(col["dtype"])
+                colunas[i] = valores
+            df = pd.DataFrame(colunas, copy=False)
+            df.columns = [col["nome"] for col in meta["colunas"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        os.utime(os.path.join(self.diretorio, hash_planilha))  # marca como usada recentemente
+        return df
+
+    def gravar(self, hash_planilha: str, aba: str, df: pd.DataFrame) -> bool:
+        """ Grava a aba no cache. Retorna False se o DataFrame tiver algo que o formato não representa
+        (índice não padrão, nomes de colunas ou valores de texto que não sejam escalares simples).
+        """
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            return False
+        pasta = self._pasta_aba(hash_planilha, aba)
+        if self.contem(hash_planilha, aba):
+            return True
+        temporaria = f"{pasta}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            os.makedirs(temporaria, exist_ok=True)
+        except OSError:
+            return False  # pasta de cache sem permissão de escrita: segue sem cache em disco
+        gravados = 0
+        try:
+            meta = []
+            for i, nome in enumerate(df.columns):
+                nome_json = _valor_json(nome)
+                if nome_json is None:
+                    return False
+                serie = df.iloc[:, i]
+                if pd.api.types.is_datetime64_any_dtype(serie.dtype) and not isinstance(serie.dtype, pd.DatetimeTZDtype):
+                    valores = serie.to_numpy()
+                    meta.append({"nome": nome_json, "tipo": "data", "dtype": str(valores.dtype)})
+                    valores = valores.view("int64")
+                elif pd.api.types.is_numeric_dtype(serie.dtype) and not isinstance(serie.dtype, pd.CategoricalDtype) \
+                        and not pd.api.types.is_extension_array_dtype(serie.dtype):
+                    valores = serie.to_numpy()
+                    meta.append({"nome": nome_json, "tipo": "numerico", "dtype": str(valores.dtype)})
+                else:
+                    codigos, categorias = pd.factorize(serie)
+                    categorias = [_valor_json(c) for c in categorias]
+                    if any(c is None for c in categorias):
+                        return False
+                    meta.append({"nome": nome_json, "tipo": "texto", "dtype": str(serie.dtype), "categorias": categorias})
+                    # código -1 (ausente) aponta para o NaN adicionado ao fim das categorias na leitura
+                    valores = np.where(codigos < 0, len(categorias), codigos).astype(np.int32)
+                arquivo = os.path.join(temporaria, f"{i}.npy")
+                np.save(arquivo, np.ascontiguousarray(valores))
+                gravados += os.path.getsize(arquivo)
+            with open(os.path.join(temporaria, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"aba": _valor_json(aba), "colunas": meta}, f)
+            try:
+                os.replace(temporaria, pasta)
+            except OSError:
+                gravados = 0  # outro processo gravou a mesma aba ao mesmo tempo
+        except OSError:
+            return False  # disco cheio ou sem permissão: a leitura normal continua funcionando
+        finally:
+            shutil.rmtree(temporaria, ignore_errors=True)
+        self._somar(gravados)
+        return True
+
+    def _somar(self, tamanho: int):
+        """ Acrescenta `tamanho` ao total em disco; a pasta só é percorrida (podar) na primeira gravação ou
+        quando o total passa do limite, e não a cada aba gravada.
+        """
+        with self._lock:
+            if self.total_bytes is not None:
+                self.total_bytes += tamanho
+                if self.total_bytes <= self.limite_bytes:
+                    return
+        self.podar()
+
+    def podar(self):
+        """ Remove as planilhas usadas há mais tempo até o cache caber em `limite_bytes`. """
+        with self._lock:
+            if not os.path.isdir(self.diretorio):
+                self.total_bytes = 0
+                return
+            planilhas = []
+            total = 0
+            for nome in os.listdir(self.diretorio):
+                pasta = os.path.join(self.diretorio, nome)
+                if nome == PASTA_RESULTADOS or not os.path.isdir(pasta):
+                    continue
+                tamanho = sum(os.path.getsize(os.path.join(raiz, arq)) for raiz, _, arqs in os.walk(pasta) for arq in arqs)
+                planilhas.append((os.path.getmtime(pasta), tamanho, pasta))
+                total += tamanho
+            for _, tamanho, pasta in sorted(planilhas):
+                if total <= self.limite_bytes:
+                    break
+                shutil.rmtree(pasta, ignore_errors=True)
+                total -= tamanho
+            self.total_bytes = total
+
+    def definir_limite(self, limite_mb: float):
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        self.podar()
+
+
+class CacheResultados:
+    """ Cache persistente (pickle em disco) dos resultados brutos das estatísticas.
+    A chave combina o hash do conteúdo das colunas usadas com o teste e os parâmetros que mudam o
+    resultado; alpha fica de fora, pois os p-valores são guardados sem limiar. As entradas usadas há
+    mais tempo são removidas quando o total passa de `limite_mb`. As últimas entradas lidas também
+    ficam em memória, para que cliques repetidos não releiam o disco.
+    """
+    # Incrementar quando o formato dos resultados brutos mudar (invalida as entradas antigas)
+    VERSAO = 1
+    ENTRADAS_EM_MEMORIA = 32
+
+    def __init__(self, diretorio: str = None, limite_mb: float = 256):
+        self.diretorio = diretorio or os.path.join(diretorio_cache_padrao(), PASTA_RESULTADOS)
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        # Total em disco conhecido por este processo (None até a primeira poda percorrer a pasta)
+        self.total_bytes = None
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+
+    def chave(self, data: pd.DataFrame, colunas: list, *parametros) -> str:
+        """ Chave da combinação (conteúdo das colunas, parâmetros). Linhas e colunas fora de `colunas` não contam. """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(repr((self.VERSAO, [str(data[c].dtype) for c in colunas], colunas, parametros)).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(data[colunas], index=False).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def _arquivo(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.pkl")
+
+    def obter(self, chave: str):
+        """ Retorna o resultado guardado para `chave` ou None. """
+        with self._lock:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                return self._memoria[chave]
+        arquivo = self._arquivo(chave)
+        try:
+            with open(arquivo, "rb") as f:
+                valor = pickle.load(f)
+            os.utime(arquivo)  # marca como usado recentemente
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        self._lembrar(chave, valor)
+        return valor
+
+    def guardar(self, chave: str, valor) -> bool:
+        """ Grava o resultado em disco (escrita atômica). Retorna False se não foi possível gravar. """
+        self._lembrar(chave, valor)
+        temporario = f"{self._arquivo(chave)}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            with open(temporario, "wb") as f:
+                pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tamanho = os.path.getsize(temporario)
+            os.replace(temporario, self._arquivo(chave))
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            return False
+        self._somar(tamanho)
+        return True
+
+    def _somar(self, tamanho: int):
+        """ Acrescenta `tamanho` ao total em disco; a pasta só é percorrida (podar) na primeira gravação ou
+        quando o total passa do limite, e não a cada resultado gravado.
+        """
+        with self._lock:
+            if self.total_bytes is not None:
+                self.total_bytes += tamanho
+                if self.total_bytes <= self.limite_bytes:
+                    return
+        self.podar()
+
+    def _lembrar(self, chave: str, valor):
+        with self._lock:
+            self._memoria[chave] = valor
+            self._memoria.move_to_end(chave)
+            while len(self._memoria) > self.ENTRADAS_EM_MEMORIA:
+                self._memoria.popitem(last=False)
+
+    def podar(self):
+        """ Remove os resultados usados há mais tempo até o cache caber em `limite_bytes`. """
+        with self._lock:
+            try:
+                arquivos = [os.path.join(self.diretorio, nome) for nome in os.listdir(self.diretorio) if nome.endswith(".pkl")]
+            except OSError:
+                self.total_bytes = 0
+                return
+            entradas = []
+            for arquivo in arquivos:
+                try:
+                    info = os.stat(arquivo)
+                except OSError:
+                    continue  # removido por outro processo
+                entradas.append((info.st_mtime, info.st_size, arquivo))
+            total = sum(tamanho for _, tamanho, _ in entradas)
+            for _, tamanho, arquivo in sorted(entradas):
+                if total <= self.limite_bytes:
+                    break
+                try:
+                    os.remove(arquivo)
+                except OSError:
+                    pass
+                total -= tamanho
+            self.total_bytes = total
+
+    def definir_limite(self, limite_mb: float):
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        self.podar()
+
+    def limpar(self):
+        """ Esvazia o cache em memória e apaga os resultados gravados. """
+        with self._lock:
+            self._memoria.clear()
+            self.total_bytes = 0
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+
+cache_abas = CacheAbas()
+cache_colunar = CacheColunar()
+cache_resultados = CacheResultados()
+
+
+def ler_aba(caminho: str, aba: str, cache: CacheAbas = cache_abas,
+            cache_disco: CacheColunar = cache_colunar, colunas: list = None, progresso=None,
+            compactar: bool = True) -> pd.DataFrame:
+    """ Lê uma aba do Excel passando pelo cache em memória e, em seguida, pelo cache colunar em disco.
+    Em caso de falta nos dois, a aba é lida em streaming (leitura.ler_colunas).
+    Parâmetros:
+    - caminho: Caminho do arquivo Excel.
+    - aba: Nome da aba.
+    - cache: Cache em memória a ser usado.
+    - cache_disco: Cache colunar em disco (None para desativar).
+    - colunas: Lê apenas estas colunas (None para todas). Leituras parciais não são guardadas nos caches,
+      mas aproveitam a aba inteira se ela já estiver em um deles.
+    - progresso: Função progresso(fracao, mensagem) repassada à leitura do Excel.
+    - compactar: Aplica leitura.compactar_tipos ao que for lido do Excel (o relatório fica em
+      df.attrs["compactacao"]; abas vindas do cache em disco já estão compactadas e não o têm).
+    Retorna:
+    - DataFrame da aba. É uma cópia rasa: alterar colunas dele não altera o conteúdo do cache.
+    """
+    chave = cache.chave(caminho, aba)
+    df = cache.obter(chave)
+    if df is None:
+        with medir("cache em disco (leitura)"):
+            hash_planilha = cache_disco.hash_arquivo(caminho) if cache_disco is not None else None
+            if hash_planilha is not None:
+                df = cache_disco.ler(hash_planilha, aba)
+        if df is None:
+            with medir("ler_colunas"):
+                df = ler_colunas(caminho, aba, colunas, progresso=progresso)
+            if compactar:
+                with medir("compactar_tipos"):
+                    df, relatorio = compactar_tipos(df)
+                df.attrs["compactacao"] = relatorio
+            if colunas is not None:
+                return df
+            if hash_planilha is not None:
+                with medir("cache em disco (gravação)"):
+                    cache_disco.gravar(hash_planilha, aba, df)
+        cache.guardar(chave, df)
+    if colunas is not None:
+        return df[[c for c in df.columns if c in colunas]].copy(deep=False)
+    return df.copy(deep=False)
+
+
+def aba_em_memoria(caminho: str, aba: str, cache: CacheAbas = cache_abas) -> bool:
+    """ Indica se a aba já está no cache em memória (pode ser obtida na hora, sem ler nenhum arquivo). """
+    return cache.obter(cache.chave(caminho, aba)) is not None
+
+
+def preparar_planilha(caminho: str, cache: CacheAbas = cache_abas,
+                      cache_disco: CacheColunar = cache_colunar) -> list:
+    """ Garante que todas as abas da planilha estejam no cache colunar em disco.
+    Se o conteúdo do arquivo já estiver no cache nada é lido do Excel; caso contrário as abas que faltam
+    são lidas uma única vez (em streaming) e gravadas (e também guardadas no cache em memória).
+    Retorna:
+    - Lista com os nomes das abas.
+    """
+    abas = listar_abas(caminho)
+    hash_planilha = cache_disco.hash_arquivo(caminho)
+    for aba in abas:
+        if not cache_disco.contem(hash_planilha, aba):
+            df, _ = compactar_tipos(ler_colunas(caminho, aba))
+            cache_disco.gravar(hash_planilha, aba, df)
+            cache.guardar(cache.chave(caminho, aba), df)
+    return abas
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+
+def _somente_leitura(valores: np.ndarray) -> np.ndarray:
+    """ Visão (sem cópia) de `valores` que não pode ser alterada; o array original continua gravável. """
+    visao = valores.view()
+    visao.flags.writeable = False
+    return visao
+
+
+def _fatorar(serie: pd.Series):
+    """ pd.factorize com os valores distintos sempre como Index comum (colunas category vêm da
+    compactação de tipos na leitura e não devem mudar o tipo das tabelas de resultado).
+    """
+    codigos, valores = pd.factorize(serie)
+    if isinstance(valores, (pd.Categorical, pd.CategoricalIndex)):
+        valores = pd.Index(np.asarray(valores))
+    return codigos, valores
+
+
+class Dados:
+    """ Visão somente leitura, já fatorada, das colunas usadas por uma análise.
+    Grupos e fator são convertidos uma única vez em códigos inteiros (ordem em que aparecem nos dados;
+    -1 para valores ausentes) e a resposta é mantida como um array float64 contíguo. Quando a coluna de
+    resposta já é float64 o array é uma visão dos dados do DataFrame, sem cópia. Nenhum array exposto
+    aceita escrita, e o DataFrame original nunca é alterado.
+    Parâmetros:
+    - data: DataFrame com os dados.
+    - group_col: Coluna com os grupos.
+    - response_col: Coluna com a resposta.
+    - fator_col: Coluna com o fator (opcional).
+    """
+    def __init__(self, data: pd.DataFrame, group_col: str, response_col: str, fator_col: str = None):
+        self.group_col = group_col
+        self.response_col = response_col
+        self.fator_col = fator_col or None
+        self.n_linhas = len(data)
+
+        codigos, grupos = _fatorar(data[group_col])
+        self.codigos_grupo = _somente_leitura(codigos)
+        self.grupos = grupos
+
+        self.y = _somente_leitura(np.ascontiguousarray(data[response_col].to_numpy(dtype=np.float64)))
+
+        if self.fator_col:
+            codigos, fatores = _fatorar(data[self.fator_col])
+            self.codigos_fator = _somente_leitura(codigos)
+            self.fatores = fatores
+        else:
+            self.codigos_fator, self.fatores = None, None
+
+    @classmethod
+    def de(cls, data, group_col: str, response_col: str, fator_col: str = None) -> "Dados":
+        """ Aceita um DataFrame ou um Dados; um Dados com as mesmas colunas é devolvido sem refazer nada. """
+        if isinstance(data, cls) and (data.group_col, data.response_col, data.fator_col) == (group_col, response_col, fator_col or None):
+            return data
+        if isinstance(data, cls):
+            raise ValueError("Dados criado para outras colunas.")
+        return cls(data, group_col, response_col, fator_col)
+
+    @property
+    def n_grupos(self) -> int:
+        return len(self.grupos)
+
+    @property
+    def categorias(self) -> pd.CategoricalIndex:
+        """ Grupos como índice categórico ordenado (ordem em que aparecem nos dados). """
+        return pd.CategoricalIndex(self.grupos, categories=self.grupos, ordered=True, name=self.group_col)
+
+    def ordem_crescente(self) -> np.ndarray:
+        """ Permutação dos códigos de grupo que coloca os grupos em ordem crescente (igual a factorize(sort=True)). """
+        return self.grupos.argsort()
@@ -0,0 +1,153 @@
+""" Medição de tempo (spans) e pico de memória das etapas do app: leitura, estatísticas, gráfico e exportação.
+
+Uso:
+    with medir("ler_colunas"):
+        ...
+
+Um span aberto sem outro acima dele, na mesma thread, é uma operação: ao terminar, a operação e
+todos os spans dentro dela viram um relatório (ultimos_relatorios) e, se houver log, uma linha JSON.
+O pico de memória de cada operação vem do tracemalloc (memória alocada pelo Python e pelo NumPy neste
+processo, incluindo outras threads no mesmo intervalo; não inclui os processos de exportação).
+Desligado (o padrão), medir() só consulta uma variável e devolve um contexto vazio.
+"""
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from functools import wraps
+
+_ativo = False
+_caminho_log = None
+_trava = threading.Lock()
+_local = threading.local()
+# Últimas operações concluídas (a mais recente no fim)
+_recentes = deque(maxlen=20)
+_NULO = nullcontext()
+
+
+def ativar(ligado: bool = True, caminho_log: str = None):
+    """ Liga ou desliga a medição.
+    Parâmetros:
+    - ligado: Se True, os spans passam a ser medidos e o tracemalloc é iniciado (ele deixa as alocações
+      mais lentas, por isso só fica ligado junto com a medição).
+    - caminho_log: Arquivo JSON-lines onde cada operação é acrescentada (None para não gravar).
+    """
+    global _ativo, _caminho_log
+    _caminho_log = caminho_log or None
+    if ligado and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not ligado and _ativo and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _ativo = ligado
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+class _Span:
+    """ Span em andamento; vira um dicionário (nome, inicio_s, duracao_s, filhos) ao terminar. """
+    __slots__ = ("nome", "inicio", "filhos")
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.filhos = []
+
+    def __enter__(self):
+        pilha = getattr(_local, "pilha", None)
+        if pilha is None:
+            pilha = _local.pilha = []
+        if not pilha and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()  # pico medido por operação
+        pilha.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        duracao = time.perf_counter() - self.inicio
+        pilha = _local.pilha
+        pilha.pop()
+        registro = {"nome": self.nome, "duracao_s": round(duracao, 6)}
+        if erro is not None:
+            registro["erro"] = type(erro).__name__
+        if self.filhos:
+            registro["filhos"] = self.filhos
+        if pilha:
+            registro["inicio_s"] = round(self.inicio - pilha[0].inicio, 6)
+            pilha[-1].filhos.append(registro)
+        else:
+            if tracemalloc.is_tracing():
+                registro["pico_memoria_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 2)
+            registro["data"] = datetime.now().isoformat(timespec="seconds")
+            registro["thread"] = threading.current_thread().name
+            _publicar(registro)
+        return False
+
+
+def medir(nome: str):
+    """ Contexto que mede o trecho como um span chamado `nome` (não faz nada com a medição desligada). """
+    if not _ativo:
+        return _NULO
+    return _Span(nome)
+
+
+def medido(funcao=None, nome: str = None):
+    """ Decorador: mede cada chamada da função como um span (por padrão com o nome da função). """
+    def decorar(funcao):
+        rotulo = nome or funcao.__name__
+
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not _ativo:
+                return funcao(*args, **kwargs)
+            with _Span(rotulo):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorar(funcao) if funcao is not None else decorar
+
+
+def registrar(nome: str, duracao_s: float, **extras):
+    """ Acrescenta ao span aberto (nesta thread) um span já medido em outro lugar, por exemplo em um
+    processo de trabalho da exportação. Sem span aberto, ou com a medição desligada, não faz nada.
+    """
+    pilha = getattr(_local, "pilha", None)
+    if _ativo and pilha:
+        pilha[-1].filhos.append({"nome": nome, "duracao_s": round(duracao_s, 6), **extras})
+
+
+def _publicar(registro: dict):
+    with _trava:
+        _recentes.append(registro)
+        if _caminho_log:
+            with open(_caminho_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+
+def ultimos_relatorios(quantidade: int = 1) -> list:
+    """ As `quantidade` operações concluídas mais recentes, da mais antiga para a mais nova. Cada uma é um
+    dicionário com nome, duracao_s, pico_memoria_mb, data, thread e filhos (spans internos, no mesmo formato).
+    """
+    with _trava:
+        return list(_recentes)[-quantidade:]
+
+
+def formatar(relatorio: dict, largura: int = 44) -> str:
+    """ Texto com a árvore de spans de uma operação, um por linha, com a duração de cada um. """
+    if not relatorio:
+        return "Nenhuma operação medida ainda."
+    linhas = []
+
+    def escrever(span, nivel):
+        rotulo = "  " * nivel + str(span["nome"])
+        extra = f"  [{span['erro']}]" if "erro" in span else ""
+        linhas.append(f"{rotulo:<{largura}} {span['duracao_s']:>8.3f} s{extra}")
+        for filho in span.get("filhos", ()):
+            escrever(filho, nivel + 1)
+
+    escrever(relatorio, 0)
+    if relatorio.get("pico_memoria_mb") is not None:
+        linhas.append(f"{'pico de memória (Python)':<{largura}} {relatorio['pico_memoria_mb']:>8.1f} MB")
+    return "\n".join(linhas)
@@ -0,0 +1,146 @@
+import numpy as np
+from functools import lru_cache
+# só scipy.special: scipy.stats leva segundos para importar e pesa na abertura do app e de cada processo do lote
+from scipy.special import ndtr, log_ndtr, gammaincinv, gammaln, xlogy
+from scipy.optimize import brentq
+from scipy.interpolate import CubicSpline
+
+# Nós de quadratura: Gauss-Hermite (probabilista) para a normal padrão e Gauss-Legendre em (0, 1)
+# para a escala s = sqrt(chi2(gl) / gl) do denominador das estatísticas t.
+N_NOS_Z = 64
+N_NOS_S = 48
+# Gauss-Legendre em [-LIMITE_Z, LIMITE_Z] para a amplitude studentizada: com muitos grupos o integrando
+# fica concentrado na cauda direita da normal, onde poucos nós de Gauss-Hermite não chegam
+N_NOS_AMPLITUDE = 128
+LIMITE_Z = 8.5
+# Acima deste número de valores a sf da amplitude é interpolada (spline em log p) em vez de calculada em cada um
+N_PONTOS_INTERPOLACAO = 256
+# Limite de elementos dos arrays intermediários (controla a memória dos cálculos em bloco)
+MAX_ELEMENTOS = 2_000_000
+
+_z, _wz = np.polynomial.hermite_e.hermegauss(N_NOS_Z)
+_wz = _wz / np.sqrt(2 * np.pi)
+
+_za, _wa = np.polynomial.legendre.leggauss(N_NOS_AMPLITUDE)
+_za = _za * LIMITE_Z
+_wa = _wa * LIMITE_Z * np.exp(-_za ** 2 / 2) / np.sqrt(2 * np.pi)
+_log_fza = log_ndtr(_za)
+
+
+def _densidade_chi2(x: np.ndarray, gl: float) -> np.ndarray:
+    """ Densidade da qui-quadrado com gl graus de liberdade (x > 0). """
+    k = gl / 2
+    return np.exp(xlogy(k - 1, x) - x / 2 - k * np.log(2) - gammaln(k))
+
+
+@lru_cache(maxsize=64)
+def _nos_escala(gl: float):
+    """ Nós e pesos para E[g(s)], s = sqrt(chi2(gl)/gl). Com gl infinito s = 1.
+    A quadratura é feita em log(s), entre os quantis 1e-15 e 1 - 1e-15, o que mantém nós suficientes
+    na cauda inferior de s, de onde vêm os p-valores pequenos.
+    """
+    if not np.isfinite(gl):
+        return np.ones(1), np.ones(1)
+    # quantis da qui-quadrado = 2 x quantis da gama de forma gl/2 (a mesma conta de scipy.stats.chi2.ppf)
+    lo, hi = np.log(np.sqrt(2 * gammaincinv(gl / 2, np.array([1e-15, 1 - 1e-15])) / gl))
+    x, w = np.polynomial.legendre.leggauss(N_NOS_S)
+    s = np.exp(lo + (x + 1) * (hi - lo) / 2)
+    # densidade de s = 2 gl s f_chi2(gl s^2); ds = s d(log s)
+    pesos = w * (hi - lo) / 2 * _densidade_chi2(gl * s ** 2, gl) * 2 * gl * s ** 2
+    return s, pesos / pesos.sum()
+
+
+def sf_dunnett(c, lambdas, gl: float) -> np.ndarray:
+    """
+    P(max_i |T_i| > c) para as estatísticas de Dunnett (comparações de k-1 grupos com um controle),
+    isto é, o p-valor ajustado de cada |t| observado.
+    As T_i seguem uma t multivariada com correlações rho_ij = lambda_i * lambda_j, onde
+    lambda_i = sqrt(n_i / (n_i + n_controle)). Essa estrutura permite condicionar em uma única
+    normal comum, reduzindo a integral a duas dimensões (normal comum e escala qui-quadrado).
+    Parâmetros:
+    - c: Valor(es) críticos (escalar ou vetor, >= 0).
+    - lambdas: Vetor com lambda_i de cada comparação.
+    - gl: Graus de liberdade do erro (np.inf para variância conhecida).
+    Retorna:
+    - Vetor com a probabilidade para cada c.
+    """
+    c = np.atleast_1d(np.asarray(c, dtype=float))
+    # grupos com o mesmo tamanho têm o mesmo lambda: o produto vira potência
+    lam, mult = np.unique(np.round(np.asarray(lambdas, dtype=float), 12), return_counts=True)
+    raiz = np.sqrt(1 - lam ** 2)
+    s, ws = _nos_escala(float(gl))
+    lz = lam * _z[:, None]                                  # (nz, nl)
+
+    resultado = np.empty(len(c))
+    bloco = max(1, MAX_ELEMENTOS // (len(s) * len(_z) * len(lam)))
+    for inicio in range(0, len(c), bloco):
+        cs = (c[inicio:inicio + bloco, None] * s)[:, :, None, None]        # (b, ns, 1, 1)
+        prob = ndtr((cs - lz) / raiz) - ndtr((-cs - lz) / raiz)          # (b, ns, nz, nl)
+        log_prod = (mult * np.log(np.maximum(prob, 1e-300))).sum(axis=-1)
+        # complemento calculado com expm1 para não perder precisão em p-valores pequenos
+        resultado[inicio:inicio + bloco] = -np.expm1(log_prod) @ _wz @ ws
+    return np.clip(resultado, 0.0, 1.0)
+
+
+def cdf_dunnett(c, lambdas, gl: float) -> np.ndarray:
+    """ P(max_i |T_i| <= c); ver sf_dunnett. """
+    return 1.0 - sf_dunnett(c, lambdas, gl)
+
+
+def _inverter_sf(sf, prob: float) -> float:
+    """ Resolve sf(c) = 1 - prob para c >= 0 (sf decrescente, escalar -> vetor de 1 elemento). """
+    alto = 10.0
+    while sf(alto)[0] > 1 - prob:
+        alto *= 2
+    return brentq(lambda c: sf(c)[0] - (1 - prob), 0.0, alto, xtol=1e-6)
+
+
+def quantil_dunnett(prob: float, lambdas, gl: float) -> float:
+    """ Valor crítico bilateral c tal que cdf_dunnett(c) = prob. """
+    return _inverter_sf(lambda c: sf_dunnett(c, lambdas, gl), prob)
+
+
+def _sf_amplitude_nos(q: np.ndarray, k: int, gl: float) -> np.ndarray:
+    """ sf da amplitude studentizada calculada por quadratura em cada valor de q (ver sf_amplitude). """
+    s, ws = _nos_escala(float(gl))
+    resultado = np.empty(len(q))
+    bloco = max(1, MAX_ELEMENTOS // (len(s) * len(_za)))
+    for inicio in range(0, len(q), bloco):
+        w = (q[inicio:inicio + bloco, None] * s)[:, :, None]                 # (b, ns, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # P(R > w | Z = z) * densidade: Phi(z)^(k-1) - (Phi(z) - Phi(z - w))^(k-1), fatorado para usar expm1
+            razao = np.exp(log_ndtr(_za - w) - _log_fza)
+            termo = np.exp((k - 1) * _log_fza) * -np.expm1((k - 1) * np.log1p(-razao))
+        resultado[inicio:inicio + bloco] = k * (np.nan_to_num(termo) @ _wa) @ ws
+    return np.clip(resultado, 0.0, 1.0)
+
+
+def sf_amplitude(q, k: int, gl: float) -> np.ndarray:
+    """
+    P(Q > q) para a amplitude studentizada de k médias com gl graus de liberdade, isto é, o p-valor
+    ajustado do teste de Tukey (HSD / Tukey-Kramer) para cada q = |diferença| / erro.
+    Condiciona no maior valor Z da amplitude (integral em z) e na escala qui-quadrado do erro.
+    Com muitos valores (muitos pares de grupos) a função é calculada em N_PONTOS_INTERPOLACAO pontos
+    e interpolada em log p, o que mantém o custo fixo (erro ~1e-7, abaixo do arredondamento da tabela).
+    Parâmetros:
+    - q: Estatística(s) observada(s) (escalar ou vetor, >= 0).
+    - k: Número de grupos.
+    - gl: Graus de liberdade do erro (np.inf para variância conhecida).
+    Retorna:
+    - Vetor com a probabilidade para cada q (NaN onde q é NaN).
+    """
+    q = np.atleast_1d(np.asarray(q, dtype=float))
+    resultado = np.full(len(q), np.nan)
+    validos = np.isfinite(q)
+    if len(q) <= N_PONTOS_INTERPOLACAO or not validos.any():
+        resultado[validos] = _sf_amplitude_nos(q[validos], k, gl)
+        return resultado
+    grade = np.linspace(0.0, q[validos].max(), N_PONTOS_INTERPOLACAO)
+    log_p = np.log(np.maximum(_sf_amplitude_nos(grade, k, gl), 1e-300))
+    resultado[validos] = np.clip(np.exp(CubicSpline(grade, log_p)(q[validos])), 0.0, 1.0)
+    return resultado
+
+
+def quantil_amplitude(prob: float, k: int, gl: float) -> float:
+    """ Valor crítico q tal que P(Q <= q) = prob para a amplitude studentizada de k médias. """
+    return _inverter_sf(lambda q: _sf_amplitude_nos(np.atleast_1d(float(q)), k, gl), prob)
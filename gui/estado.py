@@ -0,0 +1,85 @@
+import traceback
+from tkinter import TclError
+
+
+class Estado:
+    """ Estado central da interface: valores com nome (ligados às variáveis do Tk) e funções assinantes.
+    Cada variável é ligada e cada função é assinada uma única vez. Alterações seguidas (vários campos
+    preenchidos no mesmo evento, uma troca de arquivo que também troca a aba...) são juntadas e
+    entregues em uma só rodada, no after_idle; cada assinante é chamado no máximo uma vez por rodada,
+    e só se alguma das chaves que ele lê mudou de valor.
+    Parâmetros:
+    - widget: Qualquer widget Tk (normalmente a janela principal), usado para agendar o after_idle.
+    Os assinantes recebem o conjunto das chaves alteradas (entre as que assinaram) e rodam na thread do Tk.
+    """
+    def __init__(self, widget):
+        self.widget = widget
+        self._valores = {}
+        self._variaveis = {}
+        self._assinantes = []
+        self._alteradas = set()
+        self._agendado = False
+
+    def ligar(self, chave: str, variavel):
+        """ Liga uma variável do Tk à `chave`: cada escrita nela atualiza o estado (um só trace por variável). """
+        if chave in self._variaveis:
+            if self._variaveis[chave] is variavel:
+                return
+            raise ValueError(f"Chave '{chave}' já ligada a outra variável")
+        self._variaveis[chave] = variavel
+        self._valores[chave] = self._ler(variavel)
+        variavel.trace_add("write", lambda *args: self._atualizar(chave, self._ler(variavel)))
+
+    @staticmethod
+    def _ler(variavel):
+        try:
+            return variavel.get()
+        except (TclError, ValueError):
+            return None  # valor incompleto enquanto o usuário digita
+
+    def assinar(self, chaves, funcao):
+        """ Chama `funcao(alteradas)` ao fim de cada rodada em que alguma de `chaves` mudou.
+        Assinar de novo a mesma função para as mesmas chaves não tem efeito.
+        """
+        chaves = frozenset([chaves] if isinstance(chaves, str) else chaves)
+        if (chaves, funcao) not in self._assinantes:
+            self._assinantes.append((chaves, funcao))
+
+    def obter(self, chave: str, padrao=None):
+        return self._valores.get(chave, padrao)
+
+    def __getitem__(self, chave: str):
+        return self._valores[chave]
+
+    def definir(self, **valores):
+        """ Atualiza valores que não vêm de variáveis do Tk (ex.: colunas da aba). """
+        for chave, valor in valores.items():
+            self._atualizar(chave, valor)
+
+    def tocar(self, *chaves):
+        """ Marca `chaves` como alteradas mesmo sem mudança de valor (ex.: o mesmo arquivo aberto de novo). """
+        self._alteradas.update(chaves)
+        self._agendar()
+
+    def _atualizar(self, chave: str, valor):
+        if chave in self._valores and self._valores[chave] == valor:
+            return
+        self._valores[chave] = valor
+        self._alteradas.add(chave)
+        self._agendar()
+
+    def _agendar(self):
+        if not self._agendado:
+            self._agendado = True
+            self.widget.after_idle(self._rodada)
+
+    def _rodada(self):
+        """ Entrega as alterações acumuladas. O que os assinantes alterarem fica para a rodada seguinte. """
+        self._agendado = False
+        alteradas, self._alteradas = self._alteradas, set()
+        for chaves, funcao in list(self._assinantes):
+            if chaves & alteradas:
+                try:
+                    funcao(chaves & alteradas)
+                except Exception:
+                    traceback.print_exc()  # um assinante com erro não impede os demais
@@ -1,35 +1,282 @@
 import numpy as np
-import statsmodels.api as sm
 import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-import seaborn as sns
-from statsmodels.stats.multicomp import pairwise_tukeyhsd, MultiComparison
-from statsmodels.formula.api import ols
-from scipy.stats import ttest_ind
+from functools import cached_property
+from scipy.special import stdtr, fdtrc
+from gui.distribuicoes import sf_dunnett, quantil_dunnett, sf_amplitude, quantil_amplitude
+from gui.dados import Dados
+from gui.desempenho import medir, medido
+from gui.reamostragem import REAMOSTRAS, bootstrap_medias, intervalo_percentil, permutacao_pares, permutacao_estratos
 
 
 class Estatiscas:
-    def __init__(self, data: pd.DataFrame, group_col: str, fator_col: str, response_col: str, control: str, alpha=0.05):
+    """ Motor de estatísticas de um conjunto de dados e colunas.
+    Cada etapa (resumos por grupo, ANOVA, Tukey, Dunnett, teste t e tabelas de significância) só é
+    calculada quando pedida e fica guardada no objeto; as etapas reaproveitam umas às outras, por
+    exemplo as médias por grupo servem ao Dunnett, ao Tukey e à ANOVA. As etapas que dependem de
+    alpha ficam guardadas por valor de alpha, então trocar alpha não refaz os testes.
+    Se os dados ou as colunas mudarem, use atualizar() (ou invalidar() após alterar `data` no lugar).
+    Parâmetros:
+    - data, group_col, fator_col, response_col, control, alpha: ver gerar_estatisticas.
+    - cache: CacheResultados opcional para os resultados brutos de estatisticas().
+    As reamostragens (bootstrap e permutação) ficam guardadas por teste, número de reamostras e semente;
+    elas não vão para o cache de resultados.
+    """
+    # Etapas guardadas como cached_property (apagadas por invalidar)
+    _ETAPAS = ('dados', 'resumo_grupos', 'resumo_ordenado', 'indice_controle', 'dunnett_bruto', 'resumo_dunnett',
+               'tukey_bruto', 'anova', 'media_erro', 't_test', 'resumo_ttest')
+
+    def __init__(self, data: pd.DataFrame, group_col: str, fator_col: str, response_col: str, control: str, alpha=0.05, cache=None):
         self.data = data
         self.group_col = group_col
         self.fator_col = fator_col if fator_col else None
         self.response_col = response_col
         self.control = control
         self.alpha = alpha
+        self.cache = cache
+        self._por_alpha = {}
+        self._brutas = {}
+        self._reamostragens = {}
+
+    def invalidar(self):
+        """ Descarta tudo o que já foi calculado (usar quando `data` for alterado no lugar). """
+        for nome in self._ETAPAS:
+            self.__dict__.pop(nome, None)
+        self._por_alpha.clear()
+        self._brutas.clear()
+        self._reamostragens.clear()
+
+    def atualizar(self, **campos):
+        """ Altera dados, colunas, controle ou alpha. Só descarta os resultados se algo além de alpha mudou. """
+        if 'fator_col' in campos:
+            campos['fator_col'] = campos['fator_col'] or None
+        mudou = False
+        for nome, valor in campos.items():
+            if nome not in ('data', 'group_col', 'fator_col', 'response_col', 'control', 'alpha'):
+                raise TypeError(f"Campo desconhecido: {nome}")
+            if nome != 'alpha' and getattr(self, nome) is not valor and getattr(self, nome) != valor:
+                mudou = True
+            setattr(self, nome, valor)
+        if mudou:
+            self.invalidar()
+
+    def _memo(self, nome: str, alpha, calcular):
+        """ Guarda o resultado de uma etapa que depende de alpha. """
+        alpha = self.alpha if alpha is None else alpha
+        chave = (nome, alpha)
+        if chave not in self._por_alpha:
+            with medir(f"{nome if isinstance(nome, str) else ' '.join(map(str, nome))} (alpha={alpha})"):
+                self._por_alpha[chave] = calcular(alpha)
+        return self._por_alpha[chave]
+
+    # ----- etapas que não dependem de alpha -----
+    @cached_property
+    @medido
+    def dados(self) -> Dados:
+        """ Colunas usadas, fatoradas uma única vez (todas as etapas trabalham sobre elas). """
+        return Dados(self.data, self.group_col, self.response_col, self.fator_col)
+
+    @cached_property
+    @medido
+    def resumo_grupos(self):
+        """ (grupos, n, media, sq_dentro) com os grupos na ordem em que aparecem nos dados. """
+        dados = self.dados
+        return (dados.grupos,) + _resumo_por_grupo(dados.codigos_grupo, dados.n_grupos, dados.y)
+
+    @cached_property
+    @medido
+    def resumo_ordenado(self):
+        """ (grupos, n, media, sq_dentro) em ordem crescente de grupo, sem grupos vazios (Tukey e ANOVA). """
+        return _ordenar_resumo(self.dados, *self.resumo_grupos[1:])
+
+    @cached_property
+    def indice_controle(self) -> int:
+        return _indice_do_grupo(self.resumo_grupos[0], self.control)
+
+    @cached_property
+    @medido
+    def dunnett_bruto(self) -> dict:
+        _, n, media, sq_dentro = self.resumo_grupos
+        return _dunnett_bruto(n, media, sq_dentro, self.indice_controle)
+
+    @cached_property
+    @medido
+    def resumo_dunnett(self) -> pd.DataFrame:
+        grupos, n, media, sq_dentro = self.resumo_grupos
+        return _tabela_resumo({self.group_col: grupos}, n, media, sq_dentro)
 
+    @cached_property
+    @medido
+    def tukey_bruto(self) -> dict:
+        return _tukey_bruto(*self.resumo_ordenado[1:])
+
+    @cached_property
+    @medido
+    def anova(self) -> pd.DataFrame:
+        return _tabela_anova(*self.resumo_ordenado[1:], self.group_col)
+
+    @cached_property
+    @medido
+    def media_erro(self):
+        """ Média e erro padrão por tratamento (Series em ordem de tratamento), usados no gráfico do Tukey. """
+        return _media_erro(*self.resumo_ordenado, self.group_col, self.response_col)
+
+    @cached_property
+    @medido
+    def t_test(self) -> pd.DataFrame:
+        return run_t_test(self.dados, self.group_col, self.fator_col, self.response_col)
+
+    @cached_property
+    @medido
+    def resumo_ttest(self):
+        return _resumo_ttest(self.dados, self.response_col, self.group_col, self.fator_col)
+
+    # ----- etapas que dependem de alpha -----
     def run_t_test(self):
-        return run_t_test(self.data, self.group_col, self.fator_col, self.response_col)
+        return self.t_test
 
-    def run_dunnett(self):
-        return run_test_dunnett(self.data, self.response_col, self.group_col, self.control, self.alpha)
+    def run_dunnett(self, alpha=None):
+        return self._memo('dunnett', alpha, lambda a: (
+            _tabela_dunnett(self.dunnett_bruto, self.resumo_grupos[0], self.indice_controle, a), self.resumo_grupos[0].tolist()))
 
-    def run_tukey(self):
-        return run_test_tukey(self.data, self.response_col, self.group_col, self.alpha)
+    def run_tukey(self, alpha=None):
+        return self._memo('tukey', alpha, lambda a: _tabela_tukey(self.tukey_bruto, self.resumo_ordenado[0], a))
+
+    def letras(self, alpha=None) -> list:
+        return self._memo('letras', alpha, lambda a: letras_cld(self.media_erro[0], self.run_tukey(a)).tolist())
+
+    def add_significance(self, dunnett_result=None, alpha=None):
+        if dunnett_result is not None:
+            return _significancia_dunnett(self.resumo_dunnett, dunnett_result, self.group_col, self.control, self.alpha if alpha is None else alpha)
+        return self._memo('significancia_dunnett', alpha, lambda a: _significancia_dunnett(
+            self.resumo_dunnett, self.run_dunnett(a)[0], self.group_col, self.control, a))
+
+    def significancia_ttest(self, alpha=None):
+        return self._memo('significancia_ttest', alpha, lambda a: _significancia_ttest(
+            self.resumo_ttest[0], self.t_test, self.group_col, self.fator_col, a))
+
+    # ----- resultados no formato de gerar_estatisticas -----
+    def brutas(self, teste: str) -> dict:
+        """ Resultados de `teste` que não dependem de alpha (formato de estatisticas_brutas). """
+        fator_col = self.fator_col if teste == "t-test" else None
+        control = self.control if teste == "dunnett" else None
+        brutas = {"teste": teste, "group_col": self.group_col, "response_col": self.response_col, "fator_col": fator_col, "control": control}
+
+        if teste == "dunnett":
+            brutas.update(grupos=self.resumo_grupos[0], controle=self.indice_controle, bruto=self.dunnett_bruto,
+                          resumo=self.resumo_dunnett)
+            return brutas
+
+        if teste == "t-test":
+            if not fator_col and self.dados.n_grupos != 2:
+                raise ValueError("Para o teste t, deve haver exatamente dois grupos.")
+            resumo, ordem = self.resumo_ttest
+            brutas.update(resultado=self.t_test, resumo=resumo, ordem=ordem)
+            return brutas
+
+        if teste == "tukey":
+            grupos, n, media, sq_dentro = self.resumo_ordenado
+            brutas.update(grupos=grupos, n=n, media=media, sq_dentro=sq_dentro, bruto=self.tukey_bruto, anova=self.anova)
+            return brutas
+
+        raise ValueError("Selecione um teste estatístico válido.")
+
+    # ----- reamostragem -----
+    def _celulas(self, teste: str):
+        """ Célula de cada linha para o bootstrap: grupo (ordem de aparecimento) ou, no teste t, fator x grupo
+        na ordem do resumo. Retorna (codigos, n_celulas), com -1 para as linhas fora de qualquer célula.
+        """
+        dados = self.dados
+        if teste != "t-test":
+            return dados.codigos_grupo, dados.n_grupos
+        chaves, codigos, validas = _celulas_ttest(dados)
+        completos = np.full(dados.n_linhas, -1, dtype=np.intp)
+        completos[validas] = codigos
+        return completos, len(chaves)
+
+    def reamostragem(self, teste: str, tipo: str, reamostras: int = REAMOSTRAS, semente=0, processos: int = None,
+                     progresso=None):
+        """ Resultado de uma reamostragem de `teste`, guardado por teste, reamostras e semente.
+        Parâmetros:
+        - tipo: "bootstrap" (matriz reamostras x linhas do resumo com as médias reamostradas) ou
+          "permutacao" (p-valores por permutação, na ordem das linhas da tabela do teste).
+        - reamostras, semente, processos, progresso: ver reamostragem.bootstrap_medias.
+        O bootstrap é por grupo e serve ao Dunnett e ao Tukey (no Tukey só muda a ordem das colunas).
+        """
+        if tipo == "bootstrap" and teste == "tukey":
+            medias = self.reamostragem("dunnett", tipo, reamostras, semente, processos, progresso)
+            return medias[:, _ordem_resumo(self.dados, self.resumo_grupos[1])]
+        chave = (teste, tipo, reamostras, semente)
+        if chave not in self._reamostragens:
+            opcoes = dict(reamostras=reamostras, semente=semente, processos=processos, progresso=progresso)
+            with medir(f"{tipo} ({teste}, {reamostras} reamostras)"):
+                if tipo == "bootstrap":
+                    resultado = bootstrap_medias(*self._celulas(teste), self.dados.y, **opcoes)
+                elif tipo == "permutacao":
+                    resultado = self._permutacao(teste, opcoes)
+                else:
+                    raise ValueError(f"Reamostragem desconhecida: {tipo}")
+            self._reamostragens[chave] = resultado
+        return self._reamostragens[chave]
+
+    def _permutacao(self, teste: str, opcoes: dict) -> np.ndarray:
+        """ p-valores por permutação das comparações de `teste` (ver reamostragem). """
+        dados = self.dados
+        if teste == "t-test":
+            codigos, n_estratos = _estratos_ttest(dados, self.fator_col)
+            return permutacao_estratos(codigos, n_estratos, dados.y, **opcoes)['p']
+        if teste == "dunnett":
+            i = self.dunnett_bruto['outros']
+            j = np.full(len(i), self.indice_controle)
+        elif teste == "tukey":
+            # pares do Tukey (posições no resumo ordenado) convertidos para códigos de grupo
+            ordem = _ordem_resumo(dados, self.resumo_grupos[1])
+            i, j = ordem[self.tukey_bruto['i']], ordem[self.tukey_bruto['j']]
+        else:
+            raise ValueError("Selecione um teste estatístico válido.")
+        # comparações com grupos sem respostas ficam NaN, como no teste paramétrico
+        n = self.resumo_grupos[1]
+        p = np.full(len(i), np.nan)
+        cheias = (n[i] > 0) & (n[j] > 0)
+        if cheias.any():
+            p[cheias] = permutacao_pares(dados.codigos_grupo, dados.n_grupos, dados.y, i[cheias], j[cheias], **opcoes)['p_ajustado']
+        return p
+
+    def estatisticas(self, teste: str, alpha=None, intervalo: str = "ep", p_valor: str = "teste",
+                     reamostras: int = REAMOSTRAS, semente=0, processos: int = None, progresso=None) -> dict:
+        """ Dicionário de gerar_estatisticas para `teste`, passando pelo cache de resultados (se houver).
+        As reamostragens pedidas por `intervalo` e `p_valor` são feitas uma vez e reaproveitadas para qualquer alpha.
+        """
+        if teste not in self._brutas:
+            brutas = None
+            if self.cache is not None:
+                fator_col = self.fator_col if teste == "t-test" else None
+                control = self.control if teste == "dunnett" else None
+                colunas = [c for c in (self.group_col, fator_col, self.response_col) if c]
+                with medir("cache de resultados"):
+                    chave = self.cache.chave(self.data, colunas, teste, self.group_col, self.response_col, fator_col, control)
+                    brutas = self.cache.obter(chave)
+            if brutas is None:
+                with medir(f"estatísticas ({teste})"):
+                    brutas = self.brutas(teste)
+                if self.cache is not None:
+                    with medir("guardar no cache de resultados"):
+                        self.cache.guardar(chave, brutas)
+            self._brutas[teste] = brutas
+        brutas = self._brutas[teste]
+        reamostragem = {}
+        if intervalo == "bootstrap":
+            reamostragem["bootstrap"] = self.reamostragem(teste, "bootstrap", reamostras, semente, processos, progresso)
+        elif intervalo != "ep":
+            raise ValueError(f"Intervalo desconhecido: {intervalo}")
+        if p_valor == "permutacao":
+            reamostragem["permutacao"] = self.reamostragem(teste, "permutacao", reamostras, semente, processos, progresso)
+        elif p_valor != "teste":
+            raise ValueError(f"p-valor desconhecido: {p_valor}")
+        if reamostragem:
+            brutas = dict(brutas, reamostragem=reamostragem)
+        nome = ('estatisticas', teste) + ((intervalo, p_valor, reamostras, semente) if reamostragem else ())
+        return self._memo(nome, alpha, lambda a: aplicar_alpha(brutas, a))
 
-    def add_significance(self, dunnett_result):
-        return add_significance_dunnet(self.data, dunnett_result, self.response_col, self.group_col, self.control, self.alpha)
-    
 def fator_sort_key(x):
     import re
     # Tenta extrair o primeiro número da string
@@ -40,12 +287,60 @@ def fator_sort_key(x):
         # Se não houver número, retorna a string em minúsculo para ordenação alfabética
         return (1, str(x).lower())
     
+def notacao_significancia(p):
+    """ Converte p-valores (escalar ou vetor) na notação "***", "**", "*" ou "ns". """
+    p = np.asarray(p, dtype=float)
+    return np.select([p < 0.001, p < 0.01, p < 0.05], ['***', '**', '*'], default='ns')
+
+def _welch_por_fator(codigos_f: np.ndarray, codigos_g: np.ndarray, n_grupos: int, y: np.ndarray):
+    """
+    Teste t de Welch entre os dois grupos de cada nível do fator, para todos os níveis de uma vez.
+    Parâmetros:
+    - codigos_f: Código inteiro do fator de cada linha (-1 para linhas ignoradas).
+    - codigos_g: Código inteiro do grupo de cada linha (0..n_grupos-1).
+    - n_grupos: Número de grupos distintos.
+    - y: Resposta de cada linha (float).
+    Retorna um dicionário de vetores (um elemento por nível com exatamente 2 grupos):
+      fator, g1, g2 (códigos), n1, n2, t_stat, p_value
+    Os grupos de cada nível ficam na ordem em que aparecem nos dados, como em Series.unique().
+    Valores ausentes na resposta tornam o resultado do nível NaN (mesmo comportamento de ttest_ind).
+    """
+    validas = codigos_f >= 0
+    chave = codigos_f[validas].astype(np.int64) * n_grupos + codigos_g[validas]
+    y = y[validas]
+
+    # Uma passada: chaves (fator, grupo) distintas, primeira ocorrência, contagem, média e variância
+    chaves, primeira, inversa, n = np.unique(chave, return_index=True, return_inverse=True, return_counts=True)
+    media = np.bincount(inversa, weights=y) / n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = np.bincount(inversa, weights=(y - media[inversa]) ** 2) / (n - 1)
+
+    # Mantém apenas os níveis com exatamente 2 grupos, com os grupos na ordem de aparecimento
+    fator = chaves // n_grupos
+    grupos_por_fator = np.bincount(fator)
+    ordem = np.lexsort((primeira, fator))
+    ordem = ordem[grupos_por_fator[fator[ordem]] == 2]
+    a, b = ordem[0::2], ordem[1::2]
+
+    n1, n2 = n[a], n[b]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vn1, vn2 = var[a] / n1, var[b] / n2
+        se2 = vn1 + vn2
+        t_stat = (media[a] - media[b]) / np.sqrt(se2)
+        gl = se2 ** 2 / (vn1 ** 2 / (n1 - 1) + vn2 ** 2 / (n2 - 1))
+        p_value = 2 * stdtr(gl, -np.abs(t_stat))
+    return {
+        'fator': fator[a], 'g1': chaves[a] % n_grupos, 'g2': chaves[b] % n_grupos,
+        'n1': n1, 'n2': n2, 't_stat': t_stat, 'p_value': p_value,
+    }
+
 def run_t_test(data: pd.DataFrame, group_col: str, fator_col: str, response_col: float) -> pd.DataFrame:
     """
-    Para cada nível único de `fator_col`, faz um t-test entre as duas categorias de `group_col`.
+    Para cada nível único de `fator_col`, faz um t-test (Welch) entre as duas categorias de `group_col`.
+    Todos os níveis são calculados de uma vez, a partir de contagem, média e variância por (fator, grupo).
     Parâmetros:
-    - data: DataFrame contendo os dados.
-    - group_col: Nome da coluna com os grupos (categorias).
+    - data: DataFrame (ou Dados já fatorado) contendo os dados.
+    - group_col: Nome da coluna com os grupos (categorias); linhas sem grupo são ignoradas.
     - fator_col: Nome da coluna com o fator (ex: 'time').
     - response_col: Nome da coluna com os dados de resposta (ex: 'value').
 
@@ -56,184 +351,310 @@ def run_t_test(data: pd.DataFrame, group_col: str, fator_col: str, response_col:
       - t_stat, p_value
       - significance     ("ns", "*", "**", "***")
     """
-    
-    results = []
+    dados = Dados.de(data, group_col, response_col, fator_col)
+    codigos_g, grupos = dados.codigos_grupo, dados.grupos
 
     if fator_col:
-        # garante ordem consistente de tempos (se quiser custom, ajuste esta linha)
-        fatores = data[fator_col].unique()
-        for f in fatores:
-            sub = data[data[fator_col] == f]
-            groups = sub[group_col].unique()
-            if len(groups) != 2:
-                continue  # pula se não houver exatamente 2 grupos
-            g1, g2 = groups
-            v1 = sub[sub[group_col] == g1][response_col]
-            v2 = sub[sub[group_col] == g2][response_col]
-            t_stat, p = ttest_ind(v1, v2, equal_var=False)
-            # monta notação de significância
-            if p < 0.001:
-                sig = '***'
-            elif p < 0.01:
-                sig = '**'
-            elif p < 0.05:
-                sig = '*'
-            else:
-                sig = 'ns'
-            results.append({
-                fator_col: f,
-                'group1': g1,
-                'group2': g2,
-                'n1': len(v1),
-                'n2': len(v2),
-                't_stat': t_stat,
-                'p_value': p,
-                'significance': sig
-            })
-
+        # níveis na ordem em que aparecem; linhas com fator ausente são ignoradas
+        codigos_f, fatores = dados.codigos_fator, dados.fatores
+        chave_fator = fator_col
     else:
         # caso não tenha fator_col, faz t-test direto entre os grupos
-        groups = data[group_col].unique()
-        if len(groups) != 2:
+        if len(grupos) != 2:
             raise ValueError("Para t-test sem fator_col, deve haver exatamente 2 grupos.")
-        g1, g2 = groups
-        v1 = data[data[group_col] == g1][response_col]
-        v2 = data[data[group_col] == g2][response_col]
-        t_stat, p = ttest_ind(v1, v2, equal_var=False)
-        # monta notação de significância
-        if p < 0.001:
-            sig = '***'
-        elif p < 0.01:
-            sig = '**'
-        elif p < 0.05:
-            sig = '*'
-        else:
-            sig = 'ns'
-        results.append({
-            group_col: 'Total',
-            'group1': g1,
-            'group2': g2,
-            'n1': len(v1),
-            'n2': len(v2),
-            't_stat': t_stat,
-            'p_value': p,
-            'significance': sig
-        })
-    return pd.DataFrame(results)
+        codigos_f, fatores = np.zeros(dados.n_linhas, dtype=np.intp), np.array(['Total'], dtype=object)
+        chave_fator = group_col
+
+    # linhas sem grupo ficam de fora (código de fator -1)
+    codigos_f = np.where(codigos_g >= 0, codigos_f, -1)
+    res = _welch_por_fator(codigos_f, codigos_g, len(grupos), dados.y)
+    grupos = np.asarray(grupos, dtype=object)
+    return pd.DataFrame({
+        chave_fator: np.asarray(fatores, dtype=object)[res['fator']],
+        'group1': grupos[res['g1']],
+        'group2': grupos[res['g2']],
+        'n1': res['n1'],
+        'n2': res['n2'],
+        't_stat': res['t_stat'],
+        'p_value': res['p_value'],
+        'significance': notacao_significancia(res['p_value'])
+    })
+
+def _resumo_por_grupo(codigos: np.ndarray, n_grupos: int, y: np.ndarray):
+    """
+    Contagem, média e soma de quadrados dos desvios de cada grupo em uma passada (np.bincount).
+    Linhas com código -1 ou resposta ausente são ignoradas.
+    Retorna:
+    - n, media, sq_dentro (vetores com um elemento por grupo)
+    """
+    validas = (codigos >= 0) & ~np.isnan(y)
+    codigos, y = codigos[validas], y[validas]
+    n = np.bincount(codigos, minlength=n_grupos)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.bincount(codigos, weights=y, minlength=n_grupos) / n
+    sq_dentro = np.bincount(codigos, weights=(y - media[codigos]) ** 2, minlength=n_grupos)
+    return n, media, sq_dentro
+
+def _indice_do_grupo(grupos, valor) -> int:
+    """ Posição de `valor` em `grupos`, aceitando também a forma em texto (o menu do controle usa str). """
+    grupos = list(grupos)
+    if valor in grupos:
+        return grupos.index(valor)
+    textos = [str(g) for g in grupos]
+    if str(valor) in textos:
+        return textos.index(str(valor))
+    raise ValueError(f"Grupo controle '{valor}' não encontrado.")
 
 def run_test_dunnett(data: pd.DataFrame, response_col:str, group_col:str, control:str, alpha: float=0.05):
     """
     Teste de Dunnett para comparações múltiplas com um grupo controle.
+    Calcula apenas as k-1 comparações contra o controle, com p-valores ajustados pela
+    distribuição t multivariada de Dunnett (variância combinada de todos os grupos).
     Parâmetros:
-    - data: DataFrame contendo os dados.
+    - data: DataFrame (ou Dados já fatorado) contendo os dados (não é alterado).
     - response_col: Nome da coluna com os dados de resposta.
     - group_col: Nome da coluna com os grupos.
     - control: Nome do grupo controle (ex: 'Col-0').
     - alpha: Nível de significância (default é 0.05).
     Retorna:
-    - DataFrame com os resultados do teste de Dunnett, filtrando apenas as comparações com o grupo controle.
+    - DataFrame com as colunas group1 (controle), group2, meandiff, p-adj, lower, upper, reject.
+    - Lista com a ordem dos grupos (ordem em que aparecem nos dados).
     """
-    # Convertendo a coluna de grupos para categórica
-    data[group_col] = pd.Categorical(data[group_col], data[group_col].dropna().unique().tolist(), ordered=True)
+    dados = Dados.de(data, group_col, response_col)
+    grupos = dados.grupos
+    n, media, sq_dentro = _resumo_por_grupo(dados.codigos_grupo, dados.n_grupos, dados.y)
+    ic = _indice_do_grupo(grupos, control)
+    return _tabela_dunnett(_dunnett_bruto(n, media, sq_dentro, ic), grupos, ic, alpha), grupos.tolist()
 
-    # 1) roda o Tukey
-    tukey = pairwise_tukeyhsd(data[response_col], data[group_col], alpha=alpha)
+def _dunnett_bruto(n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray, ic: int) -> dict:
+    """
+    Parte do teste de Dunnett que não depende de alpha: diferença, erro e p-valor ajustado de cada
+    grupo contra o controle (posição `ic`).
+    Retorna um dicionário com outros (posições dos grupos comparados), meandiff, erro, p, lambdas e gl.
+    """
+    # Variância combinada (quadrado médio do resíduo da ANOVA)
+    gl = n.sum() - len(n)
+    qm_residuo = sq_dentro.sum() / gl
 
-    # 2) converte a tabela de resultados em DataFrame
-    res = tukey._results_table.data
-    cols = res[0]
-    df_res = pd.DataFrame(res[1:], columns=cols)
-    
+    outros = np.array([i for i in range(len(n)) if i != ic], dtype=np.intp)
+    diff = media[outros] - media[ic]
+    erro = np.sqrt(qm_residuo * (1 / n[outros] + 1 / n[ic]))
+    lambdas = np.sqrt(n[outros] / (n[outros] + n[ic]))
+    p_adj = sf_dunnett(np.abs(diff / erro), lambdas, gl)
+    return {'outros': outros, 'meandiff': diff, 'erro': erro, 'p': p_adj, 'lambdas': lambdas, 'gl': gl}
 
-    # 3) filtra apenas as comparações com Col-0
-    mask = (df_res['group1'] == control) | (df_res['group2'] == control)
-    results = df_res[mask].copy()
-    
-    return results, data[group_col].dropna().unique().tolist()
+def _tabela_dunnett(bruto: dict, grupos, ic: int, alpha: float) -> pd.DataFrame:
+    """ Monta a tabela do Dunnett (intervalos e rejeição) para um alpha. """
+    outros, diff, p_adj = bruto['outros'], bruto['meandiff'], bruto['p']
+    critico = quantil_dunnett(1 - alpha, bruto['lambdas'], bruto['gl']) if len(outros) else np.nan
+    grupos = np.asarray(grupos, dtype=object)
+    return pd.DataFrame({
+        'group1': grupos[ic],
+        'group2': grupos[outros],
+        'meandiff': np.round(diff, 4),
+        'p-adj': np.round(p_adj, 4),
+        'lower': np.round(diff - critico * bruto['erro'], 4),
+        'upper': np.round(diff + critico * bruto['erro'], 4),
+        'reject': p_adj < alpha,
+    })
 
-def run_test_tukey(data: pd.DataFrame, response_col:str, group_col:str, alpha: float=0.05):
+def _resumo_ordenado(data: pd.DataFrame, group_col: str, response_col: str):
     """
-    Teste de Tukey para comparações múltiplas entre grupos.
+    Estatísticas suficientes por grupo, com os grupos em ordem crescente (mesma ordem do statsmodels).
+    Grupos sem nenhuma resposta válida são descartados.
     Parâmetros:
-    - data: DataFrame contendo os dados.
-    - response_col: Nome da coluna com os dados de resposta.
-    - group_col: Nome da coluna com os grupos.
-    - alpha: Nível de significância (default é 0.05).
+    - data: DataFrame ou Dados.
     Retorna:
-    - DataFrame com os resultados do teste de Tukey.
+    - grupos (Index), n, media, sq_dentro
     """
-    # Convertendo a coluna de grupos para categórica
-    data[group_col] = pd.Categorical(data[group_col], ordered=True)
-
-    # 1) roda o Tukey
-    tukey = pairwise_tukeyhsd(data[response_col], data[group_col], alpha=alpha)
-
-    # 2) converte a tabela de resultados em DataFrame
-    res = tukey._results_table.data
-    cols = res[0]
-    df_res = pd.DataFrame(res[1:], columns=cols)
-
-    return df_res
-
-def run_test_tukey_anova(df: pd.DataFrame, col_trat: str, col_val: str, alpha=0.05):    
-    # ANOVA
-    modelo = ols(f'{col_val} ~ C({col_trat})', data=df).fit()
-    anova = sm.stats.anova_lm(modelo, typ=2)
+    dados = Dados.de(data, group_col, response_col)
+    return _ordenar_resumo(dados, *_resumo_por_grupo(dados.codigos_grupo, dados.n_grupos, dados.y))
 
-    # Teste de Tukey
-    mc = MultiComparison(df[col_val], df[col_trat])
-    tukey_result = mc.tukeyhsd(alpha=alpha)
-    results = pd.DataFrame(data=tukey_result._results_table.data[1:], columns=tukey_result._results_table.data[0])
+def _ordem_resumo(dados: Dados, n: np.ndarray) -> np.ndarray:
+    """ Códigos dos grupos na ordem de _ordenar_resumo (crescente, sem grupos vazios). """
+    ordem = dados.ordem_crescente()
+    return ordem[n[ordem] > 0]
 
+def _ordenar_resumo(dados: Dados, n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray):
+    """ Reordena as estatísticas por grupo (ordem de aparecimento) em ordem crescente de grupo, sem grupos vazios. """
+    ordem = _ordem_resumo(dados, n)
+    return dados.grupos[ordem], n[ordem], media[ordem], sq_dentro[ordem]
 
+def anova_um_fator(data: pd.DataFrame, group_col: str, response_col: str) -> pd.DataFrame:
+    """
+    ANOVA de um fator calculada a partir de contagem, média e soma de quadrados de cada grupo.
+    Parâmetros:
+    - data: DataFrame (ou Dados já fatorado) contendo os dados.
+    - group_col: Nome da coluna com os grupos.
+    - response_col: Nome da coluna com os dados de resposta.
+    Retorna:
+    - DataFrame no formato de anova_lm: linhas group_col e 'Residual'; colunas sum_sq, df, F, PR(>F).
+    """
+    _, n, media, sq_dentro = _resumo_ordenado(data, group_col, response_col)
+    return _tabela_anova(n, media, sq_dentro, group_col)
 
-    # Função robusta para atribuição das letras de significância (CLD)
-    def tukey_letters(mc, tukey_result):
-        groups = list(mc.groupsunique)
-        n = len(groups)
+def _tabela_anova(n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray, group_col: str) -> pd.DataFrame:
+    """ Tabela da ANOVA a partir das estatísticas suficientes de cada grupo (ver anova_um_fator). """
+    media_geral = (n * media).sum() / n.sum()
+    sq_entre = (n * (media - media_geral) ** 2).sum()
+    sq_residuo = sq_dentro.sum()
+    gl_entre, gl_residuo = len(n) - 1, n.sum() - len(n)
+    f = (sq_entre / gl_entre) / (sq_residuo / gl_residuo)
+    return pd.DataFrame({
+        'sum_sq': [sq_entre, sq_residuo],
+        'df': [float(gl_entre), float(gl_residuo)],
+        'F': [f, np.nan],
+        'PR(>F)': [fdtrc(gl_entre, gl_residuo, f), np.nan],
+    }, index=[group_col, 'Residual'])
 
-        # Cria grafo onde arestas representam "sem diferença significativa"
-        G = nx.Graph()
-        G.add_nodes_from(groups)
+def _tukey_bruto(n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray) -> dict:
+    """
+    Parte do teste de Tukey-Kramer que não depende de alpha: todas as comparações i < j, com a
+    diferença de médias, o erro do par, a estatística q e o p-valor ajustado (amplitude studentizada).
+    Parâmetros:
+    - n, media, sq_dentro: Estatísticas suficientes de cada grupo (ver _resumo_por_grupo).
+    Retorna um dicionário com i, j, meandiff, erro, q, p (vetores, um elemento por par), k e gl.
+    """
+    k = len(n)
+    gl = n.sum() - k
+    qm_residuo = sq_dentro.sum() / gl
+    i, j = np.triu_indices(k, 1)
+    diff = media[j] - media[i]
+    erro = np.sqrt(qm_residuo / 2 * (1 / n[i] + 1 / n[j]))
+    q = np.abs(diff) / erro
+    return {'i': i, 'j': j, 'meandiff': diff, 'erro': erro, 'q': q, 'p': sf_amplitude(q, k, gl), 'k': k, 'gl': gl}
 
-        idx = 0
-        for i in range(n):
-            for j in range(i+1, n):
-                g1, g2 = groups[i], groups[j]
-                if not tukey_result.reject[idx]:  # Sem diferença -> adiciona aresta
-                    G.add_edge(g1, g2)
-                idx += 1
+def _tabela_tukey(bruto: dict, grupos, alpha: float) -> pd.DataFrame:
+    """ Monta a tabela do Tukey (mesmas colunas e arredondamento do pairwise_tukeyhsd) para um alpha. """
+    grupos = np.asarray(grupos, dtype=object)
+    critico = quantil_amplitude(1 - alpha, bruto['k'], bruto['gl']) if bruto['k'] > 1 else np.nan
+    diff, margem = bruto['meandiff'], critico * bruto['erro']
+    return pd.DataFrame({
+        'group1': grupos[bruto['i']],
+        'group2': grupos[bruto['j']],
+        'meandiff': np.round(diff, 4),
+        'p-adj': np.round(bruto['p'], 4),
+        'lower': np.round(diff - margem, 4),
+        'upper': np.round(diff + margem, 4),
+        'reject': bruto['q'] > critico,
+    })
 
-        # Cada componente conexo do grafo pode compartilhar uma letra
-        cliques = list(nx.find_cliques(G))
+def run_test_tukey(data: pd.DataFrame, response_col:str, group_col:str, alpha: float=0.05):
+    """
+    Teste de Tukey (Tukey-Kramer para grupos de tamanhos diferentes) para comparações múltiplas entre grupos.
+    Parâmetros:
+    - data: DataFrame contendo os dados (não é alterado).
+    - response_col: Nome da coluna com os dados de resposta.
+    - group_col: Nome da coluna com os grupos.
+    - alpha: Nível de significância (default é 0.05).
+    Retorna:
+    - DataFrame com os resultados do teste de Tukey.
+    """
+    grupos, n, media, sq_dentro = _resumo_ordenado(data, group_col, response_col)
+    return _tabela_tukey(_tukey_bruto(n, media, sq_dentro), grupos, alpha)
 
-        # Algoritmo de atribuição de letras
-        letters_dict = {g: '' for g in groups}
-        letra_ord = iter("abcdefghijklmnopqrstuvwxyz")
+def _colunas_cld(k: int, diferentes: list) -> list:
+    """
+    Colunas do compact letter display pelo método de inserção e absorção (Piepho, 2004).
+    Cada coluna é um bitset (int) com os tratamentos que compartilham uma letra. Começa com uma única
+    coluna contendo todos; para cada par significativo (i, j), toda coluna que contém os dois é dividida
+    em uma cópia sem i e outra sem j, e as colunas contidas em outra são descartadas (absorção).
+    Os pares de um mesmo i são inseridos de uma vez: dividir c por (i, j1), (i, j2), ... resulta sempre
+    em c sem i e c sem todos os j, então cada tratamento custa uma única passada pelas colunas.
+    Parâmetros:
+    - k: Número de tratamentos.
+    - diferentes: Lista com k bitsets; diferentes[i] tem os j > i que diferem de i.
+    Retorna:
+    - Lista de bitsets, uma por letra (os conjuntos máximos de tratamentos que não diferem entre si).
+    """
+    colunas = [(1 << k) - 1]
+    for i in range(k):
+        dif = diferentes[i]
+        if not dif:
+            continue
+        bit = 1 << i
+        mantidas, novas = [], set()
+        for c in colunas:
+            if c & bit and c & dif:
+                novas.add(c & ~bit)
+                novas.add(c & ~dif)
+            else:
+                mantidas.append(c)
+        # maiores primeiro: uma nova coluna só pode ser absorvida por outra de tamanho maior ou igual
+        for c in sorted(novas, key=int.bit_count, reverse=True):
+            if not any(c | o == o for o in mantidas):
+                mantidas.append(c)
+        colunas = mantidas
+    return colunas
 
-        for clique in cliques:
-            letra = next(letra_ord)
-            for grupo in clique:
-                letters_dict[grupo] += letra
+def rotulo_letra(n: int) -> str:
+    """ Rótulo da n-ésima letra (a partir de 0): a..z, aa, ab, ..., az, ba, ... """
+    rotulo = ""
+    n += 1
+    while n:
+        n, resto = divmod(n - 1, 26)
+        rotulo = chr(ord('a') + resto) + rotulo
+    return rotulo
 
-        return letters_dict
+def letras_cld(media: pd.Series, comparacoes: pd.DataFrame) -> pd.Series:
+    """
+    Letras de significância (compact letter display): tratamentos que compartilham uma letra não diferem.
+    Parâmetros:
+    - media: Média de cada tratamento (índice = tratamentos).
+    - comparacoes: Tabela do Tukey com as colunas group1, group2 e reject.
+    Retorna:
+    - Series com as letras de cada tratamento, no índice de `media`. A letra "a" vai para o grupo de
+      maior média; acima de 26 letras os rótulos passam a ter mais de um caractere e são separados por vírgula.
+    """
+    # tratamentos numerados pela média decrescente: assim as colunas ficam em faixas contíguas,
+    # o que mantém o número de colunas intermediárias pequeno
+    tratamentos = media.sort_values(ascending=False, kind="stable").index
+    posicao = {str(t): i for i, t in enumerate(tratamentos)}
+    k = len(tratamentos)
 
-    # Gera letras para os tratamentos
-    letters_dict = tukey_letters(mc, tukey_result)
+    diferentes = [0] * k
+    rejeitados = comparacoes[comparacoes['reject'].astype(bool)]
+    for g1, g2 in zip(rejeitados['group1'].astype(str), rejeitados['group2'].astype(str)):
+        i, j = sorted((posicao[g1], posicao[g2]))
+        diferentes[i] |= 1 << j
 
-    # Calcula média e erro padrão
-    media = df.groupby(col_trat)[col_val].mean()
-    erro = df.groupby(col_trat)[col_val].sem()
+    # letras na ordem do primeiro tratamento (maior média) de cada coluna
+    colunas = sorted(_colunas_cld(k, diferentes), key=lambda c: (c & -c).bit_length())
+    rotulos = [rotulo_letra(n) for n in range(len(colunas))]
+    separador = "" if len(colunas) <= 26 else ","
+    letras = [separador.join(r for r, c in zip(rotulos, colunas) if c >> i & 1) for i in range(k)]
+    return pd.Series(letras, index=tratamentos).reindex(media.index)
 
-    # Ordena pelo tratamento para plotar corretamente
-    media = media.sort_index()
-    erro = erro.reindex(media.index)
+def run_test_tukey_anova(df: pd.DataFrame, col_trat: str, col_val: str, alpha=0.05):
+    """
+    Teste de Tukey com média, erro padrão e letras de significância de cada tratamento.
+    Tudo é derivado de uma única passada pelos dados (contagem, média e soma de quadrados por tratamento).
+    Parâmetros:
+    - df: DataFrame contendo os dados.
+    - col_trat: Nome da coluna com os tratamentos.
+    - col_val: Nome da coluna com os dados de resposta.
+    - alpha: Nível de significância.
+    Retorna:
+    - results: Tabela do Tukey (ver run_test_tukey).
+    - media, erro: Média e erro padrão por tratamento, em ordem de tratamento.
+    - letras: Letras de significância na ordem de `media`.
+    """
+    grupos, n, media, sq_dentro = _resumo_ordenado(df, col_trat, col_val)
+    results = _tabela_tukey(_tukey_bruto(n, media, sq_dentro), grupos, alpha)
+    media, erro = _media_erro(grupos, n, media, sq_dentro, col_trat, col_val)
 
     # Letras para cada tratamento na ordem certa
-    letras = [letters_dict[t] for t in media.index]
+    letras = letras_cld(media, results).tolist()
 
     return results, media, erro, letras
 
+def _media_erro(grupos, n, media, sq_dentro, col_trat: str, col_val: str):
+    """ Média e erro padrão da média como Series indexadas pelos tratamentos. """
+    indice = pd.Index(grupos, name=col_trat)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        erro = np.sqrt(sq_dentro / (n - 1) / n)
+    return pd.Series(media, index=indice, name=col_val), pd.Series(erro, index=indice, name=col_val)
+
 def add_significance_dunnet(data: pd.DataFrame, dunnett_result, response_col:str, group_col:str, control:str, alpha: float=0.05):
     """    Adiciona estatísticas resumidas e significância aos resultados do teste de Dunnett.
     Parâmetros:
@@ -246,32 +667,41 @@ def add_significance_dunnet(data: pd.DataFrame, dunnett_result, response_col:str
     Retorna:
     - DataFrame com as estatísticas resumidas e significância.
     """
-    # Calcular estatísticas resumidas
-    summary_stats = data.groupby(group_col, observed=False)[response_col].agg(['mean', 'std', 'count']).reset_index()
-    summary_stats['SE'] = summary_stats['std'] / np.sqrt(summary_stats['count'])
+    dados = Dados.de(data, group_col, response_col)
+    n, media, sq_dentro = _resumo_por_grupo(dados.codigos_grupo, dados.n_grupos, dados.y)
+    resumo = _tabela_resumo({group_col: dados.grupos}, n, media, sq_dentro)
+    return _significancia_dunnett(resumo, dunnett_result, group_col, control, alpha)
+
+def _tabela_resumo(chaves: dict, n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray) -> pd.DataFrame:
+    """
+    Tabela com média, desvio, contagem e erro padrão (mesmas colunas de groupby(...).agg(['mean', 'std', 'count'])).
+    Parâmetros:
+    - chaves: {nome da coluna: valores} das colunas de grupo de cada linha da tabela.
+    - n, media, sq_dentro: Estatísticas suficientes de cada linha.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(sq_dentro / (n - 1))
+        erro = std / np.sqrt(n)
+    return pd.DataFrame({**chaves, 'mean': media, 'std': std, 'count': n, 'SE': erro})
+
+# Colunas do intervalo bootstrap no resumo (só existem com intervalo="bootstrap")
+_COLUNAS_IC = pd.Index(['IC_inf', 'IC_sup'])
+
+def _significancia_dunnett(summary_stats: pd.DataFrame, dunnett_result: pd.DataFrame, group_col: str, control: str, alpha: float) -> pd.DataFrame:
+    """ Acrescenta p-valor e asterisco de cada grupo ao resumo de _tabela_resumo (não altera o resumo). """
+    summary_stats = summary_stats.copy()
+
+    # p-valor de cada grupo na comparação com o controle
+    comparacoes = dunnett_result[dunnett_result['group1'].astype(str) == str(control)]
+    coluna_p = 'p-perm' if 'p-perm' in comparacoes else 'p-adj'  # p por permutação, quando pedido
+    p_por_grupo = dict(zip(comparacoes['group2'], comparacoes[coluna_p].astype(float)))
+    p_val = [np.nan if str(group) == str(control) else p_por_grupo.get(group, np.nan) for group in summary_stats[group_col]]
+    significance = ["*" if p < alpha else "" for p in p_val]  # NaN < alpha é falso
 
-    significance = []
-    p_val = []
-    for group in summary_stats[group_col]:
-        if group == control:
-            significance.append("")
-            p_val.append(np.nan)
-        else:
-            try:
-                pval = dunnett_result.loc[(dunnett_result['group1'] == control) & 
-                                        (dunnett_result['group2'] == group), 'p-adj'].values[0]
-                
-                sig = "*" if pval < alpha else ""
-            except:
-                pval = np.nan
-                sig = ""
-            significance.append(sig)
-            p_val.append(float(pval))
-    
     summary_stats['significance'] = significance
     summary_stats['p_val'] = p_val
     summary_stats['p_val'] = summary_stats['p_val'].round(4) 
-    return summary_stats[[group_col, 'mean', 'SE', 'p_val', 'significance']]
+    return summary_stats[[group_col, 'mean', 'SE', *_COLUNAS_IC.intersection(summary_stats.columns), 'p_val', 'significance']]
 
 def add_significance_tukey(tukey_result, alpha: float=0.05):
     """
@@ -290,11 +720,71 @@ def add_significance_ttest(data: pd.DataFrame, t_test_result: pd.DataFrame, resp
     """
     Retorna estatísticas resumidas e significância no padrão Dunnett para t-test.
     """
-    # Estatísticas resumidas
-    summary_stats = data.groupby([fator_col, group_col], observed=False)[response_col].agg(['mean', 'std', 'count']).reset_index()
-    summary_stats['SE'] = summary_stats['std'] / np.sqrt(summary_stats['count'])
+    resumo, ordem = _resumo_ttest(data, response_col, group_col, fator_col)
+    return _significancia_ttest(resumo, t_test_result, group_col, fator_col, alpha), ordem
+
+def _resumo_ttest(data: pd.DataFrame, response_col: str, group_col: str, fator_col: str):
+    """
+    Média, desvio, contagem e erro padrão por (fator, grupo), em ordem crescente de fator e grupo
+    (como groupby([fator_col, group_col])), e a ordem dos níveis do fator nos dados.
+    Parâmetros:
+    - data: DataFrame ou Dados.
+    """
+    dados = Dados.de(data, group_col, response_col, fator_col)
+    n_g = dados.n_grupos
+    chaves, codigos, validas = _celulas_ttest(dados)
+
+    n, media, sq_dentro = _resumo_por_grupo(codigos, len(chaves), dados.y[validas])
+    fatores = dados.fatores[dados.fatores.argsort()].take(chaves // n_g)
+    grupos = dados.grupos[dados.ordem_crescente()].take(chaves % n_g)
+    summary_stats = _tabela_resumo({fator_col: fatores, group_col: grupos}, n, media, sq_dentro)
+    return summary_stats, dados.fatores.tolist()
+
+def _celulas_ttest(dados: Dados):
+    """ Células (fator, grupo) em ordem crescente de fator e grupo, como em _resumo_ttest.
+    Retorna:
+    - chaves (posto do fator * n_grupos + posto do grupo, uma por célula), código da célula de cada linha
+      válida e a máscara das linhas válidas.
+    """
+    # posição de cada código na ordem crescente, para que a chave combinada já saia ordenada
+    posto_f = np.argsort(dados.fatores.argsort())
+    posto_g = np.argsort(dados.ordem_crescente())
+    validas = (dados.codigos_fator >= 0) & (dados.codigos_grupo >= 0)
+    chave = posto_f[dados.codigos_fator[validas]] * dados.n_grupos + posto_g[dados.codigos_grupo[validas]]
+    chaves, codigos = np.unique(chave, return_inverse=True)
+    return chaves, codigos, validas
 
-    p_val = t_test_result.set_index(fator_col)['p_value'].to_dict()
+def _estratos_ttest(dados: Dados, fator_col: str):
+    """ Códigos para permutacao_estratos: estrato k = k-ésima linha da tabela de run_t_test; as linhas do
+    primeiro grupo do nível recebem 2k e as do segundo 2k+1 (as demais, -1).
+    Retorna:
+    - (codigos, n_estratos)
+    """
+    codigos_g = dados.codigos_grupo
+    if fator_col:
+        codigos_f = dados.codigos_fator
+    else:
+        if dados.n_grupos != 2:
+            raise ValueError("Para t-test sem fator_col, deve haver exatamente 2 grupos.")
+        codigos_f = np.zeros(dados.n_linhas, dtype=np.intp)
+    codigos_f = np.where(codigos_g >= 0, codigos_f, -1)
+    res = _welch_por_fator(codigos_f, codigos_g, dados.n_grupos, dados.y)
+
+    # estrato de cada nível do fator (-1 para níveis fora da tabela) e grupos de cada estrato
+    estrato = np.full(codigos_f.max(initial=-1) + 2, -1, dtype=np.intp)  # a última posição atende o código -1
+    estrato[res['fator']] = np.arange(len(res['fator']))
+    k = estrato[codigos_f]
+    com_estrato = k >= 0
+    g1 = np.where(com_estrato, res['g1'][np.maximum(k, 0)] if len(res['g1']) else -1, -1)
+    g2 = np.where(com_estrato, res['g2'][np.maximum(k, 0)] if len(res['g2']) else -1, -1)
+    codigos = np.select([com_estrato & (codigos_g == g1), com_estrato & (codigos_g == g2)], [2 * k, 2 * k + 1], default=-1)
+    return codigos, len(res['fator'])
+
+def _significancia_ttest(summary_stats: pd.DataFrame, t_test_result: pd.DataFrame, group_col: str, fator_col: str, alpha: float) -> pd.DataFrame:
+    """ Acrescenta o asterisco de cada nível do fator ao resumo de _resumo_ttest (não altera o resumo). """
+    summary_stats = summary_stats.copy()
+    coluna_p = 'p_perm' if 'p_perm' in t_test_result else 'p_value'  # p por permutação, quando pedido
+    p_val = t_test_result.set_index(fator_col)[coluna_p].to_dict()
     significance = []
     for f in summary_stats[fator_col]:
         if f in p_val:
@@ -308,44 +798,367 @@ def add_significance_ttest(data: pd.DataFrame, t_test_result: pd.DataFrame, resp
 
     summary_stats['significance'] = significance
 
-    return summary_stats[[fator_col, group_col, 'mean', 'SE', 'significance']], data[fator_col].dropna().unique().tolist()
+    return summary_stats[[fator_col, group_col, 'mean', 'SE', *_COLUNAS_IC.intersection(summary_stats.columns), 'significance']]
+
+
+def estatisticas_brutas(data: pd.DataFrame, teste: str, group_col: str, response_col: str, fator_col: str = None, control: str = None) -> dict:
+    """
+    Parte das estatísticas que não depende de alpha (testes, p-valores e resumos por grupo).
+    É o que fica guardado no cache de resultados; aplicar_alpha transforma em tabelas e significância.
+    Parâmetros: ver gerar_estatisticas.
+    Retorna:
+    - Dicionário com o teste, as colunas usadas e os resultados brutos do teste.
+    """
+    return Estatiscas(data, group_col, fator_col, response_col, control).brutas(teste)
+
+def aplicar_alpha(brutas: dict, alpha: float) -> dict:
+    """
+    Aplica o nível de significância aos resultados de estatisticas_brutas (valores críticos,
+    intervalos, rejeição, asteriscos e letras), sem refazer os testes.
+    Se `brutas` tiver "reamostragem" (ver Estatiscas.estatisticas), o intervalo bootstrap (1 - alpha) entra
+    no resumo (IC_inf, IC_sup) e o p-valor por permutação entra na tabela do teste e decide a significância.
+    Retorna:
+    - Dicionário no formato de gerar_estatisticas.
+    """
+    teste, group_col = brutas["teste"], brutas["group_col"]
+    reamostragem = brutas.get("reamostragem", {})
+    p_perm = reamostragem.get("permutacao")
+    intervalo = intervalo_percentil(reamostragem["bootstrap"], alpha) if "bootstrap" in reamostragem else None
+
+    if teste == "dunnett":
+        results = _tabela_dunnett(brutas["bruto"], brutas["grupos"], brutas["controle"], alpha)
+        if p_perm is not None:
+            results = _com_p_permutacao(results, p_perm, 'p-perm', alpha)
+        resumo = _com_intervalo(brutas["resumo"], intervalo)
+        resumo = _significancia_dunnett(resumo, results, group_col, brutas["control"], alpha)
+        return {"teste": teste, "tabela": resumo, "resumo": resumo, "ordem": brutas["grupos"].tolist()}
+
+    if teste == "t-test":
+        resultado = brutas["resultado"]
+        if p_perm is not None:
+            resultado = resultado.assign(p_perm=np.round(p_perm, 4), significance=notacao_significancia(p_perm))
+        resumo = _com_intervalo(brutas["resumo"], intervalo)
+        resumo = _significancia_ttest(resumo, resultado, group_col, brutas["fator_col"], alpha)
+        return {"teste": teste, "tabela": resumo, "resumo": resumo, "ordem": brutas["ordem"]}
+
+    if teste == "tukey":
+        grupos = brutas["grupos"]
+        results = _tabela_tukey(brutas["bruto"], grupos, alpha)
+        if p_perm is not None:
+            results = _com_p_permutacao(results, p_perm, 'p-perm', alpha)
+        media, erro = _media_erro(grupos, brutas["n"], brutas["media"], brutas["sq_dentro"], group_col, brutas["response_col"])
+        letras = letras_cld(media, results).tolist()
+        estatisticas = {"teste": teste, "tabela": results, "media": media, "erro": erro, "letras": letras, "anova": brutas["anova"].copy()}
+        if intervalo is not None:
+            estatisticas["ic"] = pd.DataFrame({'IC_inf': intervalo[0], 'IC_sup': intervalo[1]}, index=media.index)
+        return estatisticas
+
+    raise ValueError("Selecione um teste estatístico válido.")
+
+def _com_p_permutacao(tabela: pd.DataFrame, p: np.ndarray, coluna: str, alpha: float) -> pd.DataFrame:
+    """ Acrescenta o p-valor por permutação de cada comparação e refaz a rejeição com ele (NaN não rejeita). """
+    return tabela.assign(**{coluna: np.round(p, 4), 'reject': p < alpha})
+
+def _com_intervalo(resumo: pd.DataFrame, intervalo) -> pd.DataFrame:
+    """ Acrescenta o intervalo bootstrap (inferior, superior) de cada linha do resumo, se houver. """
+    if intervalo is None:
+        return resumo
+    return resumo.assign(IC_inf=intervalo[0], IC_sup=intervalo[1])
+
+def gerar_estatisticas(data: pd.DataFrame, teste: str, group_col: str, response_col: str, fator_col: str = None, control: str = None,
+                       alpha: float = 0.05, cache=None, intervalo: str = "ep", p_valor: str = "teste",
+                       reamostras: int = REAMOSTRAS, semente=0, processos: int = None) -> dict:
+    """
+    Executa o teste escolhido e as estatísticas resumidas usadas nos gráficos, sem depender da interface.
+    Parâmetros:
+    - data: DataFrame contendo os dados.
+    - teste: "dunnett", "t-test" ou "tukey".
+    - group_col: Nome da coluna com os grupos.
+    - response_col: Nome da coluna com os dados de resposta.
+    - fator_col: Nome da coluna com o fator (apenas t-test).
+    - control: Nome do grupo controle (apenas Dunnett).
+    - alpha: Nível de significância.
+    - cache: CacheResultados (cache.py) opcional. Os resultados brutos ficam guardados pela combinação
+      de conteúdo das colunas usadas, teste e colunas; mudar só alpha não refaz os testes.
+    - intervalo: "ep" (média ± erro padrão) ou "bootstrap" (intervalo percentil 1 - alpha das médias,
+      colunas IC_inf e IC_sup do resumo; no Tukey, em "ic").
+    - p_valor: "teste" (p-valor do próprio teste) ou "permutacao" (p-valor por permutação, ajustado pelo
+      maior |t| no Dunnett e no Tukey; colunas p-perm/p_perm e significância por ele).
+    - reamostras, semente: Número de reamostras e semente das reamostragens (mesma semente, mesmo resultado).
+    - processos: Processos para as reamostragens (None escolhe pelo tamanho; 1 roda tudo neste processo).
+    Retorna um dicionário com:
+      - teste
+      - tabela   (DataFrame a ser exibido/exportado)
+      - resumo   (estatísticas resumidas; Dunnett e t-test)
+      - ordem    (ordem dos grupos/fatores no eixo x; Dunnett e t-test)
+      - media, erro, letras, anova (apenas Tukey)
+      - ic       (apenas Tukey com intervalo="bootstrap": IC_inf e IC_sup por tratamento)
+    """
+    return Estatiscas(data, group_col, fator_col, response_col, control, alpha, cache).estatisticas(
+        teste, intervalo=intervalo, p_valor=p_valor, reamostras=reamostras, semente=semente, processos=processos)
+
+
+# ----- várias colunas de resposta -----
+# Memória de trabalho de cada bloco de colunas em _resumo_respostas (MB)
+MEMORIA_BLOCO_MB = 64
+
+
+def colunas_numericas(data: pd.DataFrame, excluir=()) -> list:
+    """ Colunas numéricas (não booleanas) de `data`, na ordem da planilha, sem as de `excluir`. """
+    return [c for c in data.columns if c not in excluir
+            and pd.api.types.is_numeric_dtype(data[c]) and not pd.api.types.is_bool_dtype(data[c])]
+
+def ajustar_bh(p) -> np.ndarray:
+    """
+    p-valores ajustados por Benjamini-Hochberg (controle da taxa de falsas descobertas).
+    Parâmetros:
+    - p: p-valores (NaN ficam NaN e não contam no número de testes).
+    Retorna:
+    - Vetor com os p-valores ajustados, na ordem de `p`.
+    """
+    p = np.asarray(p, dtype=float)
+    ajustado = np.full(p.shape, np.nan)
+    validos = ~np.isnan(p)
+    m = int(validos.sum())
+    if m:
+        ordem = np.argsort(p[validos], kind="stable")
+        escalonado = p[validos][ordem] * m / np.arange(1, m + 1)
+        # mínimo acumulado a partir do maior p: garante que o ajuste preserve a ordem dos p-valores
+        escalonado = np.minimum.accumulate(escalonado[::-1])[::-1]
+        valores = np.empty(m)
+        valores[ordem] = np.minimum(escalonado, 1.0)
+        ajustado[validos] = valores
+    return ajustado
+
+def _resumo_respostas(codigos: np.ndarray, n_celulas: int, Y: np.ndarray):
+    """
+    Contagem, média e soma de quadrados dos desvios de cada célula para várias respostas de uma vez:
+    as linhas são ordenadas por célula uma única vez e cada bloco de colunas é reduzido com np.add.reduceat.
+    Parâmetros:
+    - codigos: Célula de cada linha (-1 para linhas ignoradas).
+    - n_celulas: Número de células.
+    - Y: Matriz (linhas x respostas); valores ausentes são ignorados só na resposta em que faltam.
+    Retorna:
+    - n, media, sq_dentro: matrizes (respostas x células).
+    """
+    validas = codigos >= 0
+    ordem = np.argsort(codigos[validas], kind="stable")
+    celula = codigos[validas][ordem]
+    linhas = np.bincount(celula, minlength=n_celulas)
+    cheias = linhas > 0
+    inicio = np.concatenate(([0], np.cumsum(linhas)[:-1]))[cheias]
+    Y = Y[validas][ordem]
+
+    forma = (Y.shape[1], n_celulas)
+    n, soma, sq_dentro = np.zeros(forma), np.zeros(forma), np.zeros(forma)
+    # Y ordenado, máscara, valores e desvios do bloco: ~4 cópias de 8 bytes por linha e coluna
+    largura = max(1, int(MEMORIA_BLOCO_MB * 1024 ** 2 // max(32 * len(Y), 1)))
+    for a in range(0, Y.shape[1] if cheias.any() else 0, largura):
+        bloco = Y[:, a:a + largura]
+        presente = ~np.isnan(bloco)
+        valores = np.where(presente, bloco, 0.0)
+        n[a:a + largura, cheias] = np.add.reduceat(presente, inicio, axis=0, dtype=np.float64).T
+        soma[a:a + largura, cheias] = np.add.reduceat(valores, inicio, axis=0).T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media_linha = (soma[a:a + largura] / n[a:a + largura])[:, celula].T
+        desvios = np.where(presente, valores - media_linha, 0.0) ** 2
+        sq_dentro[a:a + largura, cheias] = np.add.reduceat(desvios, inicio, axis=0).T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = soma / n
+    return n.astype(np.int64), media, sq_dentro
+
+def _por_tamanhos(n: np.ndarray):
+    """ Agrupa as respostas (linhas de `n`) com os mesmos tamanhos por célula: elas têm os mesmos graus de
+    liberdade e correlações, então os p-valores de todas saem de uma só chamada à distribuição.
+    Retorna uma lista de (tamanhos, posições das respostas).
+    """
+    tamanhos, inversa = np.unique(n, axis=0, return_inverse=True)
+    inversa = inversa.ravel()
+    return [(tamanhos[s], np.flatnonzero(inversa == s)) for s in range(len(tamanhos))]
+
+def _dunnett_respostas(n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray, ic: int) -> dict:
+    """ _dunnett_bruto para várias respostas (matrizes respostas x grupos). Retorna resposta, outros,
+    meandiff, estatistica (t) e p (vetores, um elemento por resposta e comparação, por resposta).
+    """
+    k = n.shape[1]
+    outros = np.array([i for i in range(k) if i != ic], dtype=np.intp)
+    partes = []
+    for tamanhos, linhas in _por_tamanhos(n):
+        gl = tamanhos.sum() - k
+        qm_residuo = sq_dentro[linhas].sum(axis=1) / gl
+        diff = media[linhas][:, outros] - media[linhas][:, [ic]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            erro = np.sqrt(qm_residuo[:, None] * (1 / tamanhos[outros] + 1 / tamanhos[ic]))
+            t = diff / erro
+            lambdas = np.sqrt(tamanhos[outros] / (tamanhos[outros] + tamanhos[ic]))
+        p = sf_dunnett(np.abs(t).ravel(), lambdas, gl).reshape(t.shape) if t.size else t
+        partes.append((np.repeat(linhas, len(outros)), np.tile(outros, len(linhas)), diff.ravel(), t.ravel(), p.ravel()))
+    return _juntar_partes(partes, ('resposta', 'outro', 'meandiff', 'estatistica', 'p'))
+
+def _tukey_respostas(n: np.ndarray, media: np.ndarray, sq_dentro: np.ndarray, ordem: np.ndarray) -> dict:
+    """ _tukey_bruto para várias respostas, com os grupos na ordem `ordem` (crescente) e sem os grupos vazios
+    de cada resposta. Retorna resposta, i, j (códigos de grupo), meandiff, estatistica (q) e p.
+    """
+    partes = []
+    for tamanhos, linhas in _por_tamanhos(n):
+        cheios = ordem[tamanhos[ordem] > 0]
+        k = len(cheios)
+        gl = tamanhos[cheios].sum() - k
+        qm_residuo = sq_dentro[linhas][:, cheios].sum(axis=1) / gl
+        i, j = (cheios[p] for p in np.triu_indices(k, 1))
+        diff = media[linhas][:, j] - media[linhas][:, i]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            q = np.abs(diff) / np.sqrt(qm_residuo[:, None] / 2 * (1 / tamanhos[i] + 1 / tamanhos[j]))
+        p = sf_amplitude(q.ravel(), k, gl).reshape(q.shape) if q.size else q
+        partes.append((np.repeat(linhas, len(i)), np.tile(i, len(linhas)), np.tile(j, len(linhas)),
+                       diff.ravel(), q.ravel(), p.ravel()))
+    return _juntar_partes(partes, ('resposta', 'i', 'j', 'meandiff', 'estatistica', 'p'))
+
+def _juntar_partes(partes: list, nomes: tuple) -> dict:
+    """ Concatena os vetores de cada grupo de respostas e ordena por resposta (estável dentro de cada uma). """
+    colunas = {nome: np.concatenate([parte[c] for parte in partes]) if partes else np.empty(0)
+               for c, nome in enumerate(nomes)}
+    ordem = np.argsort(colunas['resposta'], kind="stable")
+    return {nome: valores[ordem] for nome, valores in colunas.items()}
+
+def analisar_respostas(data: pd.DataFrame, teste: str, group_col: str, respostas: list, fator_col: str = None,
+                       control: str = None, alpha: float = 0.05) -> dict:
+    """
+    Executa o mesmo teste em várias colunas de resposta (ex.: um gene por coluna) em uma passada vetorizada:
+    os grupos (e o fator) são fatorados uma vez só, as estatísticas por grupo de todas as respostas saem de
+    uma ordenação das linhas, e os p-valores das respostas com os mesmos tamanhos de grupo são calculados juntos.
+    Valores ausentes são ignorados só na resposta em que faltam (no teste t também: cada nível usa as
+    observações presentes).
+    Parâmetros:
+    - data: DataFrame em formato largo (uma coluna por resposta).
+    - teste: "dunnett", "t-test" ou "tukey".
+    - group_col, fator_col, control: ver gerar_estatisticas.
+    - respostas: Colunas de resposta (ver colunas_numericas).
+    - alpha: Nível de significância aplicado aos p-valores ajustados por Benjamini-Hochberg.
+    Retorna um dicionário com:
+      - teste, respostas
+      - tabela  (formato longo: resposta, [fator_col], group1, group2, meandiff, estatistica (t ou q), p (p do
+                 teste; no Dunnett e no Tukey já ajustado entre as comparações da resposta), p_bh (Benjamini-Hochberg
+                 sobre todas as linhas da tabela), reject (p_bh < alpha) e significance)
+      - resumo  (formato longo: resposta, [fator_col], group_col, mean, SE, count)
+      - ordem   (ordem dos grupos, ou dos níveis do fator no teste t, para os gráficos)
+    """
+    if teste not in ("dunnett", "t-test", "tukey"):
+        raise ValueError("Selecione um teste estatístico válido.")
+    respostas = list(respostas)
+    if not respostas:
+        raise ValueError("Selecione ao menos uma coluna de resposta.")
+    fator_col = fator_col if teste == "t-test" and fator_col else None
+    dados = Dados(data, group_col, respostas[0], fator_col)
+    Y = np.column_stack([data[c].to_numpy(dtype=np.float64) for c in respostas])
+    nomes = np.asarray(respostas, dtype=object)
+    grupos = np.asarray(dados.grupos, dtype=object)
+
+    if teste == "t-test":
+        if not fator_col and dados.n_grupos != 2:
+            raise ValueError("Para t-test sem fator_col, deve haver exatamente 2 grupos.")
+        chaves, codigos, validas = _celulas_ttest(dados) if fator_col else _celulas_grupo(dados)
+        completos = np.full(dados.n_linhas, -1, dtype=np.intp)
+        completos[validas] = codigos
+        n, media, sq_dentro = _resumo_respostas(completos, len(chaves), Y)
+
+        # pares de cada nível (grupos na ordem de aparecimento), como em run_t_test
+        codigos_f = dados.codigos_fator if fator_col else np.zeros(dados.n_linhas, dtype=np.intp)
+        codigos_f = np.where(dados.codigos_grupo >= 0, codigos_f, -1)
+        pares = _welch_por_fator(codigos_f, dados.codigos_grupo, dados.n_grupos, np.zeros(dados.n_linhas))
+        fatores = dados.fatores if fator_col else pd.Index(['Total'])
+        posto_f = np.argsort(fatores.argsort())
+        posto_g = np.argsort(dados.ordem_crescente())
+        a = np.searchsorted(chaves, posto_f[pares['fator']] * dados.n_grupos + posto_g[pares['g1']])
+        b = np.searchsorted(chaves, posto_f[pares['fator']] * dados.n_grupos + posto_g[pares['g2']])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vn1, vn2 = sq_dentro[:, a] / (n[:, a] - 1) / n[:, a], sq_dentro[:, b] / (n[:, b] - 1) / n[:, b]
+            se2 = vn1 + vn2
+            diff = media[:, a] - media[:, b]
+            t = diff / np.sqrt(se2)
+            gl = se2 ** 2 / (vn1 ** 2 / (n[:, a] - 1) + vn2 ** 2 / (n[:, b] - 1))
+            p = 2 * stdtr(gl, -np.abs(t))
+        linhas = np.repeat(np.arange(len(respostas)), len(a))
+        chave_fator = fator_col or group_col
+        tabela = pd.DataFrame({'resposta': nomes[linhas],
+                               chave_fator: np.tile(np.asarray(fatores, dtype=object)[pares['fator']], len(respostas)),
+                               'group1': np.tile(grupos[pares['g1']], len(respostas)),
+                               'group2': np.tile(grupos[pares['g2']], len(respostas)),
+                               'meandiff': diff.ravel(), 'estatistica': t.ravel(), 'p': p.ravel()})
+        celulas = {chave_fator: np.asarray(fatores[fatores.argsort()], dtype=object).take(chaves // dados.n_grupos)} if fator_col else {}
+        celulas[group_col] = grupos[dados.ordem_crescente()].take(chaves % dados.n_grupos)
+        ordem = fatores.tolist()
+    else:
+        n, media, sq_dentro = _resumo_respostas(dados.codigos_grupo, dados.n_grupos, Y)
+        if teste == "dunnett":
+            ic = _indice_do_grupo(dados.grupos, control)
+            res = _dunnett_respostas(n, media, sq_dentro, ic)
+            g1, g2 = np.full(len(res['outro']), ic), res['outro']
+            ordem = dados.grupos.tolist()
+            celulas = {group_col: grupos}
+        else:
+            crescente = dados.ordem_crescente()
+            res = _tukey_respostas(n, media, sq_dentro, crescente)
+            g1, g2 = res['i'], res['j']
+            ordem = dados.grupos[crescente].tolist()
+            celulas = {group_col: grupos[crescente]}
+            n, media, sq_dentro = n[:, crescente], media[:, crescente], sq_dentro[:, crescente]
+        tabela = pd.DataFrame({'resposta': nomes[res['resposta']], 'group1': grupos[g1], 'group2': grupos[g2],
+                               'meandiff': res['meandiff'], 'estatistica': res['estatistica'], 'p': res['p']})
+
+    p_bh = ajustar_bh(tabela['p'].to_numpy())
+    tabela = tabela.assign(meandiff=tabela['meandiff'].round(4), estatistica=tabela['estatistica'].round(4),
+                           p=tabela['p'].round(4), p_bh=np.round(p_bh, 4), reject=p_bh < alpha,
+                           significance=np.where(np.isnan(p_bh), "", notacao_significancia(p_bh)))
+
+    # resumo longo: uma linha por resposta e célula
+    k = n.shape[1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        erro = np.sqrt(sq_dentro / (n - 1)) / np.sqrt(n)
+    resumo = pd.DataFrame({'resposta': np.repeat(nomes, k),
+                           **{col: np.tile(valores, len(respostas)) for col, valores in celulas.items()},
+                           'mean': media.ravel(), 'SE': erro.ravel(), 'count': n.ravel()})
+    return {"teste": teste, "respostas": respostas, "tabela": tabela, "resumo": resumo, "ordem": ordem}
+
+def _celulas_grupo(dados: Dados):
+    """ Células do teste t sem fator (um único nível): os grupos em ordem crescente, como em _celulas_ttest. """
+    posto_g = np.argsort(dados.ordem_crescente())
+    validas = dados.codigos_grupo >= 0
+    chaves, codigos = np.unique(posto_g[dados.codigos_grupo[validas]], return_inverse=True)
+    return chaves, codigos, validas
 
 
 if __name__ == "__main__":
     
     file_path = "L:/Projetos/Lab/Projetos/Gerador_Graficos/exemplos.xlsx"
     data = pd.read_excel(file_path, sheet_name="Tukey")
+
+    # Um único motor para Dunnett e Tukey: os resumos por grupo são calculados uma vez só
+    motor = Estatiscas(data, group_col='genotype', fator_col=None, response_col='expression', control='control')
     
-    
-    results, order = run_test_dunnett(data, response_col='expression', group_col='genotype', control='control')
+    results, order = motor.run_dunnett()
     print("\nResultados do teste de Dunnett:")
     print(results)
-    summary_stats = add_significance_dunnet(data, results, response_col='expression', group_col='genotype', control='control')
+    summary_stats = motor.add_significance()
     print("Estatísticas resumidas com significância Dunnett: ")
     print(summary_stats)
 
-    data = pd.read_excel(file_path, sheet_name="Tukey")
-    results_tukey = run_test_tukey(data, response_col='expression', group_col='genotype')
+    results_tukey = motor.run_tukey()
     print("\nResultados do teste de Tukey:")
     print(results_tukey)
     summary_stats_tukey = add_significance_tukey(results_tukey, alpha=0.05)
     print("Estatísticas resumidas com significância Tukey:")
     print(summary_stats_tukey)
 
-    data_tukey = pd.read_excel(file_path, sheet_name="Tukey")
-    re, media, erro, letras = run_test_tukey_anova(data_tukey, "genotype", "expression")
-    
     print("Estatísticas resumidas com significância Tukey2:")
-    print(re)
-    print(letras)
+    print(motor.anova)
+    print(motor.letras())
 
     data_T = pd.read_excel(file_path, sheet_name="t-test")
-    results_T = run_t_test(data_T, "condition", "genotype", "expression")
+    motor_T = Estatiscas(data_T, group_col="condition", fator_col="genotype", response_col="expression", control=None)
+    results_T = motor_T.run_t_test()
     print("\nResultados do teste de test-t:")
     print(results_T)
-    summary_stats_T, order = add_significance_ttest(data_T, results_T, "expression", "condition", "genotype")
+    summary_stats_T = motor_T.significancia_ttest()
     print("Estatísticas resumidas com significância test-t:")
     print(summary_stats_T)
-
-
-
@@ -0,0 +1,136 @@
+""" Exportação de uma figura já montada em vários formatos e resoluções.
+
+A figura é serializada (pickle) uma única vez e cada arquivo é gravado por um processo separado,
+então SVG, TIFF e PDF do mesmo gráfico saem de uma só montagem e em paralelo.
+"""
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from gui.desempenho import medir, registrar
+
+FORMATOS = ("svg", "tiff", "png", "pdf")
+# Compressão sem perdas do TIFF (Pillow): "tiff_lzw" ou "tiff_adobe_deflate"
+COMPRESSAO_TIFF = "tiff_lzw"
+
+_pool = None
+
+
+def dpi_para_formato(ext: str) -> int:
+    """ Resolução padrão para cada formato: 600 dpi para TIFF, 300 para os demais. """
+    return 600 if ext.lower() in ("tiff", "tif") else 300
+
+
+def opcoes_formato(ext: str, compressao_tiff: str = COMPRESSAO_TIFF) -> dict:
+    """ Argumentos extras de savefig para o formato (compressão do TIFF). """
+    if ext.lower() in ("tiff", "tif") and compressao_tiff:
+        return {"pil_kwargs": {"compression": compressao_tiff}}
+    return {}
+
+
+def normalizar_saidas(formatos) -> list:
+    """ Converte a lista de formatos em pares (ext, dpi).
+    Parâmetros:
+    - formatos: Formato ("svg"), lista de formatos ou de pares (ext, dpi); sem dpi usa dpi_para_formato.
+    Retorna:
+    - Lista de pares (ext, dpi), sem repetições, na ordem pedida.
+    """
+    if isinstance(formatos, str):
+        formatos = [formatos]
+    saidas = []
+    for item in formatos:
+        ext, dpi = (item, None) if isinstance(item, str) else item
+        par = (ext.lower(), int(dpi or dpi_para_formato(ext)))
+        if par not in saidas:
+            saidas.append(par)
+    return saidas
+
+
+def nomes_arquivos(base: str, saidas: list) -> list:
+    """ Caminho de cada saída: base.ext, ou base_<dpi>dpi.ext quando o formato aparece com mais de uma resolução. """
+    repetidos = {ext for ext, _ in saidas if sum(e == ext for e, _ in saidas) > 1}
+    return [f"{base}_{dpi}dpi.{ext}" if ext in repetidos else f"{base}.{ext}" for ext, dpi in saidas]
+
+
+def _gravar(figura, caminho: str, ext: str, dpi: int, opcoes: dict) -> dict:
+    """ Grava um arquivo; `figura` é a Figure ou ela serializada com pickle (nos processos de trabalho). """
+    inicio = time.perf_counter()
+    fig = pickle.loads(figura) if isinstance(figura, bytes) else figura
+    fig.savefig(caminho, format=ext, dpi=dpi, bbox_inches="tight", **opcoes)
+    return {"arquivo": caminho, "formato": ext, "dpi": dpi,
+            "segundos": round(time.perf_counter() - inicio, 3), "bytes": os.path.getsize(caminho)}
+
+
+def _processos():
+    """ Pool de processos reaproveitado entre exportações (spawn: seguro com a thread do Tk ativa). """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=min(len(FORMATOS), os.cpu_count() or 1),
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def encerrar():
+    """ Libera os processos de exportação (usar ao fechar a janela). """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def exportar(fig, base: str, formatos, compressao_tiff: str = COMPRESSAO_TIFF, paralelo: bool = True, progresso=None):
+    """
+    Grava a mesma figura em vários formatos/resoluções sem remontá-la.
+    Parâmetros:
+    - fig: Figura do matplotlib (não pode estar ligada a um widget Tk quando paralelo=True).
+    - base: Caminho de saída sem extensão.
+    - formatos: Formatos a gravar (ver normalizar_saidas).
+    - compressao_tiff: Compressão do TIFF ("tiff_lzw", "tiff_adobe_deflate" ou None).
+    - paralelo: Se True, cada arquivo é gravado em um processo de trabalho; se False, em sequência
+      neste processo (útil quando quem chama já é um processo de trabalho, como no lote).
+    - progresso: Função progresso(fracao, mensagem) chamada a cada arquivo pronto (pode levantar
+      exceção para cancelar).
+    Retorna:
+    - DataFrame com arquivo, formato, dpi, segundos e bytes de cada saída, na ordem pedida.
+    """
+    import pandas as pd  # carregado só ao exportar: este módulo é importado pela janela na abertura
+
+    saidas = normalizar_saidas(formatos)
+    caminhos = nomes_arquivos(base, saidas)
+    pasta = os.path.dirname(base)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    registros = {}
+    if paralelo and len(saidas) > 1:
+        with medir("serializar figura"):
+            figura = pickle.dumps(fig, protocol=pickle.HIGHEST_PROTOCOL)
+        pool = _processos()
+        futuros = {pool.submit(_gravar, figura, caminho, ext, dpi, opcoes_formato(ext, compressao_tiff)): caminho
+                   for caminho, (ext, dpi) in zip(caminhos, saidas)}
+        try:
+            for futuro in as_completed(futuros):
+                registro = registros[futuros[futuro]] = futuro.result()
+                # medido no processo de trabalho: entra como span já concluído
+                registrar(f"gravar {registro['formato']} {registro['dpi']} dpi (processo)", registro["segundos"],
+                          bytes=registro["bytes"])
+                if progresso:
+                    progresso(len(registros) / len(saidas), f"{os.path.basename(futuros[futuro])} gravado")
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+    else:
+        for caminho, (ext, dpi) in zip(caminhos, saidas):
+            with medir(f"gravar {ext} {dpi} dpi"):
+                registros[caminho] = _gravar(fig, caminho, ext, dpi, opcoes_formato(ext, compressao_tiff))
+            if progresso:
+                progresso(len(registros) / len(saidas), f"{os.path.basename(caminho)} gravado")
+    return pd.DataFrame([registros[c] for c in caminhos])
+
+
+def descrever_exportacao(relatorio) -> str:
+    """ Texto curto com tempo e tamanho de cada arquivo exportado (para a barra de status). """
+    partes = [f"{r.formato} {r.dpi} dpi: {r.segundos:.1f} s, {r.bytes / 1024:.0f} KB" for r in relatorio.itertuples()]
+    return "; ".join(partes)
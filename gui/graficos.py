@@ -0,0 +1,735 @@
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import matplotlib
+import seaborn as sns
+import matplotlib.ticker as ticker
+from matplotlib.colors import to_rgb
+from matplotlib.container import BarContainer
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+from gui.exportacao import opcoes_formato
+from gui.opcoes import MODOS_PONTOS, MODOS_COR
+from gui.desempenho import medir, medido
+
+
+# Trava de todo uso de contexto_fonte: o rc_context altera os rcParams do processo inteiro e, ao sair,
+# restaura o que havia na entrada; dois contextos sobrepostos restaurariam os valores um do outro
+_trava_fonte = threading.RLock()
+
+
+@lru_cache(maxsize=None)
+def familia_fonte() -> str:
+    """ Fonte dos gráficos: Arial quando instalada, senão a primeira sans-serif padrão do matplotlib que
+    estiver instalada. É sempre um nome concreto (e não "sans-serif", que o matplotlib só resolve pelos
+    rcParams no momento do desenho), então o resultado não depende dos rcParams de quem desenha.
+    """
+    from matplotlib import font_manager
+    instaladas = {fonte.name for fonte in font_manager.fontManager.ttflist}
+    for nome in ["Arial"] + list(matplotlib.rcParamsDefault['font.sans-serif']):
+        if nome in instaladas:
+            return nome
+    return "DejaVu Sans"  # vem com o matplotlib
+
+
+@contextmanager
+def contexto_fonte(font_size: float = 10.0):
+    """ Contexto da montagem dos gráficos: fonte base `font_size` e família familia_fonte().
+    Enquanto dura, os rcParams globais ficam alterados (rc_context); por isso ele é exclusivo
+    (_trava_fonte) e a figura não deve depender deles depois: fixar_fonte grava a família em cada texto
+    e registrar_artistas fixa o tamanho dos ticks, e a prévia (thread do Tk) e os processos de exportação
+    desenham fora dele.
+    Parâmetros:
+    - font_size: Tamanho base da fonte.
+    """
+    with _trava_fonte, matplotlib.rc_context({'font.family': familia_fonte(), 'font.size': float(font_size)}):
+        yield
+
+
+def fixar_fonte(fig):
+    """ Grava a família familia_fonte() em todos os textos da figura e nos rótulos de ticks criados depois. """
+    familia = familia_fonte()
+    for texto in fig.findobj(Text):
+        texto.set_fontfamily(familia)
+    for ax in fig.axes:
+        ax.tick_params(labelfontfamily=familia)
+
+
+def nova_figura(fig_w_cm: float, fig_h_cm: float, dpi: int):
+    """ Cria uma figura independente do pyplot (segura para uso sem interface gráfica).
+    Parâmetros:
+    - fig_w_cm, fig_h_cm: Largura e altura da figura em centímetros.
+    - dpi: Resolução da figura.
+    Retorna:
+    - fig, ax: Figura e eixo criados.
+    """
+    fig = Figure(figsize=(fig_w_cm / 2.54, fig_h_cm / 2.54), dpi=dpi)  # Converter cm para polegadas
+    ax = fig.add_subplot()
+    return fig, ax
+
+
+# Limites da camada de pontos individuais (os modos estão em opcoes.MODOS_PONTOS)
+LIMITE_VETORIAL = 5_000
+LIMITE_RASTERIZADO = 50_000
+MAX_PONTOS_GRUPO = 2_000
+FAIXAS_ENXAME = 60
+MAX_PONTOS_FAIXA = 25
+TAMANHO_PONTO = 1
+
+
+def resolver_modo_pontos(modo: str, n_pontos: int) -> str:
+    """ Converte "auto" no modo usado para `n_pontos` observações; os demais modos são mantidos. """
+    if modo not in MODOS_PONTOS:
+        raise ValueError(f"Modo de pontos desconhecido: {modo}")
+    if modo != "auto":
+        return modo
+    if n_pontos <= LIMITE_VETORIAL:
+        return "todos"
+    return "rasterizado" if n_pontos <= LIMITE_RASTERIZADO else "amostra"
+
+
+def _niveis(serie: pd.Series) -> list:
+    """ Níveis de uma coluna na ordem usada pelo seaborn (categorias ou ordem de aparecimento). """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return list(serie.cat.categories)
+    return list(pd.unique(serie.dropna()))
+
+
+def amostra_por_quantis(data: pd.DataFrame, colunas_grupo: list, response_col: str, maximo: int = MAX_PONTOS_GRUPO) -> pd.DataFrame:
+    """
+    Reduz cada grupo a no máximo `maximo` linhas escolhidas em quantis igualmente espaçados da resposta.
+    A amostra é determinística, mantém o mínimo e o máximo de cada grupo e preserva a forma da distribuição.
+    Parâmetros:
+    - data: DataFrame com as observações.
+    - colunas_grupo: Colunas que definem os grupos (ex.: [grupo] ou [fator, grupo]).
+    - response_col: Coluna da resposta.
+    - maximo: Número máximo de linhas por grupo.
+    Retorna:
+    - DataFrame com as linhas escolhidas (linhas sem resposta são descartadas).
+    """
+    data = data[data[response_col].notna()]
+    codigos = np.zeros(len(data), dtype=np.int64)
+    for col in colunas_grupo:
+        c, niveis = pd.factorize(data[col])
+        codigos = codigos * (len(niveis) + 1) + (c + 1)
+    y = data[response_col].to_numpy(dtype=float)
+    ordem = np.lexsort((y, codigos))  # por grupo e, dentro dele, pela resposta
+    _, inicio, contagem = np.unique(codigos[ordem], return_index=True, return_counts=True)
+    escolhidas = [
+        ordem[i:i + n] if n <= maximo else ordem[i + np.round(np.linspace(0, n - 1, maximo)).astype(np.int64)]
+        for i, n in zip(inicio, contagem)
+    ]
+    return data.iloc[np.sort(np.concatenate(escolhidas))] if escolhidas else data
+
+
+def bordas_enxame(y: np.ndarray, faixas: int = FAIXAS_ENXAME) -> np.ndarray:
+    """ Bordas das faixas do enxame: intervalos iguais entre os quantis 0,5% e 99,5% da resposta, mais uma
+    faixa para cada cauda (valores extremos não alargam as demais faixas).
+    """
+    if not len(y):
+        return np.linspace(0.0, 1.0, faixas + 1)
+    lo, hi = np.percentile(y, [0.5, 99.5])
+    if hi <= lo:
+        hi = lo + 1.0
+    bordas = np.linspace(lo, hi, faixas - 1)
+    return np.unique(np.concatenate([[min(y.min(), lo)], bordas, [max(y.max(), hi)]]))
+
+
+def posicoes_enxame(valores: np.ndarray, centro: float, largura: float, limites: np.ndarray,
+                    max_por_faixa: int = MAX_PONTOS_FAIXA):
+    """
+    Posições de um "enxame em faixas": a resposta é dividida em intervalos e cada intervalo recebe
+    até `max_por_faixa` pontos lado a lado, ocupando uma largura proporcional à contagem do intervalo.
+    Parâmetros:
+    - valores: Respostas do grupo (sem NaN).
+    - centro: Posição do grupo no eixo x.
+    - largura: Largura máxima ocupada pelo grupo.
+    - limites: Bordas das faixas (crescentes), comuns a todos os grupos para que as faixas coincidam.
+    - max_por_faixa: Número máximo de pontos por intervalo.
+    Retorna:
+    - (x, y) com no máximo (len(limites) - 1) * max_por_faixa pontos.
+    """
+    if not len(valores):
+        return np.empty(0), np.empty(0)
+    bordas = limites
+    contagem, _ = np.histogram(valores, bins=bordas)
+    # soma por faixa para desenhar cada ponto na média da faixa, e não no centro do intervalo
+    soma, _ = np.histogram(valores, bins=bordas, weights=valores)
+    pontos = np.minimum(contagem, max_por_faixa)
+    escala = largura / 2 / max(contagem.max(), 1)
+    xs, ys = [], []
+    for c, k, total in zip(contagem, pontos, soma):
+        if k == 0:
+            continue
+        meia = escala * c
+        xs.append(centro + (np.linspace(-meia, meia, k) if k > 1 else np.zeros(1)))
+        ys.append(np.full(k, total / c))
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+@medido
+def pontos_individuais(ax, data: pd.DataFrame, x_col: str, response_col: str, order: list, modo: str = "auto",
+                       hue_col: str = None, dodge: bool = False, legend=False):
+    """
+    Desenha a camada de pontos individuais sobre as barras, de acordo com `modo` (ver MODOS_PONTOS).
+    Parâmetros:
+    - ax: Eixo do matplotlib.
+    - data: DataFrame com as observações individuais.
+    - x_col: Coluna do eixo x.
+    - response_col: Coluna da resposta.
+    - order: Ordem dos níveis de x_col no eixo.
+    - modo: Modo da camada de pontos.
+    - hue_col: Coluna das cores (None: a própria x_col).
+    - dodge: Separa os níveis de hue_col lado a lado dentro de cada posição de x (gráfico do teste t).
+    - legend: Repassado ao seaborn.
+    Retorna:
+    - Modo efetivamente usado.
+    """
+    hue_col = hue_col or x_col
+    modo = resolver_modo_pontos(modo, int(data[response_col].notna().sum()))
+    if modo == "enxame":
+        niveis_hue = _niveis(data[hue_col]) if dodge else [None]
+        largura = 0.8 / len(niveis_hue)
+        validos = data[data[response_col].notna()]
+        y = validos[response_col].to_numpy(dtype=float)
+        limites = bordas_enxame(y)
+        xs, ys = [], []
+        for i, nivel in enumerate(order):
+            no_nivel = validos[x_col] == nivel
+            for j, nivel_hue in enumerate(niveis_hue):
+                selecao = no_nivel if nivel_hue is None else no_nivel & (validos[hue_col] == nivel_hue)
+                centro = i if nivel_hue is None else i - 0.4 + (j + 0.5) * largura
+                px, py = posicoes_enxame(y[selecao.to_numpy()], centro, largura * 0.8, limites)
+                xs.append(px)
+                ys.append(py)
+        if xs:
+            ax.scatter(np.concatenate(xs), np.concatenate(ys), s=TAMANHO_PONTO ** 2, c="black", linewidths=0,
+                       rasterized=True, zorder=3)
+        return modo
+
+    if modo == "amostra":
+        data = amostra_por_quantis(data, [x_col] if hue_col == x_col else [x_col, hue_col], response_col)
+    sns.stripplot(x=x_col, y=response_col, data=data, hue=hue_col, order=order, dodge=dodge,
+                  jitter=0.1, size=TAMANHO_PONTO, palette='dark:black', ax=ax, legend=legend,
+                  rasterized=modo != "todos")
+    return modo
+
+
+
+def _tom_claro(cor: str, fracao: float = 0.5) -> tuple:
+    """ Mistura a cor com branco (fracao = quanto de branco). """
+    return tuple(c + (1 - c) * fracao for c in to_rgb(cor))
+
+
+def _textos_com_fonte(ax) -> list:
+    """ Textos do eixo cujo tamanho acompanha o tamanho base da fonte (a legenda é refeita à parte). """
+    return list(ax.texts) + [ax.title, ax.xaxis.label, ax.yaxis.label]
+
+
+def _criar_legenda(fig):
+    """ (Re)cria a legenda registrada em fig.artistas["legenda"] com a fonte base atual.
+    Os espaçamentos da legenda são calculados na criação a partir da fonte, então mudar só o tamanho
+    dos textos não bastaria.
+    """
+    artistas = fig.artistas
+    handles, labels, opcoes = artistas["legenda"]
+    legenda = artistas["ax"].legend(handles, labels, prop={"size": artistas["font_size"], "family": familia_fonte()},
+                                    **opcoes)
+    artistas["marcadores_legenda"] = list(legenda.legend_handles)
+
+
+def registrar_artistas(fig, ax, font_size: float, series: list, desenha_titulo: bool = True, rotulos_padrao: tuple = ("", ""),
+                       legenda: tuple = None):
+    """
+    Guarda em `fig.artistas` as referências necessárias para aplicar_estilo alterar a figura sem refazê-la:
+    os textos (com o tamanho relativo à fonte base), as barras e as cores originais delas.
+    Parâmetros:
+    - fig, ax: Figura e eixo do gráfico.
+    - font_size: Fonte base usada na montagem.
+    - series: Lista de séries de barras; cada série é a lista dos patches de uma mesma cor na paleta
+      original (uma série por gráfico de grupos, uma por grupo no gráfico do teste t).
+    - desenha_titulo: False para gráficos que não mostram o título.
+    - rotulos_padrao: Rótulos (x, y) que aparecem quando o usuário deixa o eixo em branco (o seaborn usa o
+      nome da coluna quando o rótulo está vazio no momento em que desenha os pontos).
+    - legenda: (handles, labels, opções de ax.legend) da legenda já desenhada, se houver; os marcadores
+      dela seguem a cor da série correspondente.
+    """
+    rotulos = ax.xaxis.get_ticklabels() + ax.yaxis.get_ticklabels()
+    escala_ticks = (rotulos[0].get_fontsize() / font_size) if rotulos else 1.0
+    # tamanho explícito: o espaço entre os ticks, recalculado a cada desenho (na thread do Tk, fora de
+    # contexto_fonte), não depende dos rcParams do momento
+    ax.tick_params(labelsize=escala_ticks * font_size)
+    fig.artistas = {
+        "ax": ax,
+        "font_size": float(font_size),
+        "textos": [(texto, texto.get_fontsize() / font_size) for texto in _textos_com_fonte(ax)],
+        "escala_ticks": escala_ticks,
+        "series": series,
+        "cores_paleta": [[patch.get_facecolor() for patch in serie] for serie in series],
+        "desenha_titulo": desenha_titulo,
+        "rotulos_padrao": rotulos_padrao,
+        "legenda": legenda,
+        "marcadores_legenda": list(ax.get_legend().legend_handles) if legenda else [],
+    }
+
+
+def colorir_barras(fig, cor_barras: str = None, modo_cor: str = "paleta"):
+    """ Aplica o modo de cor às barras registradas em `fig.artistas` (ver MODOS_COR). """
+    artistas = fig.artistas
+    series = artistas["series"]
+    if modo_cor not in MODOS_COR:
+        raise ValueError(f"Modo de cor desconhecido: {modo_cor}")
+    if modo_cor == "paleta" or not cor_barras:
+        for serie, cores in zip(series, artistas["cores_paleta"]):
+            for patch, cor in zip(serie, cores):
+                patch.set_facecolor(cor)
+    else:
+        _pintar_series(series, cor_barras, modo_cor)
+    for serie, marcador in zip(series, artistas["marcadores_legenda"]):
+        if serie:
+            marcador.set_facecolor(serie[0].get_facecolor())
+
+
+def _pintar_series(series: list, cor_barras: str, modo_cor: str):
+    """ Pinta as séries com a cor escolhida ("única") ou alternando com um tom mais claro ("alternadas"). """
+    cores = [to_rgb(cor_barras), _tom_claro(cor_barras)] if modo_cor == "alternadas" else [to_rgb(cor_barras)]
+    for j, serie in enumerate(series):
+        for i, patch in enumerate(serie):
+            # com uma só série alterna entre barras vizinhas; com várias, entre as séries
+            indice = i if len(series) == 1 else j
+            patch.set_facecolor(cores[indice % len(cores)] + (patch.get_facecolor()[3],))
+
+
+def aplicar_estilo(fig, titulo: str = None, eixo_x: str = None, eixo_y: str = None, font_size: float = None,
+                   fig_w: float = None, fig_h: float = None, cor_barras: str = None, modo_cor: str = None):
+    """
+    Altera só a aparência de uma figura já montada (textos, fonte, tamanho e cores), sem refazer estatísticas
+    nem o gráfico. Parâmetros None ficam como estão. Depois basta redesenhar o canvas.
+    Parâmetros:
+    - fig: Figura criada por criar_grafico.
+    - titulo, eixo_x, eixo_y: Textos do gráfico.
+    - font_size: Tamanho base da fonte.
+    - fig_w, fig_h: Tamanho da figura em centímetros.
+    - cor_barras, modo_cor: Ver colorir_barras.
+    """
+    artistas = fig.artistas
+    ax = artistas["ax"]
+    if titulo is not None and artistas["desenha_titulo"]:
+        ax.title.set_text(titulo)
+    padrao_x, padrao_y = artistas["rotulos_padrao"]
+    if eixo_x is not None:
+        ax.xaxis.label.set_text(eixo_x or padrao_x)
+    if eixo_y is not None:
+        ax.yaxis.label.set_text(eixo_y or padrao_y)
+    if font_size is not None:
+        artistas["font_size"] = float(font_size)
+        for texto, escala in artistas["textos"]:
+            texto.set_fontsize(escala * float(font_size))
+        ax.tick_params(labelsize=artistas["escala_ticks"] * float(font_size))
+        if artistas["legenda"]:
+            _criar_legenda(fig)  # os marcadores novos copiam a cor atual das barras
+    if modo_cor is not None:
+        colorir_barras(fig, cor_barras, modo_cor)
+    if fig_w is not None and fig_h is not None:
+        fig.set_size_inches(fig_w / 2.54, fig_h / 2.54)
+    if all(valor is None for valor in (titulo, eixo_x, eixo_y, font_size, fig_w, fig_h)):
+        return  # só cores: as margens não mudam
+    # recalcula as margens a partir da posição inicial do eixo e na fonte base, como na montagem
+    # (a legenda do teste t fica fora do eixo e faria o tight_layout repetido mudar a cada chamada)
+    fig.subplots_adjust(**{lado: matplotlib.rcParams[f"figure.subplot.{lado}"] for lado in ("left", "right", "bottom", "top")})
+    with contexto_fonte(artistas["font_size"]), medir("tight_layout"):
+        fig.tight_layout()
+
+
+def barras_de_erro(resumo: pd.DataFrame):
+    """ Barras de erro de cada linha do resumo: intervalo bootstrap (IC_inf, IC_sup) quando houver, senão ± SE.
+    Retorna:
+    - (yerr, topo): yerr no formato do errorbar (2 x linhas, distâncias abaixo e acima da média) e o topo de cada barra.
+    """
+    media = resumo['mean'].to_numpy(dtype=float)
+    if 'IC_inf' in resumo:
+        inferior, superior = resumo['IC_inf'].to_numpy(dtype=float), resumo['IC_sup'].to_numpy(dtype=float)
+    else:
+        erro = resumo['SE'].to_numpy(dtype=float)
+        inferior, superior = media - erro, media + erro
+    return np.vstack([media - inferior, superior - media]), superior
+
+
+def _barras_por_posicao(patches) -> list:
+    """ Patches das barras ordenados pela posição no eixo x. """
+    return sorted(patches, key=lambda patch: patch.get_x())
+
+
+@medido
+def grafico_dunnett(data: pd.DataFrame, summary_stats: pd.DataFrame, order: list, group_col: str, response_col: str,
+                    titulo: str = "", eixo_x: str = "", eixo_y: str = "", font_size: float = 10.0,
+                    fig_w: float = 8.0, fig_h: float = 8.0, dpi: int = 300, modo_pontos: str = "auto",
+                    cor_barras: str = None, modo_cor: str = "paleta"):
+    """ Monta o gráfico de barras do teste de Dunnett.
+    Parâmetros:
+    - data: DataFrame com as observações individuais.
+    - summary_stats: Saída de add_significance_dunnet (com IC_inf e IC_sup, as barras de erro mostram o intervalo bootstrap).
+    - order: Ordem dos grupos no eixo x.
+    - group_col, response_col: Colunas de grupo e de resposta.
+    - titulo, eixo_x, eixo_y: Textos do gráfico.
+    - font_size: Tamanho da fonte dos asteriscos.
+    - fig_w, fig_h: Tamanho da figura em centímetros.
+    - dpi: Resolução da figura.
+    - modo_pontos: Modo da camada de pontos individuais (ver MODOS_PONTOS).
+    - cor_barras, modo_cor: Cores das barras (ver colorir_barras).
+    Retorna:
+    - Figura do matplotlib, com as referências dos elementos em fig.artistas (ver aplicar_estilo).
+    """
+    fig, ax = nova_figura(fig_w, fig_h, dpi)
+    # Barras
+    palette = sns.color_palette("Set1", n_colors=len(order))
+    sns.barplot(x=group_col, y='mean', data=summary_stats,
+                errorbar='se', capsize=0.1,
+                width=0.3, alpha=0.8, ax=ax, order=order, linewidth=0.4, palette=palette,
+                hue=group_col,
+                legend=False
+                )
+    barras = _barras_por_posicao(ax.patches)
+    # Pontos individuais
+    pontos_individuais(ax, data, group_col, response_col, order, modo_pontos)
+
+    # Elementos estéticos: busca a maior media para ajustar o limite do eixo y
+    y_max = summary_stats['mean'].max()
+    if order:
+        ax.set_xticks(range(len(order)))
+        ax.set_xticklabels(order, rotation=45, ha='right')
+    else:
+        ax.set_xticks([])  # evita warnings se ordens estiver vazio
+    ax.set(xlabel=eixo_x, ylabel=eixo_y, title=titulo)
+    y_espaco = 0.2 * y_max * 1.2
+    ax.yaxis.set_major_locator(ticker.MultipleLocator(y_espaco))
+    ax.set_ylim(0, y_max * 1.2)
+
+    # Adicionar significância
+    yerr, topo = barras_de_erro(summary_stats)
+    for linha, (_, row) in enumerate(summary_stats.iterrows()):
+        if row[group_col] not in order:
+            continue
+        i = order.index(row[group_col])
+        y_pos = topo[linha]
+        # Adiciona barra de erro
+        ax.errorbar(
+            x=i,
+            y=row['mean'],
+            yerr=yerr[:, linha:linha + 1],
+            fmt='none',           # Não desenha marcador, só a barra de erro
+            c='black',
+            capsize=5,
+            linewidth=0.4
+        )
+        # Adiciona o texto de significância
+        ax.text(i, y_pos, row['significance'], ha='center', va='bottom', size=float(font_size))
+
+    # Remover bordas
+    sns.despine(ax=ax)
+    with medir("tight_layout"):
+        fig.tight_layout()
+    registrar_artistas(fig, ax, font_size, [barras])
+    colorir_barras(fig, cor_barras, modo_cor)
+    return fig
+
+
+@medido
+def grafico_ttest(data: pd.DataFrame, summary_stats: pd.DataFrame, order: list, group_col: str, fator_col: str, response_col: str,
+                  titulo: str = "", eixo_x: str = "", eixo_y: str = "", font_size: float = 10.0,
+                  fig_w: float = 8.0, fig_h: float = 8.0, dpi: int = 300, modo_pontos: str = "auto",
+                  cor_barras: str = None, modo_cor: str = "paleta"):
+    """ Monta o gráfico de barras agrupadas do teste t (um par de barras por nível do fator).
+    Parâmetros:
+    - data: DataFrame com as observações individuais.
+    - summary_stats: Saída de add_significance_ttest (com IC_inf e IC_sup, as barras de erro mostram o intervalo bootstrap).
+    - order: Ordem dos níveis do fator no eixo x.
+    - group_col, fator_col, response_col: Colunas de grupo, fator e resposta.
+    - titulo, eixo_x, eixo_y: Textos do gráfico (o título não é desenhado neste gráfico).
+    - font_size: Tamanho da fonte dos rótulos e asteriscos.
+    - fig_w, fig_h: Tamanho da figura em centímetros.
+    - dpi: Resolução da figura.
+    - modo_pontos: Modo da camada de pontos individuais (ver MODOS_PONTOS).
+    - cor_barras, modo_cor: Cores das barras (ver colorir_barras).
+    Retorna:
+    - Figura do matplotlib, com as referências dos elementos em fig.artistas (ver aplicar_estilo).
+    """
+    sig_map = summary_stats.set_index(fator_col)['significance'].to_dict()
+    fig, ax = nova_figura(fig_w, fig_h, dpi)
+    ordens = list(order)
+    # Gráfico de barras
+    sns.barplot(
+        data=summary_stats,
+        x=fator_col,
+        y="mean",
+        hue=group_col,
+        ax=ax,
+        capsize=0.1,
+        palette="Set2",
+        order=ordens
+        )
+    # uma série de barras por grupo (mesma cor)
+    series = [_barras_por_posicao(c) for c in ax.containers if isinstance(c, BarContainer)]
+    # Pontos individuais: mesmo hue e mesma ordem do barplot, com os grupos separados (dodge)
+    pontos_individuais(ax, data, fator_col, response_col, ordens, modo_pontos, hue_col=group_col, dodge=True, legend="auto")
+
+    # busca a maior media para ajustar o limite do eixo y
+    y_max = summary_stats['mean'].max()
+    ax.set_ylim(0, y_max * 1.2)
+
+    # Adiciona barras de erro
+    names = summary_stats[group_col].unique()
+    yerr, _ = barras_de_erro(summary_stats)
+    for linha, (_, row) in enumerate(summary_stats.iterrows()):
+        fator = row[fator_col]
+        if fator not in ordens:
+            continue
+        idx_fator = ordens.index(fator)
+        deslocamento = -0.2 if row[group_col] == names[0] else 0.2
+        ax.errorbar(x=idx_fator + deslocamento, y=row['mean'], yerr=yerr[:, linha:linha + 1], fmt='none', c='black', capsize=5, linewidth=0.4)
+
+    # Um traço com asterisco por fator significativo
+    for idx_fator, fator in enumerate(ordens):
+        sig = sig_map.get(fator, "")
+        if sig and sig != 'ns':
+            x0 = idx_fator - 0.2
+            x1 = idx_fator + 0.2
+            y_linha = y_max * 1.1  # ajuste a altura do traço conforme necessário
+
+            # Desenha o traço
+            ax.plot([x0, x1], [y_linha, y_linha], c='black', linewidth=1)
+            # Adiciona o asterisco no meio do traço
+            ax.text(idx_fator, y_linha * 1.0025, sig, ha='center', va='bottom', fontsize=float(font_size))
+
+    # Ajustes visuais
+    y_legenda = y_max * 1.1 * 1.02
+    y_legenda_rel = y_legenda / (y_max)
+
+    ax.set_ylabel(eixo_y, fontsize=float(font_size))
+    ax.set_xlabel(eixo_x, fontsize=float(font_size))
+    handles, labels = ax.get_legend_handles_labels()
+    opcoes_legenda = dict(loc="upper center", bbox_to_anchor=(0.5, y_legenda_rel), ncol=2, frameon=False)
+    ax.legend(handles[:len(names)], labels[:len(names)], **opcoes_legenda)
+    if ordens:
+        ax.set_xticks(range(len(ordens)))
+        ax.set_xticklabels(ordens, rotation=45, ha='right')
+    else:
+        ax.set_xticks([])  # evita warnings se ordens estiver vazio
+    with medir("tight_layout"):
+        fig.tight_layout()
+
+    # Remover bordas
+    sns.despine(ax=ax)
+    registrar_artistas(fig, ax, font_size, series, desenha_titulo=False,
+                       legenda=(handles[:len(names)], labels[:len(names)], opcoes_legenda))
+    colorir_barras(fig, cor_barras, modo_cor)
+    return fig
+
+
+@medido
+def grafico_tukey(data: pd.DataFrame, media: pd.Series, erro: pd.Series, letras: list, group_col: str, response_col: str,
+                  titulo: str = "", eixo_x: str = "", eixo_y: str = "", font_size: float = 10.0,
+                  fig_w: float = 8.0, fig_h: float = 8.0, dpi: int = 300, modo_pontos: str = "auto",
+                  cor_barras: str = None, modo_cor: str = "paleta", ic: pd.DataFrame = None):
+    """ Monta o gráfico de barras com as letras do teste de Tukey.
+    Parâmetros:
+    - data: DataFrame com as observações individuais.
+    - media, erro: Média e erro padrão por tratamento (mesmo índice).
+    - letras: Letras de significância na ordem de `media`.
+    - group_col, response_col: Colunas de tratamento e de resposta.
+    - titulo, eixo_x, eixo_y: Textos do gráfico.
+    - font_size: Tamanho da fonte dos rótulos e letras.
+    - fig_w, fig_h: Tamanho da figura em centímetros.
+    - dpi: Resolução da figura.
+    - modo_pontos: Modo da camada de pontos individuais (ver MODOS_PONTOS).
+    - cor_barras, modo_cor: Cores das barras (ver colorir_barras).
+    - ic: Intervalo bootstrap por tratamento (colunas IC_inf e IC_sup); se informado, substitui o ± erro padrão.
+    Retorna:
+    - Figura do matplotlib, com as referências dos elementos em fig.artistas (ver aplicar_estilo).
+    """
+    ordens = list(media.index)
+    fig, ax = nova_figura(fig_w, fig_h, dpi)
+    x = np.arange(len(media))
+    resumo = pd.DataFrame({'mean': media.values, 'SE': erro.values})
+    if ic is not None:
+        resumo[['IC_inf', 'IC_sup']] = ic.reindex(media.index)[['IC_inf', 'IC_sup']].to_numpy()
+    yerr, topo = barras_de_erro(resumo)
+    barras = list(ax.bar(x, media.values, yerr=yerr, capsize=5, color='lightblue'))
+    ax.set_ylabel(eixo_y, fontsize=float(font_size))
+    ax.set_xlabel(eixo_x, fontsize=float(font_size))
+    ax.set_title(titulo, fontsize=float(font_size))
+
+    # Adiciona letras acima das barras
+    margem = np.nanmax(topo - media.values) * 1.1 if len(x) else 0
+    for i in range(len(x)):
+        ax.text(x[i], media.values[i] + margem, letras[i],
+                ha='center', va='bottom', fontsize=float(font_size))
+    sns.despine(ax=ax)
+
+    # Pontos individuais
+    pontos_individuais(ax, data, group_col, response_col, ordens, modo_pontos)
+    if ordens:
+        ax.set_xticks(range(len(ordens)))
+        ax.set_xticklabels(ordens, rotation=45, ha='right')
+    else:
+        ax.set_xticks([])  # evita warnings se ordens estiver vazio
+
+    with medir("tight_layout"):
+        fig.tight_layout()
+    registrar_artistas(fig, ax, font_size, [barras], rotulos_padrao=(group_col, response_col))
+    colorir_barras(fig, cor_barras, modo_cor)
+    return fig
+
+
+@medido
+def criar_grafico(data: pd.DataFrame, estatisticas: dict, group_col: str, response_col: str, fator_col: str = None,
+                  titulo: str = "", eixo_x: str = "", eixo_y: str = "", font_size: float = 10.0,
+                  fig_w: float = 8.0, fig_h: float = 8.0, dpi: int = 300, modo_pontos: str = "auto",
+                  cor_barras: str = None, modo_cor: str = "paleta"):
+    """ Escolhe e monta o gráfico adequado ao teste contido em `estatisticas`.
+    Parâmetros:
+    - data: DataFrame com as observações individuais.
+    - estatisticas: Dicionário retornado por gerar_estatisticas.
+    - demais: ver grafico_dunnett, grafico_ttest e grafico_tukey.
+    Retorna:
+    - Figura do matplotlib.
+    """
+    teste = estatisticas["teste"]
+    textos = dict(titulo=titulo, eixo_x=eixo_x, eixo_y=eixo_y, fig_w=fig_w, fig_h=fig_h, dpi=dpi, modo_pontos=modo_pontos,
+                  cor_barras=cor_barras, modo_cor=modo_cor)
+    if teste not in ("dunnett", "t-test", "tukey"):
+        raise ValueError(f"Teste desconhecido: {teste}")
+    with contexto_fonte(font_size):
+        if teste == "dunnett":
+            fig = grafico_dunnett(data, estatisticas["resumo"], estatisticas["ordem"], group_col, response_col,
+                                  font_size=font_size, **textos)
+        elif teste == "t-test":
+            fig = grafico_ttest(data, estatisticas["resumo"], estatisticas["ordem"], group_col, fator_col, response_col,
+                                font_size=font_size, **textos)
+        else:
+            fig = grafico_tukey(data, estatisticas["media"], estatisticas["erro"], estatisticas["letras"], group_col, response_col,
+                                font_size=font_size, ic=estatisticas.get("ic"), **textos)
+    fixar_fonte(fig)
+    return fig
+
+
+# Pequenos múltiplos (um painel por resposta) do modo de várias respostas
+PAINEIS_POR_FIGURA = 16
+COLUNAS_PAINEIS = 4
+
+
+@medido
+def graficos_respostas(resultado: dict, group_col: str, fator_col: str = None, eixo_y: str = "",
+                       font_size: float = 8.0, painel_w: float = 5.0, painel_h: float = 4.5, dpi: int = 300,
+                       por_figura: int = PAINEIS_POR_FIGURA, colunas: int = COLUNAS_PAINEIS,
+                       cor_barras: str = None, respostas: list = None) -> list:
+    """ Monta os pequenos múltiplos do modo de várias respostas: um painel de barras (média ± EP) por
+    resposta, com a significância pelo p-valor ajustado por Benjamini-Hochberg (asteriscos no Dunnett e no
+    teste t, letras no Tukey). Sem pontos individuais nem seaborn, para que centenas de painéis saiam rápido.
+    Parâmetros:
+    - resultado: Dicionário retornado por estatistica.analisar_respostas.
+    - group_col, fator_col: Colunas de grupo e de fator (apenas teste t).
+    - eixo_y: Rótulo do eixo y da primeira coluna de painéis.
+    - font_size: Tamanho da fonte.
+    - painel_w, painel_h: Tamanho de cada painel em centímetros.
+    - dpi: Resolução das figuras.
+    - por_figura, colunas: Painéis por figura (página) e por linha.
+    - cor_barras: Cor das barras (None usa a paleta Set2 por grupo).
+    - respostas: Respostas a desenhar (padrão: todas, na ordem do resultado).
+    Retorna:
+    - Lista de figuras do matplotlib (uma por página).
+    """
+    from gui.estatistica import letras_cld
+
+    teste, ordem = resultado["teste"], list(resultado["ordem"])
+    respostas = list(resultado["respostas"] if respostas is None else respostas)
+    resumos = dict(tuple(resultado["resumo"].groupby("resposta", sort=False)))
+    tabelas = dict(tuple(resultado["tabela"].groupby("resposta", sort=False)))
+    grupos = list(pd.unique(resultado["resumo"][group_col]))
+    paleta = sns.color_palette("Set2", n_colors=max(len(grupos), 1))
+
+    figuras = []
+    with contexto_fonte(font_size):
+        for inicio in range(0, len(respostas), por_figura):
+            pagina = respostas[inicio:inicio + por_figura]
+            n_col = min(colunas, len(pagina))
+            n_lin = -(-len(pagina) // n_col)
+            fig = Figure(figsize=(n_col * painel_w / 2.54, n_lin * painel_h / 2.54), dpi=dpi)
+            eixos = fig.subplots(n_lin, n_col, squeeze=False)
+            for ax in eixos.ravel()[len(pagina):]:
+                ax.set_visible(False)
+            for posicao, (resposta, ax) in enumerate(zip(pagina, eixos.ravel())):
+                resumo = resumos.get(resposta, pd.DataFrame(columns=resultado["resumo"].columns))
+                tabela = tabelas.get(resposta, pd.DataFrame(columns=resultado["tabela"].columns))
+                if teste == "t-test":
+                    _painel_ttest(ax, resumo, tabela, ordem, group_col, fator_col or group_col, grupos, paleta, cor_barras, font_size)
+                else:
+                    resumo = resumo.set_index(group_col).reindex(ordem)
+                    x = np.arange(len(ordem))
+                    cores = [cor_barras] * len(ordem) if cor_barras else [paleta[grupos.index(g) % len(paleta)] for g in ordem]
+                    ax.bar(x, resumo['mean'], yerr=resumo['SE'], color=cores, width=0.7, capsize=2, linewidth=0.4,
+                           error_kw={"elinewidth": 0.6})
+                    topo = (resumo['mean'] + resumo['SE'].fillna(0)).to_numpy()
+                    if teste == "dunnett":
+                        marcados = dict(zip(tabela['group2'], tabela['reject']))
+                        rotulos = ["*" if marcados.get(g, False) else "" for g in ordem]
+                    else:
+                        rotulos = letras_cld(resumo['mean'].dropna(), tabela).reindex(ordem).fillna("").tolist()
+                    for i, rotulo in enumerate(rotulos):
+                        if rotulo and np.isfinite(topo[i]):
+                            ax.text(i, topo[i], rotulo, ha='center', va='bottom', fontsize=font_size)
+                    ax.set_xticks(x)
+                    ax.set_xticklabels(ordem, rotation=45, ha='right')
+                ax.set_title(str(resposta), fontsize=font_size)
+                ax.tick_params(labelsize=font_size)  # ver registrar_artistas
+                ax.margins(y=0.15)
+                if posicao % n_col == 0:
+                    ax.set_ylabel(eixo_y)
+                sns.despine(ax=ax)
+            topo = 1.0
+            if teste == "t-test":
+                # os grupos são os mesmos em todos os painéis: uma legenda só, acima deles
+                fig.legend(*eixos[0, 0].get_legend_handles_labels(), loc="upper center", ncol=2, frameon=False,
+                           fontsize=font_size)
+                topo = 1 - 0.8 / (n_lin * painel_h)
+            with medir("tight_layout"):
+                fig.tight_layout(rect=(0, 0, 1, topo))
+            fixar_fonte(fig)
+            figuras.append(fig)
+    return figuras
+
+
+def _painel_ttest(ax, resumo: pd.DataFrame, tabela: pd.DataFrame, ordem: list, group_col: str, chave_fator: str,
+                  grupos: list, paleta, cor_barras: str, font_size: float):
+    """ Painel do teste t em graficos_respostas: um par de barras por nível do fator e asterisco nos níveis significativos. """
+    for g, grupo in enumerate(grupos[:2]):
+        linhas = resumo[resumo[group_col] == grupo]
+        if chave_fator != group_col:
+            linhas = linhas.set_index(chave_fator).reindex(ordem)
+        cor = _tom_claro(cor_barras, 0.5 * g) if cor_barras else paleta[g % len(paleta)]
+        deslocamento = -0.2 if g == 0 else 0.2
+        x = np.arange(len(linhas)) + deslocamento if chave_fator != group_col else np.array([deslocamento])
+        ax.bar(x, linhas['mean'], yerr=linhas['SE'], width=0.4, color=cor, capsize=2, linewidth=0.4,
+               error_kw={"elinewidth": 0.6}, label=str(grupo))
+    topo = (resumo['mean'] + resumo['SE'].fillna(0)).max()
+    marcados = dict(zip(tabela[chave_fator], tabela['significance'].where(tabela['reject'], "")))
+    for i, nivel in enumerate(ordem):
+        if marcados.get(nivel) and np.isfinite(topo):
+            ax.text(i, topo, marcados[nivel], ha='center', va='bottom', fontsize=font_size)
+    ax.set_xticks(range(len(ordem)))
+    ax.set_xticklabels(ordem, rotation=45, ha='right')
+
+
+def salvar_grafico(fig, caminho: str, ext: str, dpi: int = None):
+    """ Salva a figura no formato indicado.
+    Parâmetros:
+    - fig: Figura do matplotlib.
+    - caminho: Caminho do arquivo de saída.
+    - ext: Formato (svg, tiff, png, pdf...).
+    - dpi: Resolução; se None usa a da figura.
+    Para vários formatos da mesma figura use exportacao.exportar.
+    """
+    fig.savefig(caminho, format=ext, dpi=dpi or fig.dpi, bbox_inches="tight", **opcoes_formato(ext))
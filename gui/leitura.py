@@ -0,0 +1,177 @@
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# Linhas lidas por bloco: a cada bloco os valores viram arrays e o progresso é informado
+BLOCO_LINHAS = 20_000
+
+
+def listar_abas(caminho: str) -> list:
+    """ Nomes das abas da planilha, sem ler o conteúdo. """
+    if caminho.lower().endswith(".xls"):
+        with pd.ExcelFile(caminho) as excel:
+            return list(excel.sheet_names)
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def _nomes_colunas(cabecalho) -> list:
+    """ Nomes das colunas como o pandas faria: células vazias viram "Unnamed: i" e repetidos ganham ".1", ".2"... """
+    nomes, vistos = [], {}
+    for i, nome in enumerate(cabecalho):
+        nome = f"Unnamed: {i}" if nome is None else nome
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        vistos.setdefault(nome, 0)
+        nomes.append(nome)
+    return nomes
+
+
+def ler_cabecalho(caminho: str, aba: str) -> list:
+    """ Lê apenas a primeira linha da aba (nomes das colunas), sem percorrer os dados. """
+    if caminho.lower().endswith(".xls"):
+        return pd.read_excel(caminho, sheet_name=aba, nrows=0).columns.tolist()
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        linha = next(wb[aba].iter_rows(min_row=1, max_row=1, values_only=True), ())
+        return _nomes_colunas(linha)
+    finally:
+        wb.close()
+
+
+def _bloco_para_series(valores: list) -> pd.Series:
+    """ Converte os valores de um bloco em Series, com o tipo inferido pelo pandas. """
+    return pd.Series(valores, dtype=None if valores else object)
+
+
+def ler_colunas(caminho: str, aba: str, colunas: list = None, tamanho_bloco: int = BLOCO_LINHAS, progresso=None) -> pd.DataFrame:
+    """
+    Lê uma aba percorrendo as linhas com openpyxl em modo read_only, guardando só as colunas pedidas.
+    Os valores são convertidos em arrays a cada `tamanho_bloco` linhas, então o pico de memória é o do
+    resultado mais um bloco, e não o da planilha inteira como objetos Python.
+    Parâmetros:
+    - caminho: Caminho do arquivo Excel (.xls é lido pelo pandas, sem streaming).
+    - aba: Nome da aba.
+    - colunas: Nomes das colunas a ler (None para todas).
+    - tamanho_bloco: Linhas por bloco.
+    - progresso: Função progresso(fracao, mensagem) chamada a cada bloco (pode levantar exceção para cancelar).
+    Retorna:
+    - DataFrame com as colunas pedidas, na ordem da planilha. Linhas vazias no fim da aba são descartadas;
+      uma linha só conta como vazia se todas as células dela estiverem vazias (não só as das colunas pedidas),
+      então leituras de colunas diferentes da mesma aba têm sempre as mesmas linhas e podem ser juntadas.
+    """
+    if caminho.lower().endswith(".xls"):
+        # a aba inteira, para que as linhas descartadas no fim não dependam das colunas pedidas
+        df = pd.read_excel(caminho, sheet_name=aba)
+        if colunas is None:
+            return df
+        faltando = [c for c in colunas if c not in df.columns]
+        if faltando:
+            raise KeyError(f"Colunas não encontradas na aba '{aba}': {faltando}")
+        return df[[c for c in df.columns if c in colunas]]
+
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[aba]
+        linhas = ws.iter_rows(values_only=True)
+        nomes = _nomes_colunas(next(linhas, ()))
+        if colunas is None:
+            indices = list(range(len(nomes)))
+        else:
+            faltando = [c for c in colunas if c not in nomes]
+            if faltando:
+                raise KeyError(f"Colunas não encontradas na aba '{aba}': {faltando}")
+            indices = sorted({nomes.index(c) for c in colunas})
+        total = (ws.max_row or 0) - 1  # pode ser desconhecido em planilhas sem dimensão gravada
+
+        blocos = [[] for _ in indices]
+        atual = [[] for _ in indices]
+        lidas = ultima_com_valor = 0
+        for linha in linhas:
+            lidas += 1
+            tamanho = len(linha)
+            for lista, i in zip(atual, indices):
+                lista.append(linha[i] if i < tamanho else None)
+            if any(valor is not None for valor in linha):
+                ultima_com_valor = lidas
+            if indices and len(atual[0]) >= tamanho_bloco:
+                for lista_blocos, lista in zip(blocos, atual):
+                    lista_blocos.append(_bloco_para_series(lista))
+                atual = [[] for _ in indices]
+                if progresso:
+                    fracao = lidas / total if total > 0 else 0.0
+                    progresso(min(fracao, 1.0), f"{lidas} linhas lidas")
+        for lista_blocos, lista in zip(blocos, atual):
+            lista_blocos.append(_bloco_para_series(lista))
+    finally:
+        wb.close()
+
+    dados = {}
+    for i, partes in zip(indices, blocos):
+        # blocos com tipos diferentes (ex.: um só com vazios) são unidos como object; infer_objects refaz o tipo
+        serie = pd.concat(partes, ignore_index=True).infer_objects() if len(partes) > 1 else partes[0]
+        dados[nomes[i]] = serie.iloc[:ultima_com_valor].reset_index(drop=True)
+    if progresso:
+        progresso(1.0, f"{ultima_com_valor} linhas lidas")
+    return pd.DataFrame(dados, columns=[nomes[i] for i in indices])
+
+
+# Colunas de texto com até esta fração de valores distintos viram category
+FRACAO_CATEGORIAS = 0.5
+
+
+def _cabe_em_float32(valores) -> bool:
+    """ Indica se os valores float64 voltam idênticos depois de passar por float32 (nenhum valor muda). """
+    valores = np.asarray(valores, dtype=np.float64)
+    with np.errstate(over="ignore"):
+        convertidos = valores.astype(np.float32).astype(np.float64)
+    return bool(np.array_equal(convertidos, valores, equal_nan=True))
+
+
+def compactar_tipos(df: pd.DataFrame, fracao_categorias: float = FRACAO_CATEGORIAS) -> tuple:
+    """
+    Reduz a memória do DataFrame logo após a leitura: texto com poucos valores distintos vira category
+    (com as categorias na ordem em que aparecem, a mesma das análises), float64 vira float32 só quando
+    todos os valores são representados exatamente (ex.: 0.5, 1.25, inteiros pequenos; medidas como 123456.789
+    continuam float64, para não alterar médias e p-valores) e inteiros usam o menor tipo que os comporta.
+    Parâmetros:
+    - df: DataFrame lido da planilha (não é alterado).
+    - fracao_categorias: Fração máxima de valores distintos (sobre as linhas) para virar category.
+    Retorna:
+    - (DataFrame compactado, relatório) onde o relatório é um dicionário com "antes" e "depois" (bytes)
+      e "colunas" ({nome: (tipo antigo, tipo novo)} das colunas convertidas).
+    """
+    antes = int(df.memory_usage(deep=True).sum())
+    colunas, convertidas = {}, {}
+    for nome in df.columns:
+        serie = df[nome]
+        nova = serie
+        if pd.api.types.is_float_dtype(serie.dtype) and serie.dtype == np.float64:
+            if _cabe_em_float32(serie.to_numpy()):
+                nova = serie.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(serie.dtype) and not pd.api.types.is_extension_array_dtype(serie.dtype):
+            nova = pd.to_numeric(serie, downcast="integer")
+        elif pd.api.types.is_object_dtype(serie.dtype) or pd.api.types.is_string_dtype(serie.dtype):
+            codigos, categorias = pd.factorize(serie)
+            textos = all(isinstance(c, str) for c in categorias)
+            if textos and len(serie) and len(categorias) <= fracao_categorias * len(serie):
+                nova = pd.Series(pd.Categorical.from_codes(codigos, categories=categorias), index=serie.index, name=nome)
+        if nova.dtype != serie.dtype:
+            convertidas[nome] = (str(serie.dtype), str(nova.dtype))
+        colunas[nome] = nova
+    compacto = pd.DataFrame(colunas, index=df.index, columns=df.columns, copy=False)
+    depois = int(compacto.memory_usage(deep=True).sum())
+    return compacto, {"antes": antes, "depois": depois, "colunas": convertidas}
+
+
+def descrever_economia(relatorio: dict) -> str:
+    """ Texto curto com a memória economizada por compactar_tipos (para a barra de status). """
+    antes, depois = relatorio["antes"], relatorio["depois"]
+    if not relatorio["colunas"] or antes <= 0:
+        return f"{antes / 1024 ** 2:.1f} MB (sem conversões)"
+    return (f"{antes / 1024 ** 2:.1f} MB -> {depois / 1024 ** 2:.1f} MB "
+            f"({100 * (1 - depois / antes):.0f}% a menos, {len(relatorio['colunas'])} colunas convertidas)")
@@ -1,26 +1,225 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
 import customtkinter as ctk
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import matplotlib.ticker as ticker
 
-from tkinter import filedialog, ttk, colorchooser
-from typing import List, Optional
+from tkinter import filedialog, ttk, colorchooser, TclError
+from typing import TYPE_CHECKING, List, Optional
 
+# Só o necessário para abrir a janela: pandas, estatística, gráficos e leitura de Excel são importados
+# na primeira vez que forem usados (ou antes, por aquecer_modulos, em segundo plano)
 from gui.widgets import *
-from gui.estatistica import *
+from gui.opcoes import MODOS_PONTOS, MODOS_COR, INTERVALOS, P_VALORES
+from gui.exportacao import FORMATOS, descrever_exportacao, dpi_para_formato, encerrar as encerrar_exportacao
+from gui.tarefas import Agendador
+from gui.estado import Estado
+from gui import desempenho
+from gui.desempenho import medir
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from gui.estatistica import Estatiscas
+
+# Módulos carregados em segundo plano logo depois de a janela aparecer, na ordem de uso provável
+MODULOS_AQUECIMENTO = ("pandas", "gui.leitura", "gui.cache", "gui.estatistica", "gui.graficos",
+                       "matplotlib.backends.backend_agg")
+# Módulos que não deveriam estar carregados quando a janela aparece (conferido por medir_inicio)
+MODULOS_PESADOS = ("pandas", "numpy", "scipy", "matplotlib", "seaborn", "openpyxl")
+
+
+def aquecer_modulos(modulos=MODULOS_AQUECIMENTO) -> dict:
+    """ Importa `modulos` (normalmente em uma thread de fundo) para que o primeiro uso não espere por eles.
+    Retorna:
+    - {módulo: segundos} com o tempo de importação de cada um (0 se já estava carregado).
+    """
+    tempos = {}
+    for nome in modulos:
+        inicio = time.perf_counter()
+        importlib.import_module(nome)
+        tempos[nome] = round(time.perf_counter() - inicio, 3)
+    return tempos
+
+
+def montar_figura(tarefa, motor, params, dpi):
+    """ Calcula as estatísticas e monta a figura na resolução `dpi` (sem gravar nada).
+    Parâmetros:
+    - tarefa: Tarefa do Agendador (progresso e cancelamento).
+    - motor: Estatiscas da aba e colunas selecionadas (MainWindow.motor_estatistico).
+    - params: Dicionário gerado por MainWindow.parametros_analise.
+    - dpi: Resolução da figura.
+    Retorna:
+    - (estatisticas, fig)
+    """
+    tarefa.progresso(0.05, "Calculando estatísticas")
+    with medir("estatísticas"):
+        estatisticas = motor.estatisticas(
+            params["teste"], alpha=params["alpha"], intervalo=params["intervalo"], p_valor=params["p_valor"],
+            reamostras=params["reamostras"], semente=params["semente"],
+            progresso=lambda fracao, mensagem: tarefa.progresso(0.05 + 0.45 * fracao, f"Reamostragem: {mensagem}"))
+    data = motor.data
+
+    tarefa.progresso(0.5, "Montando o gráfico")
+    from gui.graficos import criar_grafico
+    fig = criar_grafico(
+        data,
+        estatisticas,
+        group_col=params["group_col"],
+        response_col=params["response_col"],
+        fator_col=params["fator_col"],
+        titulo=params["titulo"],
+        eixo_x=params["eixo_x"],
+        eixo_y=params["eixo_y"],
+        font_size=params["font_size"],
+        fig_w=params["fig_w"],
+        fig_h=params["fig_h"],
+        dpi=dpi,
+        modo_pontos=params["modo_pontos"],
+        cor_barras=params["cor_barras"],
+        modo_cor=params["modo_cor"]
+    )
+    return estatisticas, fig
+
+
+def tarefa_previa(tarefa, motor, params):
+    """ Monta a prévia do gráfico na resolução da tela, fora da thread do Tk.
+    O desenho em si é feito pelo FigureCanvasTkAgg, na thread do Tk, ao exibir a figura.
+    Retorna:
+    - (estatisticas, fig)
+    """
+    with medir(f"Prévia ({params['teste']})"):
+        return montar_figura(tarefa, motor, params, params["dpi_tela"])
+
+
+def tarefa_exportar(tarefa, motor, params):
+    """ Monta o gráfico uma vez e grava todos os formatos escolhidos, fora da thread do Tk.
+    A figura não é ligada a nenhum widget; cada formato é gravado em um processo de trabalho (exportacao.exportar).
+    Retorna:
+    - (estatisticas, relatorio) com o relatório de tempo e tamanho de cada arquivo
+    """
+    from gui.exportacao import exportar
+
+    with medir(f"Exportação ({', '.join(params['formatos'])})"):
+        estatisticas, fig = montar_figura(tarefa, motor, params, params["dpi"])
+        tarefa.progresso(0.6, f"Gravando {', '.join(params['formatos'])}")
+        relatorio = exportar(fig, params["arquivo_base"], params["formatos"],
+                             progresso=lambda fracao, mensagem: tarefa.progresso(0.6 + 0.4 * fracao, mensagem))
+    return estatisticas, relatorio
+
+
+def montar_respostas(tarefa, motor, params):
+    """ Executa o teste em todas as respostas escolhidas (estatistica.analisar_respostas), fora da thread do Tk.
+    Parâmetros:
+    - tarefa: Tarefa do Agendador (progresso e cancelamento).
+    - motor: Estatiscas da aba (só os dados são usados).
+    - params: Dicionário gerado por MainWindow.parametros_analise, com "respostas" preenchido.
+    Retorna:
+    - O dicionário de analisar_respostas.
+    """
+    from gui.estatistica import analisar_respostas, colunas_numericas
+
+    data = motor.data
+    respostas = params["respostas"]
+    if respostas == "numericas":
+        respostas = colunas_numericas(data, excluir=(params["group_col"], params["fator_col"]))
+    tarefa.progresso(0.05, f"Calculando {len(respostas)} respostas")
+    with medir("estatísticas (várias respostas)"):
+        return analisar_respostas(data, params["teste"], params["group_col"], respostas,
+                                  fator_col=params["fator_col"] or None, control=params["control"],
+                                  alpha=params["alpha"])
+
+
+def paginas_respostas(resultado, params, dpi, respostas=None):
+    """ Pequenos múltiplos (graficos.graficos_respostas) de `respostas` com a aparência escolhida na janela. """
+    from gui.graficos import graficos_respostas
+    return graficos_respostas(resultado, params["group_col"], fator_col=params["fator_col"] or None,
+                              eixo_y=params["eixo_y"], font_size=params["font_size"], dpi=dpi,
+                              cor_barras=params["cor_barras"] if params["modo_cor"] == "única" else None,
+                              respostas=respostas)
+
+
+def tarefa_respostas(tarefa, motor, params):
+    """ Prévia do modo de várias respostas: a tabela longa e só a primeira página de pequenos múltiplos.
+    Retorna:
+    - (resultado, fig)
+    """
+    from gui.graficos import PAINEIS_POR_FIGURA
+
+    with medir(f"Prévia de várias respostas ({params['teste']})"):
+        resultado = montar_respostas(tarefa, motor, params)
+        tarefa.progresso(0.6, "Montando os gráficos")
+        fig, = paginas_respostas(resultado, params, params["dpi_tela"],
+                                 respostas=resultado["respostas"][:PAINEIS_POR_FIGURA])
+    return resultado, fig
+
+
+def tarefa_exportar_respostas(tarefa, motor, params):
+    """ Grava a tabela longa (base_respostas.csv) e todas as páginas de pequenos múltiplos (base_01, base_02...),
+    uma página por vez, para que a memória não cresça com o número de respostas.
+    Retorna:
+    - (resultado, relatorio) com o relatório de todos os arquivos gravados
+    """
+    import pandas as pd
+    from gui.exportacao import exportar
+    from gui.graficos import PAINEIS_POR_FIGURA
+
+    base = params["arquivo_base"]
+    with medir(f"Exportação de várias respostas ({', '.join(params['formatos'])})"):
+        resultado = montar_respostas(tarefa, motor, params)
+        resultado["tabela"].to_csv(f"{base}_respostas.csv", index=False)
+        respostas = resultado["respostas"]
+        inicios = range(0, len(respostas), PAINEIS_POR_FIGURA)
+        relatorios = []
+        for k, inicio in enumerate(inicios, start=1):
+            tarefa.progresso(0.3 + 0.7 * (k - 1) / len(inicios), f"Página {k} de {len(inicios)}")
+            fig, = paginas_respostas(resultado, params, params["dpi"],
+                                     respostas=respostas[inicio:inicio + PAINEIS_POR_FIGURA])
+            relatorios.append(exportar(fig, f"{base}_{k:02d}", params["formatos"]))
+    return resultado, pd.concat(relatorios, ignore_index=True)
+
+
+def tarefa_ler(tarefa, caminho, aba, colunas):
+    """ Lê `colunas` da aba (cache em memória, cache em disco ou planilha), fora da thread do Tk. """
+    from gui.cache import ler_aba
+
+    with medir(f"Leitura ({aba})"):
+        return ler_aba(caminho, aba, colunas=colunas, progresso=tarefa.progresso)
+
+
+# Parâmetros que mudam o conteúdo do gráfico (além da aba e das colunas): alterá-los exige refazer a prévia
+PARAMETROS_DADOS = ("teste", "alpha", "modo_pontos", "dpi_tela", "intervalo", "p_valor", "reamostras", "semente",
+                    "respostas")
+# Parâmetros só de aparência, aplicados na prévia existente por graficos.aplicar_estilo
+PARAMETROS_ESTILO = ("titulo", "eixo_x", "eixo_y", "font_size", "fig_w", "fig_h", "cor_barras", "modo_cor")
 
 
 class MainWindow(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.df: Optional[pd.DataFrame] = None
+        # Colunas da aba atual: conhecidas pelo cabeçalho antes de os dados terminarem de carregar
+        self.colunas: List[str] = []
+        # Leituras de colunas em andamento (canceladas ao trocar de aba), colunas sendo lidas
+        # e funções à espera delas (garantir_colunas)
+        self.tarefas_leitura = []
+        self.colunas_pendentes = set()
+        self.colunas_a_ler = []
+        self.aguardando_colunas = []
+        # Memória antes/depois da compactação de tipos das colunas lidas da aba atual
+        self.compactacao = {"antes": 0, "depois": 0, "colunas": {}}
         self.filename: Optional[str] = None
         self.sheetnames: List[str] = []
         self.current_sheet: Optional[str] = None
+        # Motor de estatísticas da aba/colunas atuais (recriado quando elas mudam)
+        self.motor: Optional[Estatiscas] = None
 
         # Plot params
-        self.color_mode_var = ctk.StringVar(value="única")
+        self.color_mode_var = ctk.StringVar(value="paleta")
         self.title_text = ctk.StringVar(value="")
         self.xlabel_text = ctk.StringVar(value="Tratamento")
         self.ylabel_text = ctk.StringVar(value="Média ± EP")
@@ -28,7 +227,44 @@ class MainWindow(ctk.CTk):
         self.font_size = ctk.DoubleVar(value=10.0)
         self.fig_w = ctk.DoubleVar(value=8.0)
         self.fig_h = ctk.DoubleVar(value=8.0)
-        self.save_format = ctk.StringVar(value="svg")
+        # Formatos gravados por "Salvar imagem" (todos a partir da mesma figura)
+        self.formatos_exportar = {ext: ctk.BooleanVar(value=ext == "svg") for ext in FORMATOS}
+        # Camada de pontos individuais (ver graficos.MODOS_PONTOS)
+        self.modo_pontos = ctk.StringVar(value="auto")
+        # Barras de erro e p-valores (ver opcoes.INTERVALOS e P_VALORES) e parâmetros da reamostragem
+        self.intervalo = ctk.StringVar(value="ep")
+        self.p_valor = ctk.StringVar(value="teste")
+        self.reamostras = ctk.IntVar(value=10_000)
+        self.semente = ctk.IntVar(value=0)
+        # Modo de várias respostas: o mesmo teste em cada coluna escolhida na lista (chave "respostas" do
+        # estado) ou em todas as colunas numéricas
+        self.varias_respostas = ctk.BooleanVar(value=False)
+        self.todas_numericas = ctk.BooleanVar(value=False)
+        # Prévia exibida: figura, motor e parâmetros que dependem dos dados (ver previa_reaproveitavel)
+        self.previa = None
+        self._estilo_agendado = None
+        # Colunas escolhidas nos seletores (mantidas quando os seletores são refeitos) e controle do Dunnett
+        self.group_col = ctk.StringVar(value="")
+        self.fator_col = ctk.StringVar(value="")
+        self.response_col = ctk.StringVar(value="")
+        self.control_var = ctk.StringVar(value="")
+        # Entradas com que os seletores e o menu de controle foram montados (ver atualizar_variaveis)
+        self.variaveis_montadas = None
+        self.controles_montados = None
+
+        # Limite de memória do cache de abas já lidas (MB)
+        self.cache_mb = ctk.IntVar(value=512)
+        # Limite do cache colunar em disco (MB)
+        self.cache_disco_mb = ctk.IntVar(value=2048)
+        # Limite do cache de resultados das estatísticas em disco (MB)
+        self.cache_resultados_mb = ctk.IntVar(value=256)
+        # Medição de desempenho (gui.desempenho): desligada por padrão; log JSON-lines opcional
+        self.medir_desempenho = ctk.BooleanVar(value=False)
+        self.log_desempenho = ctk.StringVar(value="")
+
+        # Executa análises e renderizações fora da thread do Tk
+        self.agendador = Agendador(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.title("Grafitics: estatística personalizada em gráficos")
         self.geometry(None)
@@ -52,6 +288,96 @@ class MainWindow(ctk.CTk):
         self.tabview.add(self.tab_configuracoes, text="Settings")
         self.setup_settings_tab(self.tab_configuracoes)
 
+        # Variáveis do Tk e o que cada mudança refaz: tudo registrado uma única vez, aqui
+        self.estado = Estado(self)
+        self.ligar_estado()
+
+        # Pandas, estatística e gráficos são carregados em segundo plano assim que a janela aparece
+        self.tempos_aquecimento = {}
+        self._thread_aquecimento = None
+        self.after_idle(self.iniciar_aquecimento)
+
+    def ligar_estado(self):
+        """ Liga as variáveis da janela ao Estado e assina o que deve ser refeito quando elas mudam.
+        Mudanças no mesmo evento viram uma só atualização (no after_idle), e cada função só refaz a parte
+        da tela cujas entradas mudaram. O alpha não refaz nada: é lido ao gerar o gráfico.
+        """
+        for chave, var in {
+            "aba": self.sheet_var, "teste": self.testes_var,
+            "group_col": self.group_col, "fator_col": self.fator_col, "response_col": self.response_col,
+            "font_size": self.font_size, "fig_w": self.fig_w, "fig_h": self.fig_h,
+            "cor_barras": self.bar_color, "modo_cor": self.color_mode_var,
+            "cache_mb": self.cache_mb, "cache_disco_mb": self.cache_disco_mb,
+            "cache_resultados_mb": self.cache_resultados_mb,
+            "medir_desempenho": self.medir_desempenho, "log_desempenho": self.log_desempenho,
+            "varias_respostas": self.varias_respostas, "todas_numericas": self.todas_numericas,
+        }.items():
+            self.estado.ligar(chave, var)
+
+        self.estado.assinar(("arquivo", "aba"), lambda alteradas: self.load_selected_sheet())
+        self.estado.assinar(("aba", "colunas", "dados", "teste", "group_col", "fator_col", "response_col",
+                             "varias_respostas", "todas_numericas", "respostas"), self.atualizar_variaveis)
+        self.estado.assinar(("font_size", "fig_w", "fig_h", "cor_barras", "modo_cor"), self.agendar_estilo)
+        self.estado.assinar(("cache_mb", "cache_disco_mb", "cache_resultados_mb"), self.on_cache_mb_change)
+        self.estado.assinar(("medir_desempenho", "log_desempenho"), self.on_desempenho_change)
+
+    def atualizar_variaveis(self, *args):
+        """ Refaz só o que mudou nos seletores de colunas: o frame inteiro quando o teste muda a disposição
+        ou a aba tem outras colunas; o menu de controle quando muda a coluna de grupos ou ela é lida;
+        e pede as colunas escolhidas que ainda não foram carregadas.
+        """
+        layout = layout_variaveis(self.testes_var.get(), self.colunas)
+        montagem = (layout, tuple(self.colunas))
+        reconstruido = montagem != self.variaveis_montadas
+        if reconstruido:
+            build_frame_variaveis(self, self.frame_variaveis, self.colunas)
+            self.variaveis_montadas = montagem
+            self.controles_montados = None
+
+        if layout == "controle":
+            col = self.group_col.get()
+            controles = (self.filename, self.sheet_var.get(), col, self.df is not None and col in self.df.columns)
+            if controles != self.controles_montados:
+                atualizar_controles(self, self.frame_variaveis)
+                self.controles_montados = controles
+        if layout in LAYOUTS_COM_COLUNAS:
+            # lê as colunas escolhidas que ainda não estão carregadas
+            self.garantir_colunas(self.colunas_selecionadas())
+
+    def seletores_prontos(self) -> bool:
+        """ Os seletores de colunas estão montados (há colunas e um teste escolhido)? """
+        return self.variaveis_montadas is not None and self.variaveis_montadas[0] in LAYOUTS_COM_COLUNAS
+
+    def iniciar_aquecimento(self):
+        """ Importa os módulos pesados (aquecer_modulos) em uma thread de fundo, sem travar a janela. """
+        self._thread_aquecimento = threading.Thread(
+            target=lambda: self.tempos_aquecimento.update(aquecer_modulos()),
+            name="grafitics-aquecimento", daemon=True
+        )
+        self._thread_aquecimento.start()
+
+    def medir_inicio(self, inicio: float):
+        """ Modo de medição da abertura (python app.py --medir-inicio): imprime uma linha JSON com o tempo
+        até a janela ficar pronta, os módulos pesados já carregados nesse momento (deveria ser nenhum),
+        o tempo até o fim do aquecimento e o de cada módulo, e fecha a janela.
+        Parâmetros:
+        - inicio: time.perf_counter() do começo do app.py.
+        """
+        relatorio = {"carregados_na_abertura": [m for m in MODULOS_PESADOS if m in sys.modules]}
+        self.update_idletasks()
+        relatorio["janela_s"] = round(time.perf_counter() - inicio, 3)
+
+        def aguardar_aquecimento():
+            if self._thread_aquecimento is None or self._thread_aquecimento.is_alive():
+                self.after(20, aguardar_aquecimento)
+                return
+            relatorio["aquecimento_s"] = round(time.perf_counter() - inicio, 3)
+            relatorio["modulos_s"] = dict(self.tempos_aquecimento)
+            print(json.dumps(relatorio, ensure_ascii=False), flush=True)
+            self.on_close()
+
+        self.after(20, aguardar_aquecimento)
+
     def pick_color(self):
         color = colorchooser.askcolor(color=self.bar_color.get())
         if color and color[1]:
@@ -65,11 +391,17 @@ class MainWindow(ctk.CTk):
         self.main_frame.pack(fill="both", expand=True)
 
         self.left_frame = create_left_panel(self, self.main_frame, self.upload_excel)
-        self.right_frame = create_right_panel(self, self.main_frame, self.clear_entries, self.build_grafico)
+        self.right_frame = create_right_panel(self, self.main_frame, self.clear_entries, self.build_grafico, self.cancelar_tarefas,
+                                              self.salvar_imagem)
+        self.preview_frame = create_preview_frame(self.main_frame)
+        for entrada in (self.title_entry, self.eixoX_entry, self.eixoY_entry):
+            entrada.bind("<KeyRelease>", self.agendar_estilo, add="+")
         self.table_frame, self.table_scrollable = create_table_frame(parent)
 
         self.left_frame.grid(row=0, column=0, padx=10, pady=10, sticky="n")
         self.right_frame.grid(row=0, column=1, padx=10, pady=10, sticky="n")
+        self.preview_frame.grid(row=0, column=2, padx=10, pady=10, sticky="nsew")
+        self.main_frame.grid_columnconfigure(2, weight=1)
         self.table_frame.pack(padx=20, pady=(0, 20), fill="both", expand=True)
 
     def setup_settings_tab(self, parent):
@@ -81,18 +413,85 @@ class MainWindow(ctk.CTk):
         ctk.CTkButton(frm, text='Paleta…', command=self.pick_color).grid(row=1, column=2, sticky='w')
         ctk.CTkLabel(frm, text="Tamanho da fonte:").grid(row=1, column=4, sticky='w')
         ttk.Spinbox(frm, from_=10, to=24, textvariable=self.font_size, width=6).grid(row=1, column=5, sticky='w')
+        ctk.CTkLabel(frm, text="Pontos individuais:").grid(row=1, column=6, sticky='e')
+        ttk.Combobox(frm, values=list(MODOS_PONTOS), textvariable=self.modo_pontos, state="readonly", width=11).grid(row=1, column=7, sticky='w')
 
         ctk.CTkLabel(frm, text="Tamanho (cm):").grid(row=2, column=0, sticky='w')
         ttk.Spinbox(frm, from_=3.0, to=16.0, increment=1, textvariable=self.fig_w, width=6).grid(row=2, column=1, sticky='w')
         ttk.Spinbox(frm, from_=3.0, to=16.0, increment=1, textvariable=self.fig_h, width=6).grid(row=2, column=2, sticky='w')
 
         ctk.CTkLabel(frm, text="Modo de cor:").grid(row=2, column=3, sticky='e')
-        self.color_mode_menu = ctk.CTkOptionMenu(frm,values=["alternadas", "única"],variable=self.color_mode_var)
+        self.color_mode_menu = ctk.CTkOptionMenu(frm,values=list(MODOS_COR),variable=self.color_mode_var)
         self.color_mode_menu.grid(row=2, column=4, padx=10, pady=5, sticky="w")
 
         ctk.CTkLabel(frm, text="Salvar como:").grid(row=2, column=5, sticky='e')
-        ttk.Combobox(frm, values=["svg","tiff"], textvariable=self.save_format, width=8).grid(row=2, column=6, sticky='w')
-        ctk.CTkButton(frm, text="Salvar imagem", command=self.build_grafico).grid(row=2, column=7, padx=6)
+        frm_formatos = ctk.CTkFrame(frm, fg_color="transparent")
+        frm_formatos.grid(row=2, column=6, sticky='w')
+        for ext, var in self.formatos_exportar.items():
+            ctk.CTkCheckBox(frm_formatos, text=ext, variable=var, width=60).pack(side="left")
+        ctk.CTkButton(frm, text="Salvar imagem", command=self.salvar_imagem).grid(row=2, column=7, padx=6)
+
+        ctk.CTkLabel(frm, text="Cache de planilhas (MB):").grid(row=3, column=0, sticky='w', pady=6, padx=6)
+        ttk.Spinbox(frm, from_=0, to=8192, increment=128, textvariable=self.cache_mb, width=6).grid(row=3, column=1, sticky='w')
+        ctk.CTkLabel(frm, text="Cache em disco (MB):").grid(row=3, column=3, sticky='e')
+        ttk.Spinbox(frm, from_=0, to=65536, increment=512, textvariable=self.cache_disco_mb, width=6).grid(row=3, column=4, sticky='w')
+        ctk.CTkLabel(frm, text="Cache de resultados (MB):").grid(row=3, column=5, sticky='e')
+        ttk.Spinbox(frm, from_=0, to=8192, increment=64, textvariable=self.cache_resultados_mb, width=6).grid(row=3, column=6, sticky='w')
+
+        ctk.CTkCheckBox(frm, text="Medir desempenho", variable=self.medir_desempenho).grid(row=4, column=0, sticky='w', pady=6, padx=6)
+        ctk.CTkLabel(frm, text="Log (JSON-lines):").grid(row=4, column=3, sticky='e')
+        ctk.CTkEntry(frm, textvariable=self.log_desempenho, width=260).grid(row=4, column=4, columnspan=3, sticky='we')
+        ctk.CTkButton(frm, text='Log…', command=self.escolher_log_desempenho).grid(row=4, column=7, sticky='w')
+
+        ctk.CTkLabel(frm, text="Barras de erro:").grid(row=5, column=0, sticky='w', pady=6, padx=6)
+        ctk.CTkOptionMenu(frm, values=list(INTERVALOS), variable=self.intervalo, width=110).grid(row=5, column=1, sticky='w')
+        ctk.CTkLabel(frm, text="p-valor:").grid(row=5, column=2, sticky='e')
+        ctk.CTkOptionMenu(frm, values=list(P_VALORES), variable=self.p_valor, width=110).grid(row=5, column=3, padx=6, sticky='w')
+        ctk.CTkLabel(frm, text="Reamostras:").grid(row=5, column=4, sticky='e')
+        ttk.Spinbox(frm, from_=100, to=100_000, increment=1000, textvariable=self.reamostras, width=7).grid(row=5, column=5, sticky='w')
+        ctk.CTkLabel(frm, text="Semente:").grid(row=5, column=6, sticky='e')
+        ttk.Spinbox(frm, from_=0, to=2 ** 31 - 1, increment=1, textvariable=self.semente, width=7).grid(row=5, column=7, sticky='w')
+
+        # Últimas operações medidas (leitura, prévia, exportação...), com a duração de cada etapa
+        self.painel_desempenho = ctk.CTkTextbox(parent, height=320, font=("Courier", 12), wrap="none")
+        self.painel_desempenho.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        self.tabview.bind("<<NotebookTabChanged>>", lambda evento: self.atualizar_painel_desempenho(), add="+")
+        self.atualizar_painel_desempenho()
+
+    def on_cache_mb_change(self, *args):
+        from gui.cache import cache_abas, cache_colunar, cache_resultados
+        try:
+            cache_abas.definir_limite(self.cache_mb.get())
+            cache_colunar.definir_limite(self.cache_disco_mb.get())
+            cache_resultados.definir_limite(self.cache_resultados_mb.get())
+        except Exception:
+            pass  # valor incompleto enquanto o usuário digita
+
+    def on_desempenho_change(self, *args):
+        desempenho.ativar(self.medir_desempenho.get(), self.log_desempenho.get().strip() or None)
+        self.atualizar_painel_desempenho()
+
+    def escolher_log_desempenho(self):
+        caminho = filedialog.asksaveasfilename(
+            title="Log de desempenho",
+            initialfile="desempenho.jsonl",
+            defaultextension=".jsonl",
+            filetypes=[("JSON lines", "*.jsonl")]
+        )
+        if caminho:
+            self.log_desempenho.set(caminho)
+
+    def atualizar_painel_desempenho(self, quantidade: int = 5):
+        """ Mostra na aba Settings as `quantidade` últimas operações medidas, da mais recente para a mais antiga. """
+        if not desempenho.ativo():
+            texto = "Medição desligada (marque \"Medir desempenho\")."
+        else:
+            relatorios = desempenho.ultimos_relatorios(quantidade)[::-1]
+            texto = "\n\n".join(f"{r['data']}\n{desempenho.formatar(r)}" for r in relatorios) or desempenho.formatar(None)
+        self.painel_desempenho.configure(state="normal")
+        self.painel_desempenho.delete("1.0", "end")
+        self.painel_desempenho.insert("1.0", texto)
+        self.painel_desempenho.configure(state="disabled")
 
     def upload_excel(self):
         """ Abre um diálogo para selecionar um arquivo Excel e carrega suas abas.
@@ -104,324 +503,413 @@ class MainWindow(ctk.CTk):
         )
         if file_path:
             try:
-                self.excel_file = pd.ExcelFile(file_path)
-                sheets = self.excel_file.sheet_names
+                # Só os nomes das abas: o conteúdo é lido aba a aba, em segundo plano
+                from gui.leitura import listar_abas
+                sheets = listar_abas(file_path)
 
                 # Atualiza o OptionMenu com as abas
                 self.sheet_menu.configure(values=sheets)
-                self.sheet_var.set(sheets[0])  # Seleciona a primeira aba por padrão
-                
-                # Carrega os dados da aba selecionada
-                self.load_selected_sheet(self.excel_file)
-
-                # retorna os valores da 1 coluna com excecao da linha 1
-
-
-                # Cria variáveis e widgets para as colunas
-                build_frame_variaveis(self, self.frame_variaveis, self.df.columns.tolist())
-
-                # Associa mudança de aba ao carregamento dos dados
-                def on_sheet_change(choice):
-                    self.load_selected_sheet(self.excel_file)
-                    build_frame_variaveis(self, self.frame_variaveis, self.df.columns.tolist())
-
-                self.sheet_var.trace_add("write", lambda *args: on_sheet_change(self.sheet_var.get()))
+                # Seleciona a primeira aba por padrão; o Estado carrega a aba uma vez só, mesmo que o
+                # arquivo e a aba mudem juntos (ou que seja o mesmo arquivo, aberto de novo)
+                self.sheet_var.set(sheets[0])
+                # só agora, com as abas lidas: um arquivo ilegível deixa a planilha anterior intacta
+                self.filename = file_path
+                self.estado.definir(arquivo=file_path)
+                self.estado.tocar("arquivo")
 
             except Exception as e:
-                display_table(self.table_scrollable, pd.DataFrame({"Erro": [str(e)]}))
+                self.mostrar_mensagem(str(e), "Erro")
 
-    def load_selected_sheet(self, excel_file):
+    def load_selected_sheet(self):
         """ Carrega a aba selecionada do arquivo Excel e exibe os dados na tabela.
-        Args:
-            excel_file (pd.ExcelFile): Objeto ExcelFile contendo as abas do arquivo.
+        Só o cabeçalho é lido na hora, para montar os seletores de colunas; depois apenas as colunas
+        selecionadas são lidas pelo Agendador (em streaming, com progresso na barra de status).
+        Colunas escolhidas mais tarde são lidas quando uma análise precisar delas (garantir_colunas).
         """
         self.destroy_tabel()
         aba = self.sheet_var.get()
-        if not aba:
+        if not aba or not self.filename:
+            return
+        for tarefa in self.tarefas_leitura:
+            tarefa.cancelar()  # leituras de outra aba que ainda não terminaram
+        self.tarefas_leitura = []
+        self.colunas_pendentes = set()
+        self.colunas_a_ler = []
+        self.aguardando_colunas = []
+        self.compactacao = {"antes": 0, "depois": 0, "colunas": {}}
+        self.motor = None  # nova aba: descarta as estatísticas calculadas
+
+        from gui.cache import ler_aba, aba_em_memoria
+        from gui.leitura import ler_cabecalho
+        if aba_em_memoria(self.filename, aba):
+            self.df = ler_aba(self.filename, aba)
+            self.colunas = self.df.columns.tolist()
+            self.estado.definir(colunas=tuple(self.colunas))
+            display_table(self.table_scrollable, self.df)
+            self.somar_compactacao(self.df)
+            self.atualizar_status(1, f"{aba}: {len(self.df)} linhas | memória: {self.descrever_memoria()}")
             return
-        self.df = pd.read_excel(excel_file, sheet_name=aba, engine="openpyxl")
 
-        # Retorma a tabela
-        display_table(self.table_scrollable, self.df)
-        return
-    
-    def gerar_estatisticas(self):
-        """ Gera estatísticas resumidas e executa testes estatísticos com base nas entradas do usuário.
-        Retorna:
-            results (DataFrame): DataFrame com os resultados dos testes estatísticos.
-            order_colum (list): Lista com a ordem das colunas para o gráfico, se o teste for Dunnett.
-        """
+        self.df = None
+        self.colunas = ler_cabecalho(self.filename, aba)
+        # os seletores são refeitos (se as colunas mudaram) e pedem as colunas escolhidas (atualizar_variaveis)
+        self.estado.definir(colunas=tuple(self.colunas))
 
-        if self.testes_var.get() == "dunnett":
-            # Executa o teste de Dunnett
-            results, order_colum = run_test_dunnett(
-                self.df,
-                response_col=self.response_col.get(),
-                group_col=self.group_col.get(),
-                control=self.control_var.get(),
-                alpha=self.value_var.get()
-            )
-            
-            # Adiciona estatísticas resumidas e significância
-            results = add_significance_dunnet(
-                self.df,
-                results,
-                response_col=self.response_col.get(),
-                group_col=self.group_col.get(),
-                control=self.control_var.get(),
-                alpha=self.value_var.get()
-            )
-
-        elif self.testes_var.get() == "t-test":
-            # Verifica se o fator_col está definido
-
-            if not self.fator_col.get():
-
-                groups = self.df[self.group_col.get()].unique()
-                print(groups)
-                if len(groups) != 2:
-                    display_table(self.table_scrollable, pd.DataFrame({"Erro": ["Para o teste t, deve haver exatamente dois grupos."]}))
-                    return
-            # Executa o teste t
-
-            results = run_t_test(
-                self.df,
-                group_col=self.group_col.get(),
-                fator_col=self.fator_col.get(),
-                response_col=self.response_col.get()
-            )
-            # Adiciona significância
-
-            results, order_colum = add_significance_ttest(
-                self.df,
-                results,
-                response_col=self.response_col.get(),
-                group_col=self.group_col.get(),
-                fator_col=self.fator_col.get(),
-                alpha=self.value_var.get()
-            )
-
-        elif self.testes_var.get() == "tukey":
-            # Executa o teste de Tukey
-            results, media, erro, letras = (run_test_tukey_anova(self.df, self.group_col.get(), self.response_col.get(), self.value_var.get()))
-            display_table(self.table_scrollable, results)
-            return media, erro, letras
-            
+    def colunas_selecionadas(self) -> list:
+        """ Colunas escolhidas nos seletores (grupo, fator e resposta), sem repetições. No modo de várias
+        respostas, mais as respostas escolhidas na lista, ou todas as colunas com "Todas numéricas" (quais
+        são numéricas só se sabe depois de lê-las).
+        """
+        escolhidas = []
+        for nome in ("group_col", "fator_col", "response_col"):
+            var = getattr(self, nome, None)
+            col = var.get() if var is not None else None
+            if col and col in self.colunas and col not in escolhidas:
+                escolhidas.append(col)
+        respostas = self.respostas_escolhidas()
+        if respostas == "numericas":
+            respostas = self.colunas
+        for col in respostas or ():
+            if col in self.colunas and col not in escolhidas:
+                escolhidas.append(col)
+        return escolhidas
+
+    def respostas_escolhidas(self):
+        """ None fora do modo de várias respostas; senão "numericas" ou a tupla de colunas escolhidas na lista. """
+        if not self.varias_respostas.get():
+            return None
+        if self.todas_numericas.get():
+            return "numericas"
+        return tuple(c for c in self.estado.obter("respostas", ()) if c in self.colunas)
+
+    def garantir_colunas(self, colunas: list, depois=None):
+        """ Garante que `colunas` estejam em self.df, lendo do Excel (pelo Agendador) só as que faltam.
+        Colunas que já estão sendo lidas não são pedidas de novo.
+        Parâmetros:
+        - colunas: Colunas necessárias.
+        - depois: Função chamada (na thread do Tk) quando todas estiverem carregadas.
+        """
+        faltando = [c for c in colunas if self.df is None or c not in self.df.columns]
+        if not faltando:
+            if depois:
+                depois()
+            return
+        if depois:
+            self.aguardando_colunas.append((faltando, depois))
+        novas = [c for c in faltando if c not in self.colunas_pendentes]
+        if not novas:
+            return
+        self.colunas_pendentes.update(novas)
+        # pedidos feitos no mesmo evento do Tk (ex.: seletores recriados) viram uma única leitura do arquivo
+        if not self.colunas_a_ler:
+            self.after_idle(self.enviar_leitura)
+        self.colunas_a_ler.extend(novas)
+
+    def enviar_leitura(self):
+        """ Coloca no Agendador a leitura das colunas acumuladas por garantir_colunas. """
+        novas, self.colunas_a_ler = self.colunas_a_ler, []
+        if not novas:
+            return
+        aba = self.sheet_var.get()
 
-        else:
-            # Exibe mensagem de erro se nenhum teste for selecionado
-            results = pd.DataFrame({"": ["Selecione um teste estatístico válido."]})
-        
-        # Exibe os resultados na tabela
-        display_table(self.table_scrollable, results)
-        return results, order_colum if self.testes_var.get() == "dunnett" or self.testes_var.get() == "t-test" else None
+        def falhou(callback):
+            def tratar(valor):
+                self.colunas_pendentes.difference_update(novas)
+                callback(valor)
+            return tratar
+
+        tarefa = self.agendador.enviar(
+            tarefa_ler, self.filename, aba, novas,
+            nome=f"Lendo {aba}",
+            ao_concluir=lambda df: self.colunas_carregadas(aba, df),
+            ao_erro=falhou(self.on_tarefa_erro),
+            ao_progresso=self.on_tarefa_progresso,
+            ao_cancelar=falhou(self.on_tarefa_cancelada)
+        )
+        self.tarefas_leitura.append(tarefa)
+        self.on_tarefa_progresso(None, 0, f"Lendo {', '.join(map(str, novas))}")
+
+    def colunas_carregadas(self, aba: str, df: pd.DataFrame):
+        """ Junta as colunas lidas a self.df (na thread do Tk), exibe a tabela e chama quem esperava por elas. """
+        if aba != self.sheet_var.get():
+            return  # o usuário já trocou de aba
+        self.tarefas_leitura = [t for t in self.tarefas_leitura if not t.future.done()]
+        self.colunas_pendentes.difference_update(df.columns)
+        self.somar_compactacao(df)
+        if self.df is not None:
+            import pandas as pd
+            novas = [c for c in df.columns if c not in self.df.columns]
+            df = pd.concat([self.df, df[novas]], axis=1)
+            df = df[[c for c in self.colunas if c in df.columns]]
+        self.df = df
+        self.motor = None
+        self.estado.tocar("dados")  # o menu de controles depende dos valores da coluna de grupos
+        display_table(self.table_scrollable, self.df)
+        self.atualizar_status(1, f"{aba}: {len(df)} linhas, {len(df.columns)} de {len(self.colunas)} colunas"
+                                 f" | memória: {self.descrever_memoria()}")
+
+        prontos = [depois for faltando, depois in self.aguardando_colunas if all(c in df.columns for c in faltando)]
+        self.aguardando_colunas = [item for item in self.aguardando_colunas if item[1] not in prontos]
+        for depois in prontos:
+            depois()
+        self.atualizar_painel_desempenho()
+
+    def somar_compactacao(self, df: pd.DataFrame):
+        """ Acumula o relatório de compactação de tipos (df.attrs["compactacao"]) das colunas lidas. """
+        relatorio = df.attrs.get("compactacao")
+        if relatorio is None:  # veio do cache em disco, já compactado
+            tamanho = int(df.memory_usage(deep=True).sum())
+            relatorio = {"antes": tamanho, "depois": tamanho, "colunas": {}}
+        self.compactacao["antes"] += relatorio["antes"]
+        self.compactacao["depois"] += relatorio["depois"]
+        self.compactacao["colunas"].update(relatorio["colunas"])
+
+    def descrever_memoria(self) -> str:
+        from gui.leitura import descrever_economia
+        return descrever_economia(self.compactacao)
+
+    def motor_estatistico(self, params: dict) -> Estatiscas:
+        """ Retorna o motor de estatísticas da aba e colunas atuais, reaproveitando o anterior (e tudo o que
+        ele já calculou) enquanto a aba e as colunas forem as mesmas. Um motor em uso por uma tarefa nunca é
+        alterado: se algo mudou, um novo é criado.
+        """
+        colunas = {
+            "group_col": params["group_col"],
+            "fator_col": params["fator_col"] or None,
+            "response_col": params["response_col"],
+            "control": params["control"],
+        }
+        motor = self.motor
+        if not self.motor_atende(motor, params):
+            from gui.estatistica import Estatiscas
+            from gui.cache import cache_resultados
+            motor = Estatiscas(self.df, alpha=params["alpha"], cache=cache_resultados, **colunas)
+            self.motor = motor
+        return motor
+
+    def motor_atende(self, motor, params: dict) -> bool:
+        """ Indica se `motor` foi criado para a aba e as colunas de `params`. """
+        colunas = {
+            "group_col": params["group_col"],
+            "fator_col": params["fator_col"] or None,
+            "response_col": params["response_col"],
+            "control": params["control"],
+        }
+        return motor is not None and motor.data is self.df and all(getattr(motor, k) == v for k, v in colunas.items())
+
+    def parametros_analise(self) -> dict:
+        """ Lê das variáveis do Tk tudo o que a análise precisa, para uso fora da thread do Tk. """
+        formatos = [ext for ext, var in self.formatos_exportar.items() if var.get()]
+        return {
+            "teste": self.testes_var.get(),
+            "group_col": self.group_col.get(),
+            "response_col": self.response_col.get(),
+            "fator_col": self.fator_col.get(),
+            "control": self.control_var.get() or None,
+            "alpha": self.value_var.get(),
+            "titulo": self.title_entry.get(),
+            "eixo_x": self.eixoX_entry.get(),
+            "eixo_y": self.eixoY_entry.get(),
+            "font_size": float(self.font_size.get()),
+            "fig_w": self.fig_w.get(),
+            "fig_h": self.fig_h.get(),
+            "formatos": formatos,
+            # a figura é montada uma vez, na maior resolução pedida
+            "dpi": max((dpi_para_formato(ext) for ext in formatos), default=300),
+            "dpi_tela": self.winfo_fpixels("1i"),
+            "modo_pontos": self.modo_pontos.get(),
+            "cor_barras": self.bar_color.get(),
+            "modo_cor": self.color_mode_var.get(),
+            "intervalo": self.intervalo.get(),
+            "p_valor": self.p_valor.get(),
+            "reamostras": self.reamostras.get(),
+            "semente": self.semente.get(),
+            "respostas": self.respostas_escolhidas(),
+        }
 
     def build_grafico(self):
-        """ Gera o gráfico com base nas estatísticas calculadas e exibe na janela.
-        Verifica se o DataFrame foi carregado e se as entradas necessárias estão preenchidas.
+        """ Gera a prévia do gráfico e a exibe na aba Generate, na resolução da tela.
+        Verifica se uma planilha foi carregada e se as entradas necessárias estão preenchidas.
         Se não estiverem, exibe uma mensagem de erro na tabela.
+        O cálculo e a montagem rodam no Agendador; a janela continua respondendo. Colunas selecionadas
+        que ainda não foram lidas são carregadas antes. O arquivo em alta resolução só é gerado por
+        salvar_imagem. Se só a aparência mudou (textos, fonte, tamanho, cores), a prévia atual é alterada
+        no lugar, sem recalcular nada.
         """
-        ext = self.save_format.get()
-        dpi = 600 if ext.lower() in ('tiff','tif') else 300
-        fig_w_pol = self.fig_w.get()/2.54
-        fig_h_pol = self.fig_h.get()/2.54
-        # Verifica se o DataFrame foi carregado
-        if not hasattr(self, "df") or self.df.empty:
-            display_table(self.table_scrollable, pd.DataFrame({"": ["Nenhum DataFrame carregado."]}))
+        if self.previa_reaproveitavel():
+            self.aplicar_estilo_previa()
             return
-        # Verifica se as entradas necessárias estão preenchidas
-        """if (self.testes_var.get()=="" or self.group_col.get()=="" or self.response_col.get()=="" or self.control_var.get()==""):
-            display_table(self.table_scrollable, pd.DataFrame({"": ["Preencha todos os campos obrigatórios."]}))
-            return"""
-        
-        # Configurações iniciais
-        plt.rcParams['font.family'] = 'Arial'
-        plt.rcParams['font.size'] = float(self.font_size.get())
-
-        if self.testes_var.get() == "dunnett":
-            summary_stats, order = self.gerar_estatisticas()
-            #lembrar de remover partes redundantes do código
-            # Configurar o plot
-            plt.figure(figsize=(fig_w_pol, fig_h_pol), dpi=dpi)  # Converter cm para polegadas
-            ax = plt.gca()
-            # Barras
-            palette = sns.color_palette("Set1", n_colors=len(order))
-            sns.barplot(x=self.group_col.get(), y='mean', data=summary_stats, 
-                        errorbar='se', capsize=0.1, 
-                        width=0.3, alpha=0.8, ax=ax, order=order, linewidth=0.4, palette=palette,
-                        hue=self.group_col.get(),
-                        legend=False
-                        )
-            # Pontos individuais
-            sns.stripplot(x=self.group_col.get(), y=self.response_col.get(), data=self.df, hue=self.group_col.get(),  
-                        jitter=0.1, size=1, palette='dark:black', ax=ax, legend=False)
-            
-            # Elementos estéticos# busca a maior media para ajustar o limite do eixo y
-            y_max = summary_stats['mean'].max()
-            ax.set_ylim(0, y_max * 1.2)
-            ax.set_xticks(range(len(order)))  # Garante que o número de ticks corresponde ao número de labels
-            if order:
-                ax.set_xticks(range(len(order)))
-                ax.set_xticklabels(order, rotation=45, ha='right')
-            else:
-                ax.set_xticks([])  # evita warnings se ordens estiver vazio
-            ax.set(xlabel=self.eixoX_entry.get(), ylabel=self.eixoY_entry.get(), title=self.title_entry.get())
-            y_espaco = 0.2 * y_max * 1.2
-            ax.yaxis.set_major_locator(ticker.MultipleLocator(y_espaco))
-            ax.set_ylim(0, y_max * 1.2)
-
-            # Adicionar significância
-            for i, row in summary_stats.iterrows():
-                y_pos = row['mean'] + row['SE']
-                # Adiciona barra de erro
-                ax.errorbar(
-                    x=i,
-                    y=row['mean'],
-                    yerr=row['SE'],
-                    fmt='none',           # Não desenha marcador, só a barra de erro
-                    c='black',
-                    capsize=5,
-                    linewidth=0.4
-                )
-                # Adiciona o texto de significância
-                ax.text(i, y_pos, row['significance'], ha='center', va='bottom', size=10)
-
-            # Remover bordas
-            sns.despine()
-
-            # Salvar figura
-            plt.savefig(f"grafico_dunnet.{ext}", format=ext, bbox_inches="tight")
-            plt.tight_layout()
-            plt.show()
-
-        elif self.testes_var.get() == "t-test":
-            summary_stats, order = self.gerar_estatisticas()
-            
-            sig_map = summary_stats.set_index(self.fator_col.get())['significance'].to_dict()
-            # Configurar o plot
-            fig, ax = plt.subplots(figsize=(fig_w_pol, fig_h_pol), dpi=dpi)  # Converter cm para polegadas
-            # Gráfico de barras
-            if "control" or "Col-0" in order:
-                ordens = order
-            else:
-                ordens = sorted(summary_stats[self.fator_col.get()].unique(), key=fator_sort_key)
-            sns.barplot(
-                data=summary_stats,
-                x=self.fator_col.get(),
-                y="mean",
-                hue=self.group_col.get(),
-                ax=ax,
-                capsize=0.1,
-                palette="Set2",
-                order=ordens
-                )
-            # Pontos individuais
-            sns.stripplot(
-                        x=self.fator_col.get(),
-                        y=self.response_col.get(),
-                        data=self.df,  
-                        hue=self.group_col.get(),      # Adicione o mesmo hue do barplot
-                        order=ordens,                  # Use a mesma ordem do barplot
-                        dodge=True,     # Para separar os pontos dos grupos
-                        jitter=0.1,
-                        size=1,
-                        palette='dark:black',
-                        ax=ax
-                        )
-
-            # busca a maior media para ajustar o limite do eixo y
-            y_max = summary_stats['mean'].max()
-            ax.set_ylim(0, y_max * 1.2)
-
-            # Adiciona barras de erro e asteriscos
-            names = summary_stats[self.group_col.get()].unique()
-
-            for i, row in summary_stats.iterrows():
-                fator = row[self.fator_col.get()]
-                grupo = row[self.group_col.get()]
-                media = row['mean']
-                erro = row['SE']
-                idx_fator = ordens.index(fator)
-                deslocamento = -0.2 if grupo == names[0] else 0.2
-                x_pos = idx_fator + deslocamento
-                ax.errorbar(x=x_pos, y=media, yerr=erro, fmt='none', c='black', capsize=5, linewidth=0.4)
-
-                # Apenas um asterisco por fator (acima da barra mais alta)
-                """if grupo == names[1] and fator in sig_map:
-                    sig = sig_map[fator]
-                    if sig != 'ns':
-                        altura = summary_stats[(summary_stats[self.fator_col.get()] == fator)]["mean"].max()
-                        ax.text(idx_fator, altura + 1, sig, ha='center', va='bottom', fontsize=12, fontweight='bold')"""
-
-            for fator in ordens:
-                # Verifica se há significância para esse fator
-                sig = sig_map.get(fator, "")
-                if sig and sig != 'ns':
-                    # Pega as posições das barras no eixo x
-                    idx_fator = ordens.index(fator)
-                    x0 = idx_fator - 0.2
-                    x1 = idx_fator + 0.2
-                    y_linha = y_max * 1.1  # ajuste a altura do traço conforme necessário
-
-                    # Desenha o traço
-                    ax.plot([x0, x1], [y_linha, y_linha], c='black', linewidth=1)
-                    # Adiciona o asterisco no meio do traço
-                    ax.text(idx_fator, y_linha * 1.0025, sig, ha='center', va='bottom', fontsize=float(self.font_size.get()))
-
-            # Ajustes visuais
-            y_legenda = y_max * 1.1 * 1.02
-            y_legenda_rel = y_legenda / (y_max)
-
-            ax.set_ylabel(self.eixoY_entry.get(),fontsize=float(self.font_size.get()))
-            ax.set_xlabel(self.eixoX_entry.get(),fontsize=float(self.font_size.get()))
-            handles, labels = ax.get_legend_handles_labels()
-            ax.legend(handles[:len(names)], labels[:len(names)], loc="upper center", bbox_to_anchor=(0.5, y_legenda_rel), ncol=2, frameon=False)
-            if ordens:
-                ax.set_xticks(range(len(ordens)))
-                ax.set_xticklabels(ordens, rotation=45, ha='right')
-            else:
-                ax.set_xticks([])  # evita warnings se ordens estiver vazio
-            plt.tight_layout()
-
-            # Remover bordas
-            sns.despine()
-
-            # Salva a figura
-            plt.savefig(f"grafico_ttest.{ext}", format=ext, bbox_inches="tight")
-            plt.show()
-        
-        elif self.testes_var.get() == "tukey":
-            media, erro, letras = self.gerar_estatisticas()
-            
-            ordens = media.index
-
-            plt.figure(figsize=(fig_w_pol, fig_h_pol),dpi=dpi)
-            ax = plt.gca()
-            x = np.arange(len(media))
-            plt.bar(x, media.values, yerr=erro.values, capsize=5, color='lightblue')
-            plt.xticks(x, media.index)
-            plt.ylabel(self.eixoY_entry.get(), fontsize=float(self.font_size.get()))
-            plt.xlabel(self.eixoX_entry.get(), fontsize=float(self.font_size.get()))
-            plt.title(self.title_entry.get(), fontsize=float(self.font_size.get()))
-
-            # Adiciona letras acima das barras
-            for i in range(len(x)):
-                plt.text(x[i], media.values[i] + max(erro.values)*1.1, letras[i],
-                        ha='center', va='bottom', fontsize=float(self.font_size.get()))
-            sns.despine()
-                
-             
-            # Pontos individuais
-            sns.stripplot(x=self.group_col.get(), y=self.response_col.get(), data=self.df, hue=self.group_col.get(), jitter=0.1, size=1, ax=ax, legend=False, palette='dark:black')
-            if ordens:
-                ax.set_xticks(range(len(ordens)))
-                ax.set_xticklabels(ordens, rotation=45, ha='right')
-            else:
-                ax.set_xticks([])  # evita warnings se ordens estiver vazio
-
-            plt.tight_layout()
-            plt.savefig(f"grafico_tukey.{ext}",format=ext, dpi = dpi)
-            plt.show()
+        if self.varias_respostas.get():
+            self.enviar_analise(tarefa_respostas, self.on_respostas_prontas)
+            return
+        self.enviar_analise(tarefa_previa, self.on_previa_pronta)
+
+    def salvar_imagem(self):
+        """ Pede o nome do arquivo e grava o gráfico em todos os formatos marcados (600 dpi para TIFF,
+        300 para os demais), montando a figura uma única vez.
+        """
+        formatos = [ext for ext, var in self.formatos_exportar.items() if var.get()]
+        if not formatos:
+            self.atualizar_status(1, "Marque ao menos um formato em Settings")
+            return
+        teste = {"dunnett": "dunnet", "t-test": "ttest", "tukey": "tukey"}.get(self.testes_var.get(), "")
+        caminho = filedialog.asksaveasfilename(
+            title="Salvar gráfico como",
+            initialfile=f"grafico_{teste}" if teste else "grafico",
+            filetypes=[("Imagem", " ".join(f"*.{ext}" for ext in formatos))]
+        )
+        if not caminho:
+            return
+        base, ext = os.path.splitext(caminho)
+        varias = self.varias_respostas.get()
+        self.enviar_analise(tarefa_exportar_respostas if varias else tarefa_exportar,
+                            self.on_respostas_salvas if varias else self.on_imagem_salva,
+                            arquivo_base=base if ext.lower().lstrip(".") in FORMATOS else caminho)
+
+    def enviar_analise(self, funcao, ao_concluir, **extras):
+        """ Valida as entradas, garante as colunas necessárias e coloca `funcao(tarefa, motor, params)` na fila.
+        `extras` é acrescentado aos parâmetros (ex.: arquivo_base da exportação).
+        """
+        # Verifica se a planilha foi carregada
+        if not self.colunas:
+            self.mostrar_mensagem("Nenhum DataFrame carregado.")
+            return
+        if not self.seletores_prontos():
+            self.mostrar_mensagem("Selecione um teste estatístico válido.")
+            return
+
+        params = dict(self.parametros_analise(), **extras)
+        if params["respostas"] == ():
+            self.mostrar_mensagem("Escolha as colunas de resposta na lista (ou marque \"Todas numéricas\").")
+            return
+        self.garantir_colunas(self.colunas_selecionadas(), lambda: self.enviar_grafico(params, funcao, ao_concluir))
+
+    def enviar_grafico(self, params: dict, funcao, ao_concluir):
+        """ Coloca a análise na fila do Agendador (os dados da aba já precisam estar carregados). """
+        if self.df is None or self.df.empty:
+            self.mostrar_mensagem("Nenhum DataFrame carregado.")
+            return
+        motor = self.motor_estatistico(params)
+        self.agendador.enviar(
+            funcao, motor, params,
+            nome=f"{params['teste']} ({self.sheet_var.get()})",
+            ao_concluir=lambda resultado: ao_concluir(resultado, motor, params),
+            ao_erro=self.on_tarefa_erro,
+            ao_progresso=self.on_tarefa_progresso,
+            ao_cancelar=self.on_tarefa_cancelada
+        )
+        self.on_tarefa_progresso(None, 0, "Na fila")
+
+    def on_previa_pronta(self, resultado, motor, params):
+        estatisticas, fig = resultado
+        display_table(self.table_scrollable, estatisticas["tabela"])
+        with medir("Desenho da prévia (Tk)"):
+            mostrar_previa(self.preview_frame, fig)
+        self.previa = {"fig": fig, "motor": motor, "dados": {k: params[k] for k in PARAMETROS_DADOS},
+                       "estilo": {k: params[k] for k in PARAMETROS_ESTILO}}
+        self.atualizar_status(1, "Prévia pronta")
+        # aparência alterada enquanto a prévia era montada
+        self.atualizar_estilo()
+        self.atualizar_painel_desempenho()
+
+    def on_imagem_salva(self, resultado, motor, params):
+        estatisticas, relatorio = resultado
+        display_table(self.table_scrollable, estatisticas["tabela"])
+        self.atualizar_status(1, f"Salvo {os.path.basename(params['arquivo_base'])}: {descrever_exportacao(relatorio)}")
+        self.atualizar_painel_desempenho()
+
+    def on_respostas_prontas(self, resultado, motor, params):
+        resultado, fig = resultado
+        display_table(self.table_scrollable, resultado["tabela"])
+        with medir("Desenho da prévia (Tk)"):
+            mostrar_previa(self.preview_frame, fig)
+        self.previa = None  # a prévia de várias respostas é refeita a cada pedido
+        self.atualizar_status(1, self.descrever_respostas(resultado))
+        self.atualizar_painel_desempenho()
+
+    def on_respostas_salvas(self, resultado, motor, params):
+        resultado, relatorio = resultado
+        display_table(self.table_scrollable, resultado["tabela"])
+        self.atualizar_status(1, f"Salvo {os.path.basename(params['arquivo_base'])}_respostas.csv e "
+                                 f"{len(relatorio)} arquivos de gráficos | {self.descrever_respostas(resultado)}")
+        self.atualizar_painel_desempenho()
+
+    @staticmethod
+    def descrever_respostas(resultado) -> str:
+        tabela = resultado["tabela"]
+        significativas = tabela.loc[tabela["reject"], "resposta"].nunique()
+        return (f"{len(resultado['respostas'])} respostas, {int(tabela['reject'].sum())} comparações significativas "
+                f"(Benjamini-Hochberg) em {significativas} respostas")
+
+    def previa_reaproveitavel(self) -> bool:
+        """ A prévia exibida ainda corresponde aos dados escolhidos (aba, colunas, teste, alpha...)?
+        Nesse caso mudanças de aparência podem ser aplicadas nela sem refazer o gráfico.
+        """
+        if self.previa is None or self.df is None or not self.seletores_prontos():
+            return False
+        try:
+            params = self.parametros_analise()
+        except (TclError, ValueError):
+            return False  # valor incompleto enquanto o usuário digita
+        return (self.motor_atende(self.previa["motor"], params)
+                and all(params[k] == v for k, v in self.previa["dados"].items()))
+
+    def agendar_estilo(self, *args):
+        """ Agrupa alterações seguidas de aparência (digitação, spinbox) em uma só atualização da prévia. """
+        if self._estilo_agendado is not None:
+            self.after_cancel(self._estilo_agendado)
+        self._estilo_agendado = self.after(150, self.atualizar_estilo)
+
+    def atualizar_estilo(self):
+        self._estilo_agendado = None
+        if self.previa_reaproveitavel():
+            self.aplicar_estilo_previa()
+
+    def aplicar_estilo_previa(self):
+        """ Aplica título, rótulos, fonte, tamanho e cores atuais à prévia e a redesenha (só se algo mudou). """
+        estilo = {k: self.parametros_analise()[k] for k in PARAMETROS_ESTILO}
+        if estilo == self.previa["estilo"]:
+            return
+        from gui.graficos import aplicar_estilo
+        inicio = time.perf_counter()
+        with medir("Estilo da prévia"):
+            aplicar_estilo(self.previa["fig"], **estilo)
+        self.previa["estilo"] = estilo
+        redesenhar_previa(self.preview_frame)
+        self.atualizar_status(1, f"Prévia atualizada em {1000 * (time.perf_counter() - inicio):.0f} ms")
+        self.atualizar_painel_desempenho()
+
+    def on_tarefa_erro(self, erro):
+        self.mostrar_mensagem(str(erro), "Erro")
+        self.atualizar_status(0, "Erro")
+        self.atualizar_painel_desempenho()
+
+    def on_tarefa_cancelada(self, tarefa):
+        self.atualizar_status(0, f"Cancelado: {tarefa.nome}")
+
+    def on_tarefa_progresso(self, tarefa, fracao, mensagem):
+        nome = f"{tarefa.nome}: " if tarefa else ""
+        na_fila = len(self.agendador.ativas) - 1
+        self.atualizar_status(fracao, f"{nome}{mensagem}" + (f" (+{na_fila} na fila)" if na_fila > 0 else ""))
+
+    def atualizar_status(self, fracao, mensagem):
+        self.progress_bar.set(fracao)
+        self.status_label.configure(text=mensagem)
+
+    def cancelar_tarefas(self):
+        self.agendador.cancelar_todas()
+
+    def mostrar_mensagem(self, texto: str, coluna: str = ""):
+        """ Mostra uma mensagem (erro ou aviso) no lugar da tabela. """
+        import pandas as pd
+        display_table(self.table_scrollable, pd.DataFrame({coluna: [texto]}))
+
+    def on_close(self):
+        self.agendador.encerrar()
+        encerrar_exportacao()
+        if "gui.reamostragem" in sys.modules:  # não importa a estatística só para fechar a janela
+            sys.modules["gui.reamostragem"].encerrar()
+        self.destroy()
 
     def clear_entries(self):
         """ Limpa todas as entradas e widgets da janela.
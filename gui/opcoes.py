@@ -0,0 +1,22 @@
+""" Opções dos gráficos usadas pela interface antes de o matplotlib e o seaborn serem carregados
+(a janela é montada só com customtkinter/tkinter; ver app.py). A lógica de cada modo fica em graficos.py.
+"""
+
+# Modos da camada de pontos individuais:
+# - todos: cada observação como vetor (como antes; arquivos SVG/PDF crescem com o número de linhas)
+# - rasterizado: todas as observações, mas a camada de pontos vira imagem dentro do SVG/PDF
+# - amostra: no máximo graficos.MAX_PONTOS_GRUPO pontos por grupo, escolhidos pelos quantis (mantém a distribuição)
+# - enxame: pontos agrupados em faixas da resposta, com a largura proporcional à contagem de cada faixa
+# - auto: todos até graficos.LIMITE_VETORIAL pontos, rasterizado até graficos.LIMITE_RASTERIZADO, amostra acima disso
+MODOS_PONTOS = ("auto", "todos", "rasterizado", "amostra", "enxame")
+
+# Modos de cor das barras: "paleta" mantém as cores padrão de cada gráfico; "única" pinta todas com a
+# cor escolhida; "alternadas" alterna a cor escolhida com um tom mais claro dela
+MODOS_COR = ("paleta", "única", "alternadas")
+
+# Barras de erro: "ep" é média ± erro padrão; "bootstrap" é o intervalo percentil (1 - alpha) das médias
+# reamostradas (ver reamostragem.py)
+INTERVALOS = ("ep", "bootstrap")
+
+# p-valores: "teste" usa o do próprio teste (Dunnett, Tukey ou Welch); "permutacao" usa o teste de permutação
+P_VALORES = ("teste", "permutacao")
@@ -0,0 +1,287 @@
+""" Reamostragem vetorizada: intervalos de confiança bootstrap das médias e testes de permutação.
+
+As reamostras são geradas em lotes, como matrizes (reamostras x linhas), e reduzidas por célula com
+np.add.reduceat sobre as linhas ordenadas por célula. O número de reamostras por lote é escolhido para
+caber em `memoria_mb`; os lotes são independentes (cada um com a sua semente, derivada de
+SeedSequence(semente).spawn) e podem rodar em processos separados. O resultado depende apenas dos dados,
+de `reamostras`, `semente` e `memoria_mb`, e não do número de processos.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+REAMOSTRAS = 10_000
+# Memória de trabalho de cada lote (matrizes de índices/valores e estatísticas), em MB
+MEMORIA_MB = 256
+# Abaixo deste total de elementos (reamostras x linhas) os lotes rodam neste processo: abrir os
+# processos (spawn, com numpy) custa mais que o trabalho
+LIMITE_PROCESSOS = 50_000_000
+# Tolerância relativa ao comparar estatísticas reamostradas com a observada (arredondamento das somas
+# e do float32 usado no máximo entre muitos pares): empates contam a favor da hipótese nula
+TOLERANCIA = 1e-6
+
+_pool = None
+
+
+def _processos():
+    """ Pool de processos reaproveitado entre reamostragens (spawn: seguro com a thread do Tk ativa). """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def encerrar():
+    """ Libera os processos de reamostragem (usar ao fechar a janela). """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def tamanhos_lotes(reamostras: int, bytes_por_reamostra: int, memoria_mb: float = MEMORIA_MB) -> list:
+    """ Divide `reamostras` em lotes que cabem em `memoria_mb` (ao menos uma reamostra por lote). """
+    por_lote = max(1, int(memoria_mb * 1024 ** 2 // max(bytes_por_reamostra, 1)))
+    completos, resto = divmod(reamostras, por_lote)
+    return [por_lote] * completos + ([resto] if resto else [])
+
+
+def _executar_lotes(funcao, tamanhos: list, semente, elementos: int, processos: int = None, progresso=None) -> list:
+    """ Roda funcao(semente_do_lote, tamanho) para cada lote e devolve os resultados na ordem dos lotes.
+    Parâmetros:
+    - funcao: Função do lote (precisa ser serializável: função do módulo ou partial dela).
+    - tamanhos: Reamostras de cada lote (tamanhos_lotes).
+    - semente: Semente inteira (ou None para uma aleatória); cada lote recebe uma semente filha.
+    - elementos: Total de elementos gerados (para decidir se vale usar processos).
+    - processos: Número máximo de processos; None escolhe pelo tamanho do trabalho, 1 roda tudo aqui.
+    - progresso: Função progresso(fracao, mensagem) chamada a cada lote pronto (pode levantar exceção para cancelar).
+    """
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    if processos is None:
+        processos = (os.cpu_count() or 1) if elementos >= LIMITE_PROCESSOS else 1
+    processos = min(processos, len(tamanhos))
+
+    resultados = []
+    if processos > 1:
+        pool = _processos()
+        futuros = [pool.submit(funcao, s, b) for s, b in zip(sementes, tamanhos)]
+        try:
+            for futuro in futuros:
+                resultados.append(futuro.result())
+                if progresso:
+                    progresso(len(resultados) / len(tamanhos), f"{sum(tamanhos[:len(resultados)])} reamostras")
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+        return resultados
+
+    for s, b in zip(sementes, tamanhos):
+        resultados.append(funcao(s, b))
+        if progresso:
+            progresso(len(resultados) / len(tamanhos), f"{sum(tamanhos[:len(resultados)])} reamostras")
+    return resultados
+
+
+def ordenar_por_celula(codigos: np.ndarray, n_celulas: int, y: np.ndarray):
+    """ Linhas válidas (código >= 0 e resposta não ausente) ordenadas por célula.
+    Retorna:
+    - y_ordenado, inicio (posição da primeira linha de cada célula) e n (linhas por célula).
+    """
+    validas = (codigos >= 0) & ~np.isnan(y)
+    codigos, y = codigos[validas], y[validas]
+    ordem = np.argsort(codigos, kind="stable")
+    n = np.bincount(codigos, minlength=n_celulas)
+    inicio = np.concatenate(([0], np.cumsum(n)[:-1]))
+    return np.ascontiguousarray(y[ordem], dtype=np.float64), inicio, n
+
+
+def _somas(valores: np.ndarray, inicio: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """ Soma de cada célula em cada linha de `valores` (reamostras x linhas); células vazias somam 0. """
+    somas = np.zeros((valores.shape[0], len(n)))
+    cheias = n > 0
+    if cheias.any():
+        somas[:, cheias] = np.add.reduceat(valores, inicio[cheias], axis=1)
+    return somas
+
+
+# ----- bootstrap -----
+def _lote_bootstrap(semente, b: int, y: np.ndarray, inicio: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """ Médias de `b` reamostras bootstrap (com reposição, dentro de cada célula): matriz (b, células). """
+    rng = np.random.default_rng(semente)
+    celula = np.repeat(np.arange(len(n)), n)
+    tipo = np.int32 if len(y) < 2 ** 31 else np.int64
+    # índice sorteado de cada posição: início da célula + inteiro uniforme em [0, n da célula)
+    indices = rng.integers(0, n[celula], size=(b, len(y)), dtype=tipo)
+    indices += inicio[celula].astype(tipo)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _somas(y[indices], inicio, n) / n
+
+
+def bootstrap_medias(codigos: np.ndarray, n_celulas: int, y: np.ndarray, reamostras: int = REAMOSTRAS, semente=0,
+                     memoria_mb: float = MEMORIA_MB, processos: int = None, progresso=None) -> np.ndarray:
+    """
+    Distribuição bootstrap da média de cada célula (grupo, ou fator x grupo): cada reamostra sorteia, com
+    reposição, tantas linhas de cada célula quantas ela tem.
+    Parâmetros:
+    - codigos: Célula de cada linha (0..n_celulas-1; -1 para linhas ignoradas).
+    - n_celulas: Número de células.
+    - y: Resposta de cada linha (linhas com resposta ausente são ignoradas).
+    - reamostras: Número de reamostras.
+    - semente: Semente do gerador (mesma semente, mesmos dados e mesmo memoria_mb dão o mesmo resultado).
+    - memoria_mb: Memória de trabalho de cada lote.
+    - processos, progresso: ver _executar_lotes.
+    Retorna:
+    - Matriz (reamostras, n_celulas) de médias; células sem linhas ficam NaN.
+    """
+    y, inicio, n = ordenar_por_celula(np.asarray(codigos), n_celulas, np.asarray(y, dtype=np.float64))
+    # índices (até 8 bytes) e valores sorteados (8 bytes) de cada linha, mais as médias
+    tamanhos = tamanhos_lotes(reamostras, 16 * len(y) + 8 * n_celulas, memoria_mb)
+    lotes = _executar_lotes(partial(_lote_bootstrap, y=y, inicio=inicio, n=n), tamanhos, semente,
+                            reamostras * len(y), processos, progresso)
+    return np.concatenate(lotes) if lotes else np.empty((0, n_celulas))
+
+
+def intervalo_percentil(medias: np.ndarray, alpha: float = 0.05):
+    """ Intervalo de confiança percentil (1 - alpha) de cada coluna de uma distribuição bootstrap.
+    Retorna:
+    - (inferior, superior), vetores com um elemento por coluna (NaN para colunas vazias).
+    """
+    inferior = np.full(medias.shape[1], np.nan)
+    superior = np.full(medias.shape[1], np.nan)
+    cheias = ~np.isnan(medias).any(axis=0) if len(medias) else np.zeros(medias.shape[1], dtype=bool)
+    if cheias.any():
+        inferior[cheias], superior[cheias] = np.quantile(medias[:, cheias], [alpha / 2, 1 - alpha / 2], axis=0)
+    return inferior, superior
+
+
+# ----- permutação -----
+def _medias_e_escala(somas: np.ndarray, n: np.ndarray, soma_quadrados: float, gl: int):
+    """ Médias por célula e raiz do quadrado médio residual (variância combinada de todas as células).
+    A soma de quadrados total não muda com a permutação; a residual sai dela e das somas por célula.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = somas / n
+        qm_residuo = (soma_quadrados - np.nansum(somas * media, axis=1)) / gl
+    return media, np.sqrt(qm_residuo)
+
+
+def _maximo_pares(media: np.ndarray, escala: np.ndarray, i: np.ndarray, j: np.ndarray, peso: np.ndarray,
+                  amplitude: bool) -> np.ndarray:
+    """ Maior |t| entre as comparações (i, j) de cada linha, com t = (média_i - média_j) * peso / escala.
+    Com `amplitude` (todos os pares, células do mesmo tamanho) o maior |t| é a amplitude das médias.
+    """
+    if not len(i):
+        return np.zeros(len(media))
+    if amplitude:
+        cheias = media[:, np.union1d(i, j)]
+        return (cheias.max(axis=1) - cheias.min(axis=1)) * peso[0] / escala
+    # float32: metade da memória e do tempo no caso de muitos pares (a tolerância cobre o arredondamento)
+    media = media.astype(np.float32)
+    diferencas = np.abs(media[:, i] - media[:, j])
+    diferencas *= peso.astype(np.float32)
+    return diferencas.max(axis=1) / escala
+
+
+def _lote_permutacao_combinada(semente, b: int, y: np.ndarray, inicio: np.ndarray, n: np.ndarray,
+                               i: np.ndarray, j: np.ndarray, peso: np.ndarray, amplitude: bool) -> np.ndarray:
+    """ Maior |t| entre as comparações em cada uma de `b` permutações das respostas entre todas as células. """
+    rng = np.random.default_rng(semente)
+    valores = np.tile(y, (b, 1))
+    rng.permuted(valores, axis=1, out=valores)
+    media, escala = _medias_e_escala(_somas(valores, inicio, n), n, float(y @ y), int(n.sum() - (n > 0).sum()))
+    return _maximo_pares(media, escala, i, j, peso, amplitude)
+
+
+def permutacao_pares(codigos: np.ndarray, n_celulas: int, y: np.ndarray, i: np.ndarray, j: np.ndarray,
+                     reamostras: int = REAMOSTRAS, semente=0, memoria_mb: float = MEMORIA_MB,
+                     processos: int = None, progresso=None) -> dict:
+    """
+    Teste de permutação das comparações (i, j) entre células, com a estatística t de variância combinada
+    (a mesma do Dunnett e do Tukey-Kramer). As respostas são permutadas entre todas as células (hipótese
+    nula global: todas as células têm a mesma distribuição), e o p-valor de cada comparação é ajustado pelo
+    maior |t| entre as comparações em cada permutação (single-step maxT), que controla a taxa de erro do
+    conjunto como o Dunnett e o Tukey.
+    Parâmetros:
+    - codigos, n_celulas, y: ver bootstrap_medias.
+    - i, j: Células de cada comparação (pares distintos, entre células com linhas).
+    - reamostras, semente, memoria_mb, processos, progresso: ver bootstrap_medias.
+    Retorna um dicionário com vetores de um elemento por par:
+    - t: estatística observada;
+    - p_ajustado: (1 + permutações com maior |t| >= |t| observado) / (1 + reamostras), nunca zero.
+    """
+    y, inicio, n = ordenar_por_celula(np.asarray(codigos), n_celulas, np.asarray(y, dtype=np.float64))
+    y = y - y.mean() if len(y) else y  # centrada: a soma de quadrados residual perde menos precisão
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    gl = int(n.sum() - (n > 0).sum())
+    with np.errstate(divide='ignore'):
+        peso = 1 / np.sqrt(1 / n[i] + 1 / n[j])
+    envolvidas = np.union1d(i, j)
+    amplitude = (len(i) == len(envolvidas) * (len(envolvidas) - 1) // 2
+                 and len(envolvidas) > 0 and np.all(n[envolvidas] == n[envolvidas[0]]))
+
+    media, escala = _medias_e_escala(_somas(y[None, :], inicio, n), n, float(y @ y), gl)
+    observada = (media[0, i] - media[0, j]) * peso / escala[0]
+
+    # respostas permutadas (8 bytes por linha), somas e médias por célula e |diferença| de cada par
+    por_reamostra = 8 * len(y) + 16 * n_celulas + (0 if amplitude else 8 * len(i))
+    tamanhos = tamanhos_lotes(reamostras, por_reamostra, memoria_mb)
+    funcao = partial(_lote_permutacao_combinada, y=y, inicio=inicio, n=n, i=i, j=j, peso=peso, amplitude=amplitude)
+    maximos = np.sort(np.concatenate(_executar_lotes(funcao, tamanhos, semente, reamostras * (len(y) + len(i)),
+                                                     processos, progresso)))
+    limite = np.abs(observada) * (1 - TOLERANCIA)
+    alcancaram = len(maximos) - np.searchsorted(maximos, limite, side="left")
+    return {'t': observada, 'p_ajustado': np.where(np.isnan(observada), np.nan, (1 + alcancaram) / (1 + reamostras))}
+
+
+def _estatistica_welch(somas: np.ndarray, quadrados: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """ t de Welch entre as células 2k e 2k+1 de cada estrato, a partir das somas e somas de quadrados. """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = somas / n
+        var = (quadrados - somas * media) / (n - 1)
+        a, b = slice(0, None, 2), slice(1, None, 2)
+        return (media[:, a] - media[:, b]) / np.sqrt(var[:, a] / n[a] + var[:, b] / n[b])
+
+
+def _lote_permutacao_estratos(semente, b: int, y: np.ndarray, inicio: np.ndarray, n: np.ndarray, observada: np.ndarray):
+    """ Conta, em `b` permutações das respostas dentro de cada estrato (pares de células 2k, 2k+1), quantas
+    vezes o |t| de Welch do estrato alcança o observado.
+    """
+    rng = np.random.default_rng(semente)
+    valores = np.tile(y, (b, 1))
+    for k in range(0, len(n), 2):
+        trecho = valores[:, inicio[k]:inicio[k] + n[k] + n[k + 1]]
+        rng.permuted(trecho, axis=1, out=trecho)
+    t = np.abs(_estatistica_welch(_somas(valores, inicio, n), _somas(valores * valores, inicio, n), n))
+    return (t >= np.abs(observada) * (1 - TOLERANCIA)).sum(axis=0)
+
+
+def permutacao_estratos(codigos: np.ndarray, n_estratos: int, y: np.ndarray, reamostras: int = REAMOSTRAS, semente=0,
+                        memoria_mb: float = MEMORIA_MB, processos: int = None, progresso=None) -> dict:
+    """
+    Teste de permutação do t de Welch entre os dois grupos de cada estrato (nível do fator), permutando as
+    respostas só dentro do estrato.
+    Parâmetros:
+    - codigos: Célula de cada linha: 2 * estrato + (0 ou 1 conforme o grupo); -1 para linhas ignoradas.
+    - n_estratos: Número de estratos.
+    - y, reamostras, semente, memoria_mb, processos, progresso: ver bootstrap_medias.
+    Retorna:
+    - Dicionário com t (observado) e p (bilateral, (1 + contagem) / (1 + reamostras)), um elemento por estrato.
+    """
+    y, inicio, n = ordenar_por_celula(np.asarray(codigos), 2 * n_estratos, np.asarray(y, dtype=np.float64))
+    # centrada por estrato: a permutação dentro do estrato não muda a média dele
+    for k in range(0, len(n), 2):
+        trecho = y[inicio[k]:inicio[k] + n[k] + n[k + 1]]
+        if len(trecho):
+            trecho -= trecho.mean()
+    observada = _estatistica_welch(_somas(y[None, :], inicio, n), _somas(y[None, :] ** 2, inicio, n), n)[0]
+
+    # respostas permutadas e seus quadrados (16 bytes por linha), somas por célula
+    tamanhos = tamanhos_lotes(reamostras, 16 * len(y) + 32 * len(n), memoria_mb)
+    funcao = partial(_lote_permutacao_estratos, y=y, inicio=inicio, n=n, observada=observada)
+    contagem = sum(_executar_lotes(funcao, tamanhos, semente, reamostras * len(y), processos, progresso))
+    with np.errstate(invalid='ignore'):
+        valida = ~np.isnan(observada)
+    return {'t': observada, 'p': np.where(valida, (1 + contagem) / (1 + reamostras), np.nan)}
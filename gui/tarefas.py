@@ -0,0 +1,124 @@
+import queue
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TarefaCancelada(Exception):
+    """ Levantada dentro de uma tarefa quando o usuário pede o cancelamento. """
+
+
+class Tarefa:
+    """ Tarefa enviada ao Agendador. A função executada recebe esta instância como primeiro argumento
+    e pode usar progresso() para informar o andamento e verificar() para respeitar o cancelamento.
+    """
+    def __init__(self, agendador, nome: str):
+        self.id = next(agendador._contador)
+        self.nome = nome
+        self.future = None
+        self._agendador = agendador
+        self._cancelar = threading.Event()
+
+    @property
+    def cancelada(self) -> bool:
+        return self._cancelar.is_set()
+
+    def cancelar(self):
+        """ Pede o cancelamento: tarefas ainda na fila nem começam; as em execução param no próximo verificar(). """
+        self._cancelar.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def verificar(self):
+        """ Levanta TarefaCancelada se o cancelamento foi pedido. """
+        if self._cancelar.is_set():
+            raise TarefaCancelada(self.nome)
+
+    def progresso(self, fracao: float, mensagem: str = ""):
+        """ Informa o andamento (0 a 1). Pode ser chamado de qualquer thread. """
+        self.verificar()
+        self._agendador._eventos.put(("progresso", self, (fracao, mensagem)))
+
+
+class Agendador:
+    """ Executa tarefas fora da thread do Tk e entrega progresso e resultados de volta pelo after().
+    Parâmetros:
+    - widget: Qualquer widget Tk (normalmente a janela principal), usado para agendar o after().
+    - max_workers: Número de tarefas executadas ao mesmo tempo; as demais aguardam na fila.
+    - intervalo_ms: Intervalo de verificação da fila de eventos enquanto houver tarefas ativas.
+    Os callbacks ao_concluir, ao_erro, ao_progresso e ao_cancelar sempre rodam na thread do Tk.
+    """
+    def __init__(self, widget, max_workers: int = 1, intervalo_ms: int = 50):
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self.ativas = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grafitics")
+        self._eventos = queue.Queue()
+        self._contador = itertools.count(1)
+        self._callbacks = {}
+        self._agendado = False
+
+    def enviar(self, funcao, *args, nome: str = "", ao_concluir=None, ao_erro=None, ao_progresso=None, ao_cancelar=None, **kwargs) -> Tarefa:
+        """ Coloca `funcao(tarefa, *args, **kwargs)` na fila de execução e retorna a Tarefa criada. """
+        tarefa = Tarefa(self, nome)
+        self._callbacks[tarefa.id] = (ao_concluir, ao_erro, ao_progresso, ao_cancelar)
+        self.ativas.append(tarefa)
+
+        def executar():
+            try:
+                tarefa.verificar()
+                resultado = funcao(tarefa, *args, **kwargs)
+                tarefa.verificar()
+                self._eventos.put(("concluida", tarefa, resultado))
+            except TarefaCancelada:
+                self._eventos.put(("cancelada", tarefa, None))
+            except Exception as e:
+                self._eventos.put(("erro", tarefa, e))
+
+        def ao_terminar(future):
+            if future.cancelled():  # cancelada antes de começar
+                self._eventos.put(("cancelada", tarefa, None))
+
+        tarefa.future = self._executor.submit(executar)
+        tarefa.future.add_done_callback(ao_terminar)
+        self._agendar()
+        return tarefa
+
+    def cancelar_todas(self):
+        for tarefa in list(self.ativas):
+            tarefa.cancelar()
+
+    def encerrar(self):
+        """ Cancela o que estiver pendente e libera a thread de trabalho (usar ao fechar a janela). """
+        self.cancelar_todas()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _agendar(self):
+        if not self._agendado:
+            self._agendado = True
+            self.widget.after(self.intervalo_ms, self._processar_eventos)
+
+    def _processar_eventos(self):
+        self._agendado = False
+        while True:
+            try:
+                tipo, tarefa, valor = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            if tarefa.id not in self._callbacks:
+                continue  # evento tardio de uma tarefa já finalizada
+            ao_concluir, ao_erro, ao_progresso, ao_cancelar = self._callbacks[tarefa.id]
+            if tipo == "progresso":
+                if ao_progresso and not tarefa.cancelada:
+                    ao_progresso(tarefa, *valor)
+                continue
+            del self._callbacks[tarefa.id]
+            self.ativas.remove(tarefa)
+            if tipo == "concluida" and ao_concluir:
+                ao_concluir(valor)
+            elif tipo == "erro" and ao_erro:
+                ao_erro(valor)
+            elif tipo == "cancelada" and ao_cancelar:
+                ao_cancelar(tarefa)
+        if self.ativas:
+            self._agendar()
@@ -1,4 +1,5 @@
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import ttk
 
 
@@ -47,14 +48,6 @@ def create_left_panel(main_window, parent, upload_command):
     rb5.grid(row=2, column=2)
     rb6.grid(row=2, column=3)
 
-    def up_ao_mudar(*args):
-        if hasattr(main_window, "df"):
-            build_frame_variaveis(main_window, main_window.frame_variaveis, main_window.df.columns.tolist())
-            main_window.load_selected_sheet(main_window.excel_file)
-
-    testes_var.trace_add("write", up_ao_mudar)
-    value_var.trace_add("write", up_ao_mudar)
-
     # Cria o frame de variáveis e salva na main_window
     frame_variaveis = ctk.CTkFrame(frame)
     frame_variaveis.grid(row=5, column=0, columnspan=4, sticky="ew", padx=10, pady=10)
@@ -69,13 +62,15 @@ def create_left_panel(main_window, parent, upload_command):
 
     return frame
 
-def create_right_panel(main_window, parent, clear_command, grafico_command):
+def create_right_panel(main_window, parent, clear_command, grafico_command, cancel_command=None, salvar_command=None):
     """ Cria o painel direito da janela principal com campos de entrada para título, subtítulo, eixos X e Y, além de botões para gerar gráfico e limpar entradas.
     Parâmetros:
     - main_window: Instância da janela principal.
     - parent: Frame pai onde os widgets serão adicionados.
     - clear_command: Função a ser chamada ao clicar no botão de limpar entradas.
     - grafico_command: Função a ser chamada ao clicar no botão de gerar gráfico.
+    - cancel_command: Função a ser chamada ao clicar no botão de cancelar as tarefas em andamento.
+    - salvar_command: Função a ser chamada ao clicar no botão de salvar a imagem em alta resolução.
     Retorna:
     - frame: Frame contendo os widgets de entrada e botões.
     """
@@ -94,8 +89,21 @@ def create_right_panel(main_window, parent, clear_command, grafico_command):
     eixoY_entry.pack(pady=5, expand=True)
 
     ctk.CTkButton(frame, text="Chart generate", command=grafico_command).pack(pady=(20, 5))
+    if salvar_command:
+        ctk.CTkButton(frame, text="Salvar imagem", command=salvar_command).pack(pady=5)
     ctk.CTkButton(frame, text="Clear entries", command=clear_command).pack(pady=5)
 
+    # Andamento das tarefas em segundo plano
+    progress_bar = ctk.CTkProgressBar(frame)
+    progress_bar.set(0)
+    progress_bar.pack(pady=(15, 5), fill="x", padx=10)
+    status_label = ctk.CTkLabel(frame, text="")
+    status_label.pack(pady=0)
+    if cancel_command:
+        ctk.CTkButton(frame, text="Cancel", command=cancel_command).pack(pady=5)
+
+    main_window.progress_bar = progress_bar
+    main_window.status_label = status_label
     main_window.title_entry = title_entry
     main_window.subtitle_entry = subtitle_entry
     main_window.eixoX_entry = eixoX_entry
@@ -103,6 +111,27 @@ def create_right_panel(main_window, parent, clear_command, grafico_command):
 
     return frame
 
+# Disposições de build_frame_variaveis que têm seletores de colunas
+LAYOUTS_COM_COLUNAS = ("com_fator", "sem_fator", "controle")
+
+
+def layout_variaveis(teste, variaveis) -> str:
+    """ Disposição dos seletores de colunas para o teste e as colunas da aba.
+    Retorna:
+    - "vazio" (sem colunas), "sem_teste", "com_fator" (grupo, condição e valores: t-test, ou Tukey com 3
+      colunas ou mais), "sem_fator" (grupo e valores) ou "controle" (grupo e valores, mais o controle do Dunnett).
+    """
+    if not variaveis:
+        return "vazio"
+    if teste not in ["dunnett", "tukey", "t-test"]:
+        return "sem_teste"
+    if teste == "t-test" or teste == "tukey" and len(variaveis) >= 3:
+        return "com_fator"
+    if teste == "tukey":
+        return "sem_fator"
+    return "controle"
+
+
 def build_frame_variaveis(main_window, frame, variaveis):
     """ Cria o frame de variáveis para seleção de colunas de tratamento e valores.
     Parâmetros:
@@ -110,101 +139,92 @@ def build_frame_variaveis(main_window, frame, variaveis):
     - frame: Frame onde os widgets serão adicionados.
     - variaveis: Lista de variáveis disponíveis para seleção.
     Se variaveis estiver vazio, não cria os widgets de seleção.
+    As variáveis main_window.group_col, fator_col e response_col são sempre as mesmas: a coluna escolhida
+    é mantida se ainda existir; senão volta ao padrão (primeira, penúltima e última colunas).
+    O menu de controle do Dunnett é montado à parte, por atualizar_controles.
+    Retorna:
+    - A disposição montada (layout_variaveis).
     """
-    # Adiciona menu de tratamentos disponíveis
-    def atualizar_controles(*args):
-        try:
-            # Destroi apenas se o widget ainda existir e não for None
-            if hasattr(main_window, "control_menu") and main_window.control_menu is not None:
-                try:
-                    main_window.control_menu.destroy()
-                except Exception:
-                    pass
-                main_window.control_menu = None
-            if hasattr(main_window, "control_label") and main_window.control_label is not None:
-                try:
-                    main_window.control_label.destroy()
-                except Exception:
-                    pass
-                main_window.control_label = None
-
-            col = group_col.get()
-            if hasattr(main_window, "df") and col in main_window.df.columns:
-                controls = main_window.df[col].dropna().unique().tolist()
-                controls = [str(c) for c in controls]  # Converte todos para string
-                main_window.control_label = ctk.CTkLabel(frame, text="Select control:")
-                main_window.control_label.grid(row=4, column=0, padx=10, pady=(10, 5), sticky="e")
-                main_window.control_var = ctk.StringVar(value=controls[0] if controls else "")
-                main_window.control_menu = ctk.CTkOptionMenu(frame, variable=main_window.control_var, values=controls)
-                main_window.control_menu.grid(row=4, column=1, padx=(0, 20))
-            else:
-                main_window.control_label = None
-                main_window.control_menu = None
-        except Exception as e:
-            # Evita erro duplo de destruição
-            pass
-
     # Limpa o frame antes de adicionar novos widgets
     for widget in frame.winfo_children():
         widget.destroy()
+    main_window.control_menu = main_window.control_label = None
 
-    if not variaveis:
+    layout = layout_variaveis(main_window.testes_var.get(), variaveis)
+    if layout == "vazio":
         ctk.CTkLabel(frame, text="Nenhuma variável disponível.").grid(row=3, column=0, columnspan=4, padx=10, pady=(10, 5))
-        return
-    
-    if main_window.testes_var.get() not in ["dunnett", "tukey", "t-test"]:
+        return layout
+    if layout == "sem_teste":
         ctk.CTkLabel(frame, text="Selecione um teste estatístico.").grid(row=3, column=0, columnspan=4, padx=10, pady=(10, 5))
-        return
-
-    if main_window.testes_var.get() == "t-test" or main_window.testes_var.get() == "tukey" and len(variaveis) >= 3:
-        ctk.CTkLabel(frame, text="Group column:").grid(row=3, column=0, padx=10, pady=(10, 5), sticky="e")
-        group_col = ctk.StringVar(value=variaveis[0] if variaveis else "")
-        group_menu = ctk.CTkOptionMenu(frame, variable=group_col, values=variaveis)
-        group_menu.grid(row=3, column=1, padx=(0, 20))
-
-        ctk.CTkLabel(frame, text="Condition column:").grid(row=3, column=2, padx=10, pady=(10, 5), sticky="e")
-        fator_col = ctk.StringVar(value=variaveis[len(variaveis)-2])
-        fator_menu = ctk.CTkOptionMenu(frame, variable=fator_col, values=variaveis)
-        fator_menu.grid(row=3, column=3, padx=(0, 20))
-
-        ctk.CTkLabel(frame, text="Values column:").grid(row=3, column=4, padx=10, pady=(10, 5), sticky="e")
-        response_col = ctk.StringVar(value=variaveis[len(variaveis)-1])
-        response_menu = ctk.CTkOptionMenu(frame, variable=response_col, values=variaveis)
-        response_menu.grid(row=3, column=5, padx=(0, 20))
-
-    elif main_window.testes_var.get() == "t-test" or main_window.testes_var.get() == "tukey": 
-        ctk.CTkLabel(frame, text="Group column:").grid(row=3, column=0, padx=10, pady=(10, 5), sticky="e")
-        group_col = ctk.StringVar(value=variaveis[0] if variaveis else "")
-        group_menu = ctk.CTkOptionMenu(frame, variable=group_col, values=variaveis)
-        group_menu.grid(row=3, column=1, padx=(0, 20))
-
-        ctk.CTkLabel(frame, text="Values column:").grid(row=3, column=2, padx=10, pady=(10, 5), sticky="e")
-        response_col = ctk.StringVar(value=variaveis[len(variaveis)-1])
-        response_menu = ctk.CTkOptionMenu(frame, variable=response_col, values=variaveis)
-        response_menu.grid(row=3, column=3, padx=(0, 20))
-
-        fator_col = ctk.StringVar(value=None)  # Não é necessário fator_col para t-test com apenas dois grupos sem fator
-
+        return layout
 
+    seletores = [("Group column:", main_window.group_col, variaveis[0])]
+    if layout == "com_fator":
+        seletores.append(("Condition column:", main_window.fator_col, variaveis[len(variaveis)-2]))
     else:
-        ctk.CTkLabel(frame, text="Group column:").grid(row=3, column=0, padx=10, pady=(10, 5), sticky="e")
-        group_col = ctk.StringVar(value=variaveis[0] if variaveis else "")
-        group_menu = ctk.CTkOptionMenu(frame, variable=group_col, values=variaveis)
-        group_menu.grid(row=3, column=1, padx=(0, 20))
-
-        ctk.CTkLabel(frame, text="Values column:").grid(row=3, column=2, padx=10, pady=(10, 5), sticky="e")
-        response_col = ctk.StringVar(value=variaveis[len(variaveis)-1])
-        response_menu = ctk.CTkOptionMenu(frame, variable=response_col, values=variaveis)
-        response_menu.grid(row=3, column=3, padx=(0, 20))
-
-        fator_col = ctk.StringVar(value=None)  # Não é necessário fator_col 
-        
-        group_col.trace_add("write", atualizar_controles)
-        atualizar_controles()  # Inicializa ao criar
+        main_window.fator_col.set("")  # Não é necessário fator_col sem a coluna de condição
+    seletores.append(("Values column:", main_window.response_col, variaveis[len(variaveis)-1]))
+
+    for i, (rotulo, var, padrao) in enumerate(seletores):
+        if var.get() not in variaveis:
+            var.set(padrao)
+        ctk.CTkLabel(frame, text=rotulo).grid(row=3, column=2 * i, padx=10, pady=(10, 5), sticky="e")
+        ctk.CTkOptionMenu(frame, variable=var, values=variaveis).grid(row=3, column=2 * i + 1, padx=(0, 20))
+    build_seletor_respostas(main_window, frame, variaveis)
+    return layout
+
+
+def build_seletor_respostas(main_window, frame, variaveis):
+    """ Cria, na linha 5 do frame de variáveis, os controles do modo de várias respostas: as caixas
+    "Várias respostas" e "Todas numéricas" e uma lista de seleção múltipla com as colunas da aba.
+    A seleção fica no estado da janela (chave "respostas") e é refeita quando a lista é recriada.
+    Parâmetros:
+    - main_window: Instância da janela principal.
+    - frame: Frame de variáveis.
+    - variaveis: Colunas da aba.
+    """
+    ctk.CTkCheckBox(frame, text="Várias respostas", variable=main_window.varias_respostas).grid(
+        row=5, column=0, padx=10, pady=(10, 5), sticky="nw")
+    ctk.CTkCheckBox(frame, text="Todas numéricas", variable=main_window.todas_numericas).grid(
+        row=5, column=1, padx=(0, 20), pady=(10, 5), sticky="nw")
+
+    lista = tk.Listbox(frame, selectmode="extended", exportselection=False, height=6)
+    escolhidas = main_window.estado.obter("respostas", ())
+    for i, col in enumerate(variaveis):
+        lista.insert("end", col)
+        if col in escolhidas:
+            lista.selection_set(i)
+    lista.bind("<<ListboxSelect>>", lambda evento: main_window.estado.definir(
+        respostas=tuple(lista.get(i) for i in lista.curselection())))
+    lista.grid(row=5, column=2, columnspan=2, padx=(0, 20), pady=(10, 5), sticky="we")
+
+
+def atualizar_controles(main_window, frame):
+    """ Monta (ou refaz) o menu de controle do Dunnett com os valores da coluna de grupos.
+    Parâmetros:
+    - main_window: Instância da janela principal.
+    - frame: Frame de variáveis (o mesmo de build_frame_variaveis).
+    Se a coluna de grupos ainda não foi lida, o menu fica de fora até ela chegar. O controle escolhido
+    é mantido se ainda estiver entre os valores da coluna.
+    """
+    for nome in ("control_menu", "control_label"):
+        widget = getattr(main_window, nome, None)
+        if widget is not None:
+            widget.destroy()
+            setattr(main_window, nome, None)
+
+    col = main_window.group_col.get()
+    if getattr(main_window, "df", None) is None or col not in main_window.df.columns:
+        return
+    controls = main_window.df[col].dropna().unique().tolist()
+    controls = [str(c) for c in controls]  # Converte todos para string
+    if main_window.control_var.get() not in controls:
+        main_window.control_var.set(controls[0] if controls else "")
+    main_window.control_label = ctk.CTkLabel(frame, text="Select control:")
+    main_window.control_label.grid(row=4, column=0, padx=10, pady=(10, 5), sticky="e")
+    main_window.control_menu = ctk.CTkOptionMenu(frame, variable=main_window.control_var, values=controls)
+    main_window.control_menu.grid(row=4, column=1, padx=(0, 20))
 
-    main_window.group_col = group_col
-    main_window.fator_col = fator_col
-    main_window.response_col = response_col
 
 def create_table_frame(parent):
     """ Cria um frame para exibir uma tabela com rolagem.
@@ -219,6 +239,85 @@ def create_table_frame(parent):
     scrollable.pack(padx=10, pady=10, fill="both", expand=True)
     return frame, scrollable
 
+# Acima deste número de linhas a tabela passa a ser virtual (só as linhas visíveis existem no Treeview)
+LIMITE_TABELA_VIRTUAL = 2000
+LINHAS_VISIVEIS = 20
+LINHAS_ANTECIPADAS = 200
+
+
+class TabelaVirtual:
+    """ Exibe um DataFrame grande em um Treeview mantendo apenas as linhas visíveis.
+    O Treeview tem um número fixo de itens que são reaproveitados durante a rolagem; os valores
+    são lidos do DataFrame sob demanda, em blocos com algumas linhas de antecipação.
+    """
+    def __init__(self, tree, v_scroll, df, altura=LINHAS_VISIVEIS, antecipadas=LINHAS_ANTECIPADAS):
+        self.tree = tree
+        self.v_scroll = v_scroll
+        self.df = df
+        self.antecipadas = antecipadas
+        self.ordem = None  # permutação das linhas exibidas (None = ordem original do DataFrame)
+        self.inicio = 0
+        self._buffer_inicio = 0
+        self._buffer = []
+
+        tree.configure(height=altura)
+        v_scroll.configure(command=self.yview)
+        self.itens = [tree.insert("", "end", values=()) for _ in range(min(altura, len(df)))]
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(evento, self._on_mousewheel)
+        self.render()
+
+    def _linhas(self, inicio, fim):
+        """ Retorna as linhas [inicio, fim) como listas, lendo um novo bloco do DataFrame se necessário. """
+        if inicio < self._buffer_inicio or fim > self._buffer_inicio + len(self._buffer):
+            bloco_inicio = max(0, inicio - self.antecipadas // 4)
+            bloco_fim = min(len(self.df), fim + self.antecipadas)
+            posicoes = slice(bloco_inicio, bloco_fim) if self.ordem is None else self.ordem[bloco_inicio:bloco_fim]
+            self._buffer = self.df.iloc[posicoes].to_numpy().tolist()
+            self._buffer_inicio = bloco_inicio
+        return self._buffer[inicio - self._buffer_inicio:fim - self._buffer_inicio]
+
+    def render(self):
+        """ Preenche os itens do Treeview com a janela de linhas atual e atualiza a barra de rolagem. """
+        linhas = self._linhas(self.inicio, self.inicio + len(self.itens))
+        for iid, valores in zip(self.itens, linhas):
+            self.tree.item(iid, values=valores)
+        total = max(len(self.df), 1)
+        self.v_scroll.set(self.inicio / total, (self.inicio + len(self.itens)) / total)
+
+    def definir_ordem(self, ordem):
+        """ Exibe as linhas na ordem dada (vetor de posições do DataFrame), sem alterar o DataFrame. """
+        self.ordem = ordem
+        self.recarregar()
+
+    def recarregar(self):
+        """ Descarta o bloco em memória e redesenha a janela atual. """
+        self._buffer = []
+        self._buffer_inicio = 0
+        self.render()
+
+    def rolar_para(self, inicio):
+        inicio = max(0, min(int(inicio), len(self.df) - len(self.itens)))
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self.render()
+
+    def yview(self, *args):
+        """ Comando da barra de rolagem vertical ("moveto fração" ou "scroll n units|pages"). """
+        if args[0] == "moveto":
+            self.rolar_para(float(args[1]) * len(self.df))
+        elif args[0] == "scroll":
+            passo = int(args[1]) * (len(self.itens) if args[2] == "pages" else 1)
+            self.rolar_para(self.inicio + passo)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.rolar_para(self.inicio - 3)
+        else:
+            self.rolar_para(self.inicio + 3)
+        return "break"
+
+
 def display_table(scrollable_frame, df):
     """ Exibe um DataFrame em um Treeview dentro de um frame rolável.
     Parâmetros:
@@ -226,11 +325,23 @@ def display_table(scrollable_frame, df):
     - df: DataFrame a ser exibido.
     Se o scrollable_frame já tiver um Treeview, ele será destruído e substituído
     por um novo Treeview com os dados do DataFrame.
+    Com mais de LIMITE_TABELA_VIRTUAL linhas a tabela é exibida no modo virtual (TabelaVirtual).
     """
     # Remove Treeview antigo, se existir
     if hasattr(scrollable_frame, "tree") and scrollable_frame.tree:
         scrollable_frame.tree.destroy()
 
+    virtual = len(df) > LIMITE_TABELA_VIRTUAL
+
+    # Scrollbar vertical (apenas no modo virtual)
+    v_scroll = getattr(scrollable_frame, "v_scroll", None)
+    if virtual:
+        if not v_scroll:
+            v_scroll = ttk.Scrollbar(scrollable_frame, orient="vertical")
+        v_scroll.pack(fill="y", side="right")
+    elif v_scroll:
+        v_scroll.pack_forget()
+
     # Cria novo Treeview
     tree = ttk.Treeview(scrollable_frame, columns=list(df.columns), show="headings")
     tree.pack(fill="both", expand=True, side="top")
@@ -249,6 +360,8 @@ def display_table(scrollable_frame, df):
     # Inicializa dicionário de ordenação, se necessário
     if not hasattr(scrollable_frame, "sort_ascending"):
         scrollable_frame.sort_ascending = {}
+    # Permutações já calculadas para este DataFrame (uma por coluna)
+    scrollable_frame.sort_cache = {}
 
     # Define cabeçalhos e comandos de ordenação
     for col in df.columns:
@@ -260,9 +373,14 @@ def display_table(scrollable_frame, df):
     scrollable_frame.tree = tree
     scrollable_frame.df = df
     scrollable_frame.h_scroll = h_scroll
+    scrollable_frame.v_scroll = v_scroll
 
     # Insere linhas
-    insert_rows(tree, df)
+    if virtual:
+        scrollable_frame.tabela_virtual = TabelaVirtual(tree, v_scroll, df)
+    else:
+        scrollable_frame.tabela_virtual = None
+        insert_rows(tree, df)
 
 def insert_rows(tree, df):
     """ Insere as linhas de um DataFrame em um Treeview.
@@ -270,24 +388,54 @@ def insert_rows(tree, df):
     - tree: Treeview onde as linhas serão inseridas.
     - df: DataFrame cujas linhas serão inseridas.
     Limpa o Treeview antes de inserir novas linhas.
+    O identificador de cada item é a posição da linha no DataFrame, usado por sort_by_column.
     """
     for row in tree.get_children():
         tree.delete(row)
-    for _, row in df.iterrows():
-        tree.insert("", "end", values=list(row))
+    for pos, row in enumerate(df.itertuples(index=False, name=None)):
+        tree.insert("", "end", iid=str(pos), values=list(row))
+
+
+def ordem_por_coluna(df, col, crescente: bool = True):
+    """ Retorna as posições das linhas de `df` ordenadas por `col`, de forma estável (empates mantêm a
+    ordem original) nos dois sentidos. Valores ausentes ficam no final, também na ordem decrescente.
+    Colunas com tipos misturados são comparadas como texto. O DataFrame não é alterado.
+    """
+    import pandas as pd
+
+    valores = pd.Series(df[col].to_numpy(), copy=False)
+    try:
+        ordenados = valores.sort_values(ascending=crescente, kind="stable", na_position="last")
+    except TypeError:
+        ordenados = valores.where(valores.isna(), valores.astype(str)).sort_values(
+            ascending=crescente, kind="stable", na_position="last")
+    return ordenados.index.to_numpy()
+
 
 def sort_by_column(scrollable_frame, df, tree, col):
-    """ Ordena o DataFrame por uma coluna específica e atualiza o Treeview.
+    """ Reordena as linhas exibidas no Treeview por uma coluna específica, sem alterar o DataFrame.
     Parâmetros:
     - scrollable_frame: Frame rolável onde o Treeview está localizado.
-    - df: DataFrame a ser ordenado.
+    - df: DataFrame exibido.
     - tree: Treeview a ser atualizado.
     - col: Nome da coluna pela qual ordenar.
-    Inverte a ordem de ordenação a cada clique na coluna.
+    Inverte a ordem de ordenação a cada clique na coluna. A permutação de cada coluna em cada sentido
+    é calculada uma única vez (a decrescente não é a crescente invertida: os ausentes continuam no
+    final e os empates na ordem original).
+    Os itens existentes são movidos com tree.move; no modo virtual apenas a janela visível é redesenhada.
     """
     ascending = scrollable_frame.sort_ascending[col]
-    df.sort_values(by=col, ascending=ascending, inplace=True, ignore_index=True)
-    insert_rows(tree, df)
+    cache = scrollable_frame.sort_cache
+    if (col, ascending) not in cache:
+        cache[col, ascending] = ordem_por_coluna(df, col, ascending)
+    ordem = cache[col, ascending]
+
+    tabela_virtual = getattr(scrollable_frame, "tabela_virtual", None)
+    if tabela_virtual is not None and tabela_virtual.tree is tree:
+        tabela_virtual.definir_ordem(ordem)
+    else:
+        for destino, pos in enumerate(ordem):
+            tree.move(str(pos), "", destino)
     scrollable_frame.sort_ascending[col] = not ascending
 
 def order_of_(df, coluna= None):
@@ -327,3 +475,50 @@ def add_tooltip(widget, text):
     widget.bind("<Enter>", on_enter)
     widget.bind("<Leave>", on_leave)
 
+
+def create_preview_frame(parent):
+    """ Cria o frame onde a prévia do gráfico é desenhada (dentro da aba Generate).
+    Parâmetros:
+    - parent: Frame pai.
+    Retorna:
+    - frame: Frame da prévia (inicialmente com um texto de orientação).
+    """
+    frame = ctk.CTkFrame(parent)
+    ctk.CTkLabel(frame, text="A prévia do gráfico aparece aqui.").pack(padx=20, pady=20)
+    return frame
+
+
+def mostrar_previa(frame, fig):
+    """ Mostra a figura na área de prévia, substituindo a anterior.
+    A figura é desenhada na resolução da tela; a exportação em alta resolução é feita à parte.
+    Parâmetros:
+    - frame: Frame criado por create_preview_frame.
+    - fig: Figura do matplotlib.
+    Retorna:
+    - canvas: FigureCanvasTkAgg criado.
+    """
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+    for widget in frame.winfo_children():
+        widget.destroy()
+    canvas = FigureCanvasTkAgg(fig, master=frame)
+    toolbar = NavigationToolbar2Tk(canvas, frame, pack_toolbar=False)
+    toolbar.update()
+    toolbar.pack(side="bottom", fill="x")
+    # sem expand: o widget tem o tamanho da figura, e não o contrário
+    canvas.get_tk_widget().pack(side="top")
+    canvas.draw()
+    frame.canvas = canvas
+    return canvas
+
+
+def redesenhar_previa(frame):
+    """ Redesenha a figura da prévia depois de uma alteração feita no lugar (graficos.aplicar_estilo),
+    ajustando o widget ao novo tamanho da figura.
+    Parâmetros:
+    - frame: Frame criado por create_preview_frame, com uma prévia já exibida.
+    """
+    canvas = frame.canvas
+    largura, altura = canvas.figure.get_size_inches() * canvas.figure.dpi
+    canvas.get_tk_widget().configure(width=int(round(largura)), height=int(round(altura)))
+    canvas.draw_idle()